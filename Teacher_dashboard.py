@@ -3,14 +3,38 @@ from tkinter import ttk, messagebox
 import sqlite3
 from datetime import datetime
 import os
-from PIL import Image, ImageTk
-
-class TeacherDashboard:
-    def __init__(self, root, user_info):
+from database import get_connection, release_connection
+from query_executor import QueryExecutor
+from virtual_treeview import sync_treeview
+from scoring import OPTION_LETTERS
+from dashboard_tasks import DashboardTasks
+from result_stats import exam_summary, format_summary
+from item_analysis import ItemAnalysisCache
+from theme import use_styles
+
+# Results of the exams in a teacher's subject, shared by the list and its export
+RESULTS_SQL = """
+    SELECT r.id, u.name, e.title, r.score, r.date
+    FROM results r
+    JOIN students s ON r.student_id = s.id
+    JOIN users u ON s.id = u.id
+    JOIN exams e ON r.exam_id = e.id
+    JOIN teachers t ON e.subject_id = t.subject_id
+    WHERE t.id = ?
+"""
+RESULTS_COLUMNS = ("ID", "Student", "Exam", "Score", "Date")
+
+class TeacherDashboard(DashboardTasks):
+    def __init__(self, root, user_info, session):
         self.root = root
         self.user_info = user_info
+        self.session = session
         self.root.title("Modern Teacher Dashboard")
         
+        self.executor = QueryExecutor.for_root(root)
+        # Item analysis per exam, recomputed only after new submissions
+        self.analysis_cache = ItemAnalysisCache()
+        
         # Configure the window
         self.root.state('zoomed')
         
@@ -36,89 +60,91 @@ class TeacherDashboard:
         self.create_sidebar()
         
         # Create main content area
-        self.content_area = ttk.Frame(self.main_container, style="Content.TFrame")
+        self.content_area = ttk.Frame(self.main_container, style="TeacherContent.TFrame")
         self.content_area.pack(side='left', fill='both', expand=True)
         
         # Create header
         self.create_header()
         
         # Create main content frame
-        self.content_frame = ttk.Frame(self.content_area, style="Content.TFrame")
+        self.content_frame = ttk.Frame(self.content_area, style="TeacherContent.TFrame")
         self.content_frame.pack(fill='both', expand=True, padx=20, pady=10)
         
         # Initialize with dashboard view
         self.show_profile()
 
     def setup_styles(self):
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-        
+        # Styles are set up once per Tk interpreter, not on every login
+        self.style = use_styles(self.root, "teacher", self.configure_styles)
+
+    def configure_styles(self, style):
         # Frame styles
-        self.style.configure("Main.TFrame", background=self.colors['bg_dark'])
-        self.style.configure("Content.TFrame", background=self.colors['content'])
-        self.style.configure("Sidebar.TFrame", background=self.colors['sidebar'])
+        style.configure("Main.TFrame", background=self.colors['bg_dark'])
+        style.configure("TeacherContent.TFrame", background=self.colors['content'])
+        style.configure("TeacherSidebar.TFrame", background=self.colors['sidebar'])
         
         # Label styles
-        self.style.configure("Header.TLabel",
-                           background=self.colors['content'],
-                           foreground=self.colors['text'],
-                           font=('Segoe UI', 24, 'bold'))
+        style.configure("Header.TLabel",
+                        background=self.colors['content'],
+                        foreground=self.colors['text'],
+                        font=('Segoe UI', 24, 'bold'))
         
-        self.style.configure("SidebarBtn.TLabel",
-                           background=self.colors['sidebar'],
-                           foreground=self.colors['text'],
-                           font=('Segoe UI', 12),
-                           padding=10)
+        style.configure("SidebarBtn.TLabel",
+                        background=self.colors['sidebar'],
+                        foreground=self.colors['text'],
+                        font=('Segoe UI', 12),
+                        padding=10)
         
         # Menu label style
-        self.style.configure("Menu.TLabel",
-                           background=self.colors['sidebar'],
-                           foreground=self.colors['text'],
-                           font=('Segoe UI', 12),
-                           padding=0)
+        style.configure("Menu.TLabel",
+                        background=self.colors['sidebar'],
+                        foreground=self.colors['text'],
+                        font=('Segoe UI', 12),
+                        padding=0)
         
         # Button styles
-        self.style.configure("Action.TButton",
-                           background=self.colors['button'],
-                           foreground=self.colors['text'],
-                           font=('Segoe UI', 11),
-                           padding=(20, 10))
+        style.configure("Action.TButton",
+                        background=self.colors['button'],
+                        foreground=self.colors['text'],
+                        font=('Segoe UI', 11),
+                        padding=(20, 10))
         
         # Treeview styles
-        self.style.configure("Treeview",
-                           background=self.colors['content'],
-                           foreground=self.colors['text'],
-                           fieldbackground=self.colors['content'],
-                           font=('Segoe UI', 11))
+        style.configure("Teacher.Treeview",
+                        background=self.colors['content'],
+                        foreground=self.colors['text'],
+                        fieldbackground=self.colors['content'],
+                        font=('Segoe UI', 11))
         
-        self.style.configure("Treeview.Heading",
-                           background=self.colors['button'],
-                           foreground=self.colors['text'],
-                           font=('Segoe UI', 12, 'bold'))
+        style.configure("Teacher.Treeview.Heading",
+                        background=self.colors['button'],
+                        foreground=self.colors['text'],
+                        font=('Segoe UI', 12, 'bold'))
         
-        self.style.map("Treeview",
-                      background=[('selected', self.colors['button_hover'])],
-                      foreground=[('selected', self.colors['text'])])
+        style.map("Teacher.Treeview",
+                  background=[('selected', self.colors['button_hover'])],
+                  foreground=[('selected', self.colors['text'])])
 
     def create_sidebar(self):
-        sidebar = ttk.Frame(self.main_container, style="Sidebar.TFrame", width=250)
+        sidebar = ttk.Frame(self.main_container, style="TeacherSidebar.TFrame", width=250)
         sidebar.pack(side='left', fill='y')
         sidebar.pack_propagate(False)
         
         # Add spacing at top
-        ttk.Frame(sidebar, style="Sidebar.TFrame", height=50).pack(fill='x')
+        ttk.Frame(sidebar, style="TeacherSidebar.TFrame", height=50).pack(fill='x')
         
         # Menu items with exact styling from image
         menu_items = [
             ("📝 Manage Exams", self.show_exams),
             ("❓ Manage Questions", self.show_questions),
             ("📊 View Results", self.show_results),
+            ("📈 Question Analytics", self.show_question_analytics),
             ("👤 My Profile", self.show_profile)
         ]
         
         # Add menu items with more spacing
         for text, command in menu_items:
-            menu_frame = ttk.Frame(sidebar, style="Sidebar.TFrame")
+            menu_frame = ttk.Frame(sidebar, style="TeacherSidebar.TFrame")
             menu_frame.pack(fill='x', pady=15)  # Increased spacing between items
             
             label = ttk.Label(menu_frame, 
@@ -133,8 +159,8 @@ class TeacherDashboard:
             label.bind('<Leave>', lambda e, lbl=label: self.on_menu_hover(lbl, False))
         
         # Add logout at bottom with spacing
-        ttk.Frame(sidebar, style="Sidebar.TFrame", height=50).pack(fill='x', expand=True)
-        logout_frame = ttk.Frame(sidebar, style="Sidebar.TFrame")
+        ttk.Frame(sidebar, style="TeacherSidebar.TFrame", height=50).pack(fill='x', expand=True)
+        logout_frame = ttk.Frame(sidebar, style="TeacherSidebar.TFrame")
         logout_frame.pack(fill='x', pady=20, side='bottom')
         
         logout_label = ttk.Label(logout_frame,
@@ -153,7 +179,7 @@ class TeacherDashboard:
             label.configure(foreground=self.colors['text'])  # Back to white
 
     def create_header(self):
-        header = ttk.Frame(self.content_area, style="Content.TFrame")
+        header = ttk.Frame(self.content_area, style="TeacherContent.TFrame")
         header.pack(fill='x', padx=20, pady=(20, 0))
         
         ttk.Label(header,
@@ -167,6 +193,7 @@ class TeacherDashboard:
                  style="SidebarBtn.TLabel").pack(side='right', padx=20)
 
     def clear_content(self):
+        self.executor.cancel_all()
         for widget in self.content_frame.winfo_children():
             widget.destroy()
 
@@ -174,12 +201,12 @@ class TeacherDashboard:
         self.clear_content()
         
         # Header and action buttons
-        header_frame = ttk.Frame(self.content_frame, style="Content.TFrame")
+        header_frame = ttk.Frame(self.content_frame, style="TeacherContent.TFrame")
         header_frame.pack(fill='x', pady=(0, 20))
         
         ttk.Label(header_frame, text="Manage Exams", style="Title.TLabel").pack(side='left')
         
-        button_frame = ttk.Frame(header_frame, style="Content.TFrame")
+        button_frame = ttk.Frame(header_frame, style="TeacherContent.TFrame")
         button_frame.pack(side='right')
         
         ttk.Button(button_frame, text="Add Exam", style="Action.TButton",
@@ -191,7 +218,7 @@ class TeacherDashboard:
         
         # Create Treeview
         columns = ("ID", "Title", "Duration", "Total Marks")
-        self.exam_tree = ttk.Treeview(self.content_frame, columns=columns, show='headings')
+        self.exam_tree = ttk.Treeview(self.content_frame, columns=columns, show='headings', style="Teacher.Treeview")
         
         # Configure columns
         for col in columns:
@@ -211,43 +238,33 @@ class TeacherDashboard:
 
 
     def populate_exams(self):
-        # Clear existing items
-        for item in self.exam_tree.get_children():
-            self.exam_tree.delete(item)
-            
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
-        
-        try:
+        def fetch(conn):
             # Get exams for the teacher's subject
-            cursor.execute("""
+            return conn.execute("""
                 SELECT e.id, e.title, e.duration, e.total_marks
                 FROM exams e
                 JOIN teachers t ON e.subject_id = t.subject_id
                 WHERE t.id = ?
-            """, (self.user_info['id'],))
-            
-            for row in cursor.fetchall():
-                self.exam_tree.insert("", 'end', values=row)
-                
-        except sqlite3.Error as e:
-            messagebox.showerror("Error", f"Database error: {e}")
-        finally:
-            conn.close()
+            """, (self.user_info['id'],)).fetchall()
+
+        def show(rows):
+            sync_treeview(self.exam_tree, rows)
+
+        self.executor.submit(fetch, show, self.show_database_error)
 
     def show_add_exam_frame(self):
         self.clear_content()
 
         ttk.Label(self.content_frame, text="Add New Exam", style="Title.TLabel").pack(pady=10)
 
-        form_frame = ttk.Frame(self.content_frame, style="Content.TFrame")
+        form_frame = ttk.Frame(self.content_frame, style="TeacherContent.TFrame")
         form_frame.pack(fill='both', expand=True, padx=20, pady=20)
 
         fields = [("Title", tk.StringVar()), ("Duration (minutes)", tk.StringVar()), ("Total Marks", tk.StringVar())]
         entries = {}
 
         for idx, (label, var) in enumerate(fields):
-            row = ttk.Frame(form_frame, style="Content.TFrame")
+            row = ttk.Frame(form_frame, style="TeacherContent.TFrame")
             row.pack(fill='x', pady=5)
 
             ttk.Label(row, text=label, style="Text.TLabel").pack(side='left', padx=5)
@@ -256,7 +273,7 @@ class TeacherDashboard:
             entries[label] = var
 
         # Subject for the exam (fixed based on teacher's subject)
-        subject_row = ttk.Frame(form_frame, style="Content.TFrame")
+        subject_row = ttk.Frame(form_frame, style="TeacherContent.TFrame")
         subject_row.pack(fill='x', pady=5)
 
         ttk.Label(subject_row, text="Subject", style="Text.TLabel").pack(side='left', padx=5)
@@ -282,7 +299,7 @@ class TeacherDashboard:
 
         subject_id = self.user_info.get('subject_id')
         
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         
         try:
@@ -299,7 +316,7 @@ class TeacherDashboard:
             messagebox.showerror("Error", f"Database error: {e}")
             
         finally:
-            conn.close()
+            release_connection(conn)
 
     def show_edit_exam_frame(self):
         selected_item = self.exam_tree.selection()
@@ -312,14 +329,14 @@ class TeacherDashboard:
         
         ttk.Label(self.content_frame, text="Edit Exam", style="Title.TLabel").pack(pady=10)
 
-        form_frame = ttk.Frame(self.content_frame, style="Content.TFrame")
+        form_frame = ttk.Frame(self.content_frame, style="TeacherContent.TFrame")
         form_frame.pack(fill='both', expand=True, padx=20, pady=20)
 
         fields = [("Title", tk.StringVar()), ("Duration (minutes)", tk.StringVar()), ("Total Marks", tk.StringVar())]
         entries = {}
 
         for idx, (label, var) in enumerate(fields):
-            row = ttk.Frame(form_frame, style="Content.TFrame")
+            row = ttk.Frame(form_frame, style="TeacherContent.TFrame")
             row.pack(fill='x', pady=5)
 
             ttk.Label(row, text=label, style="Text.TLabel").pack(side='left', padx=5)
@@ -328,7 +345,7 @@ class TeacherDashboard:
             entries[label] = var
 
         # Fetch exam details from the database
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         
         try:
@@ -347,7 +364,7 @@ class TeacherDashboard:
             messagebox.showerror("Error", f"Database error: {e}")
             
         finally:
-            conn.close()
+            release_connection(conn)
 
         submit_button = ttk.Button(form_frame, text="Save Changes", style="Action.TButton",
                                 command=lambda: self.edit_exam(entries, exam_id))
@@ -366,7 +383,7 @@ class TeacherDashboard:
             messagebox.showerror("Error", "All fields are required!")
             return
         
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         
         try:
@@ -384,7 +401,7 @@ class TeacherDashboard:
             messagebox.showerror("Error", f"Database error: {e}")
             
         finally:
-            conn.close()
+            release_connection(conn)
 
 
     def delete_exam(self):
@@ -399,7 +416,7 @@ class TeacherDashboard:
         if not confirm:
             return
 
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -412,19 +429,19 @@ class TeacherDashboard:
             messagebox.showerror("Error", f"Database error: {e}")
         
         finally:
-            conn.close()
+            release_connection(conn)
 
 
     def show_questions(self):
         self.clear_content()
         
         # Header and action buttons
-        header_frame = ttk.Frame(self.content_frame, style="Content.TFrame")
+        header_frame = ttk.Frame(self.content_frame, style="TeacherContent.TFrame")
         header_frame.pack(fill='x', pady=(0, 20))
         
         ttk.Label(header_frame, text="Manage Questions", style="Title.TLabel").pack(side='left')
         
-        button_frame = ttk.Frame(header_frame, style="Content.TFrame")
+        button_frame = ttk.Frame(header_frame, style="TeacherContent.TFrame")
         button_frame.pack(side='right')
         
         ttk.Button(button_frame, text="Add Question", style="Action.TButton",
@@ -436,7 +453,7 @@ class TeacherDashboard:
         
         # Create Treeview
         columns = ("ID", "Exam", "Question", "Correct Answer", "Marks")
-        self.question_tree = ttk.Treeview(self.content_frame, columns=columns, show='headings')
+        self.question_tree = ttk.Treeview(self.content_frame, columns=columns, show='headings', style="Teacher.Treeview")
         
         # Configure columns
         widths = {"ID": 50, "Exam": 200, "Question": 400, "Correct Answer": 100, "Marks": 100}
@@ -458,29 +475,19 @@ class TeacherDashboard:
 
 
     def populate_questions(self):
-        # Clear existing items
-        for item in self.question_tree.get_children():
-            self.question_tree.delete(item)
-            
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""
+        def fetch(conn):
+            return conn.execute("""
                 SELECT q.id, e.title, q.question, q.correct_answer, q.marks
                 FROM questions q
                 JOIN exams e ON q.exam_id = e.id
                 JOIN teachers t ON e.subject_id = t.subject_id
                 WHERE t.id = ?
-            """, (self.user_info['id'],))
-            
-            for row in cursor.fetchall():
-                self.question_tree.insert("", 'end', values=row)
-                
-        except sqlite3.Error as e:
-            messagebox.showerror("Error", f"Database error: {e}")
-        finally:
-            conn.close()
+            """, (self.user_info['id'],)).fetchall()
+
+        def show(rows):
+            sync_treeview(self.question_tree, rows)
+
+        self.executor.submit(fetch, show, self.show_database_error)
 
 
     def show_add_question_frame(self):
@@ -488,11 +495,11 @@ class TeacherDashboard:
 
         ttk.Label(self.content_frame, text="Add New Question", style="Title.TLabel").pack(pady=10)
 
-        form_frame = ttk.Frame(self.content_frame, style="Content.TFrame")
+        form_frame = ttk.Frame(self.content_frame, style="TeacherContent.TFrame")
         form_frame.pack(fill='both', expand=True, padx=20, pady=20)
 
         # Get available exams
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("""
             SELECT e.id, e.title
@@ -501,7 +508,11 @@ class TeacherDashboard:
             WHERE t.id = ?
         """, (self.user_info['id'],))
         exams = cursor.fetchall()
-        conn.close()
+        release_connection(conn)
+        # Title -> id, keeping the first exam when titles repeat
+        exam_ids = {}
+        for exam_id, title in exams:
+            exam_ids.setdefault(title, exam_id)
         
         # Select Exam
         ttk.Label(form_frame, text="Select Exam:", style="Text.TLabel").grid(row=0, column=0, padx=5, pady=5, sticky='w')
@@ -552,10 +563,9 @@ class TeacherDashboard:
                 messagebox.showerror("Error", "All fields are required!")
                 return
                 
-            # Get exam_id from title
-            exam_id = next(exam[0] for exam in exams if exam[1] == exam_title)
+            exam_id = exam_ids[exam_title]
             
-            conn = sqlite3.connect('exam_system.db')
+            conn = get_connection()
             cursor = conn.cursor()
             
             try:
@@ -572,14 +582,26 @@ class TeacherDashboard:
             except sqlite3.Error as e:
                 messagebox.showerror("Error", f"Database error: {e}")
             finally:
-                conn.close()
+                release_connection(conn)
         
+        def import_file():
+            exam_title = exam_var.get()
+            if not exam_title:
+                messagebox.showerror("Error", "Select the exam to import questions into!")
+                return
+            self.import_questions_from_file(exam_ids[exam_title], import_button, self.show_questions,
+                                            self.user_info['id'])
+
         ttk.Button(form_frame, text="Save", style="Action.TButton",
                 command=save_question).grid(row=7, column=1, padx=5, pady=20, sticky='ew')
+
+        import_button = ttk.Button(form_frame, text="Import from File (GIFT/Aiken/CSV)", style="Action.TButton",
+                                   command=import_file)
+        import_button.grid(row=8, column=1, padx=5, pady=10, sticky='ew')
                 
         back_button = ttk.Button(form_frame, text="Back", style="Action.TButton", 
                                 command=self.show_questions)
-        back_button.grid(row=8, column=1, padx=5, pady=10, sticky='ew')
+        back_button.grid(row=9, column=1, padx=5, pady=10, sticky='ew')
 
     def show_edit_question_frame(self):
         selected_item = self.question_tree.selection()
@@ -592,11 +614,11 @@ class TeacherDashboard:
         
         ttk.Label(self.content_frame, text="Edit Question", style="Title.TLabel").pack(pady=10)
 
-        form_frame = ttk.Frame(self.content_frame, style="Content.TFrame")
+        form_frame = ttk.Frame(self.content_frame, style="TeacherContent.TFrame")
         form_frame.pack(fill='both', expand=True, padx=20, pady=20)
 
         # Get available exams
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("""
             SELECT e.id, e.title
@@ -612,7 +634,11 @@ class TeacherDashboard:
             WHERE id = ?
         """, (question_id,))
         question_data = cursor.fetchone()
-        conn.close()
+        release_connection(conn)
+        # Title -> id, keeping the first exam when titles repeat
+        exam_ids = {}
+        for exam_id, title in exams:
+            exam_ids.setdefault(title, exam_id)
         
         exam_var = tk.StringVar(value=next(exam[1] for exam in exams if exam[0] == question_data[0]))
         question_var = tk.StringVar(value=question_data[1])
@@ -666,13 +692,15 @@ class TeacherDashboard:
                 messagebox.showerror("Error", "All fields are required!")
                 return
                 
-            # Get exam_id from title
-            exam_id = next(exam[0] for exam in exams if exam[1] == exam_title)
+            exam_id = exam_ids[exam_title]
             
-            conn = sqlite3.connect('exam_system.db')
+            conn = get_connection()
             cursor = conn.cursor()
             
             try:
+                cursor.execute("SELECT exam_id, correct_answer FROM questions WHERE id = ?", (question_id,))
+                old_exam_id, old_correct = cursor.fetchone()
+                
                 cursor.execute("""
                     UPDATE questions
                     SET exam_id = ?, question = ?, option_a = ?, option_b = ?, option_c = ?, option_d = ?, 
@@ -682,12 +710,15 @@ class TeacherDashboard:
                 
                 conn.commit()
                 messagebox.showinfo("Success", "Question updated successfully!")
+                # Existing scores of the affected exams are stale now
+                if (old_exam_id, old_correct) != (exam_id, correct):
+                    self.regrade_exams({old_exam_id, exam_id})
                 self.show_questions()
                 
             except sqlite3.Error as e:
                 messagebox.showerror("Error", f"Database error: {e}")
             finally:
-                conn.close()
+                release_connection(conn)
         
         ttk.Button(form_frame, text="Save Changes", style="Action.TButton",
                 command=update_question).grid(row=7, column=1, padx=5, pady=20, sticky='ew')
@@ -708,7 +739,7 @@ class TeacherDashboard:
         if not confirm:
             return
 
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -721,7 +752,7 @@ class TeacherDashboard:
             messagebox.showerror("Error", f"Database error: {e}")
         
         finally:
-            conn.close()
+            release_connection(conn)
 
 
     def show_results(self):
@@ -730,9 +761,29 @@ class TeacherDashboard:
         # Header
         ttk.Label(self.content_frame, text="View Results", style="Title.TLabel").pack(pady=(0, 20))
         
+        # Aggregates over this subject's exams, read from exam_stats
+        self.results_summary = ttk.Label(self.content_frame, text="",
+                                         background=self.colors['content'],
+                                         foreground=self.colors['text'],
+                                         font=('Segoe UI', 11))
+        self.results_summary.pack(anchor='w', padx=20)
+        
+        # Export controls
+        export_frame = ttk.Frame(self.content_frame, style="TeacherContent.TFrame")
+        export_frame.pack(fill='x', padx=20, pady=(10, 0))
+        
+        self.export_button = ttk.Button(export_frame, text="Export Results", style="Action.TButton",
+                                        command=self.export_results)
+        self.export_button.pack(side='left')
+        
+        self.export_status = ttk.Label(export_frame, text="",
+                                       background=self.colors['content'],
+                                       foreground=self.colors['text'],
+                                       font=('Segoe UI', 11))
+        self.export_status.pack(side='left', padx=10)
+        
         # Create Treeview
-        columns = ("ID", "Student", "Exam", "Score", "Date")
-        self.results_tree = ttk.Treeview(self.content_frame, columns=columns, show='headings')
+        self.results_tree = ttk.Treeview(self.content_frame, columns=RESULTS_COLUMNS, show='headings', style="Teacher.Treeview")
         
         # Configure columns
         widths = {"ID": 50, "Student": 200, "Exam": 200, "Score": 100, "Date": 150}
@@ -752,41 +803,122 @@ class TeacherDashboard:
         self.populate_results()
 
     def populate_results(self):
-        # Clear existing items
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-            
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
+        def fetch(conn):
+            rows = conn.execute(RESULTS_SQL, (self.user_info['id'],)).fetchall()
+            return rows, exam_summary(conn, self.user_info['id'])
+
+        def show(result):
+            rows, summary = result
+            self.results_summary.config(text=format_summary(summary))
+            sync_treeview(self.results_tree, rows)
+
+        self.executor.submit(fetch, show, self.show_database_error)
+
+    def export_results(self):
+        # Rows are written in index order (grouped by exam); an ORDER BY
+        # would sort the whole result set before the first row came out
+        self.export_query_to_file(RESULTS_SQL, (self.user_info['id'],), RESULTS_COLUMNS)
+
+    def show_question_analytics(self):
+        self.clear_content()
         
-        try:
-            cursor.execute("""
-                SELECT r.id, u.name, e.title, r.score, r.date
-                FROM results r
-                JOIN students s ON r.student_id = s.id
-                JOIN users u ON s.id = u.id
-                JOIN exams e ON r.exam_id = e.id
+        # Header with exam selector
+        header_frame = ttk.Frame(self.content_frame, style="TeacherContent.TFrame")
+        header_frame.pack(fill='x', pady=(0, 20))
+        
+        ttk.Label(header_frame, text="Question Analytics", style="Title.TLabel").pack(side='left')
+        
+        self.analytics_exam_var = tk.StringVar()
+        self.analytics_exam_combo = ttk.Combobox(header_frame, textvariable=self.analytics_exam_var,
+                                                 state="readonly", width=40)
+        self.analytics_exam_combo.pack(side='right', padx=5)
+        self.analytics_exam_combo.bind('<<ComboboxSelected>>', lambda e: self.populate_question_analytics())
+        
+        self.analytics_summary = ttk.Label(self.content_frame, text="",
+                                           background=self.colors['content'],
+                                           foreground=self.colors['text'],
+                                           font=('Segoe UI', 11))
+        self.analytics_summary.pack(anchor='w', padx=20)
+        
+        # Create Treeview
+        columns = ("ID", "Question", "Correct", "Difficulty", "Discrimination", *OPTION_LETTERS, "Blank")
+        self.analytics_tree = ttk.Treeview(self.content_frame, columns=columns, show='headings', style="Teacher.Treeview")
+        
+        # Configure columns
+        widths = {"ID": 50, "Question": 350, "Correct": 70, "Difficulty": 90, "Discrimination": 110, "Blank": 70}
+        for col in columns:
+            self.analytics_tree.heading(col, text=col)
+            self.analytics_tree.column(col, width=widths.get(col, 60))
+        
+        self.analytics_tree.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Add scrollbar
+        scrollbar = ttk.Scrollbar(self.content_frame, orient='vertical',
+                                command=self.analytics_tree.yview)
+        scrollbar.pack(side='right', fill='y')
+        self.analytics_tree.configure(yscrollcommand=scrollbar.set)
+        
+        def fetch(conn):
+            return conn.execute("""
+                SELECT e.id, e.title
+                FROM exams e
                 JOIN teachers t ON e.subject_id = t.subject_id
                 WHERE t.id = ?
-            """, (self.user_info['id'],))
-            
-            for row in cursor.fetchall():
-                self.results_tree.insert("", 'end', values=row)
-                
-        except sqlite3.Error as e:
-            messagebox.showerror("Error", f"Database error: {e}")
-        finally:
-            conn.close()
+            """, (self.user_info['id'],)).fetchall()
+        
+        def show(exams):
+            self.analytics_exam_combo['values'] = [f"{exam_id} - {title}" for exam_id, title in exams]
+            if exams:
+                self.analytics_exam_combo.current(0)
+                self.populate_question_analytics()
+            else:
+                self.analytics_summary.config(text="No exams in your subject yet")
+        
+        self.executor.submit(fetch, show, self.show_database_error)
+
+    def populate_question_analytics(self):
+        exam_id = int(self.analytics_exam_var.get().split(' - ')[0])
+        
+        def fetch(conn):
+            analysis = self.analysis_cache.get(conn, exam_id)
+            questions = {question_id: (text, correct) for question_id, text, correct in conn.execute(
+                "SELECT id, question, correct_answer FROM questions WHERE exam_id = ?", (exam_id,))}
+            return analysis, questions
+        
+        def show(result):
+            analysis, questions = result
+            rows = []
+            for i, question_id in enumerate(analysis.question_ids):
+                text, correct = questions.get(question_id, ("", ""))
+                rows.append((
+                    question_id, text, correct,
+                    self.format_index(analysis.difficulty[i]),
+                    self.format_index(analysis.discrimination[i]),
+                    *(f"{rate * 100:.1f}%" for rate in analysis.option_rates[i])
+                ))
+            sync_treeview(self.analytics_tree, rows)
+            self.analytics_summary.config(
+                text=f"Submissions analysed: {analysis.attempts}    "
+                     f"KR-20 reliability: {self.format_index(analysis.kr20)}")
+        
+        self.executor.submit(fetch, show, self.show_database_error)
+
+    def format_index(self, value):
+        # NaN marks an index that cannot be computed (e.g. no variation yet)
+        return "-" if value != value else f"{value:.2f}"
+
+    def show_database_error(self, error):
+        messagebox.showerror("Error", f"Database error: {error}")
 
     def show_profile(self):
         self.clear_content()
 
         ttk.Label(self.content_frame, text="Teacher Profile", style="Title.TLabel").pack(pady=10)
 
-        profile_frame = ttk.Frame(self.content_frame, style="Content.TFrame")
+        profile_frame = ttk.Frame(self.content_frame, style="TeacherContent.TFrame")
         profile_frame.pack(fill='both', expand=True, padx=20, pady=20)
 
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -798,7 +930,7 @@ class TeacherDashboard:
         """, (self.user_info['id'],))
         profile_data = cursor.fetchone()
 
-        conn.close()
+        release_connection(conn)
 
         if not profile_data:
             messagebox.showerror("Error", "Unable to fetch profile information.")
@@ -808,7 +940,7 @@ class TeacherDashboard:
         values = list(profile_data)
 
         for label, value in zip(labels, values):
-            row = ttk.Frame(profile_frame, style="Content.TFrame")
+            row = ttk.Frame(profile_frame, style="TeacherContent.TFrame")
             row.pack(fill='x', pady=5)
 
             ttk.Label(row, text=f"{label}:", style="Text.TLabel").pack(side='left', padx=5)
@@ -823,14 +955,14 @@ class TeacherDashboard:
 
         ttk.Label(self.content_frame, text="Edit Profile", style="Title.TLabel").pack(pady=10)
 
-        form_frame = ttk.Frame(self.content_frame, style="Content.TFrame")
+        form_frame = ttk.Frame(self.content_frame, style="TeacherContent.TFrame")
         form_frame.pack(fill='both', expand=True, padx=20, pady=20)
 
         labels = ["Username", "Name", "Email", "Phone", "Subject"]
         updated_entries = {}
 
         for idx, label in enumerate(labels):
-            row = ttk.Frame(form_frame, style="Content.TFrame")
+            row = ttk.Frame(form_frame, style="TeacherContent.TFrame")
             row.pack(fill='x', pady=5)
 
             ttk.Label(row, text=f"{label}:", style="Text.TLabel").pack(side='left', padx=5)
@@ -852,7 +984,7 @@ class TeacherDashboard:
                 messagebox.showerror("Error", "All fields are required!")
                 return
 
-            conn = sqlite3.connect('exam_system.db')
+            conn = get_connection()
             cursor = conn.cursor()
 
             try:
@@ -876,7 +1008,7 @@ class TeacherDashboard:
                 messagebox.showerror("Error", f"Database error: {e}")
             
             finally:
-                conn.close()
+                release_connection(conn)
 
         save_button = ttk.Button(form_frame, text="Save Changes", style="Action.TButton", command=save_profile)
         save_button.pack(pady=20)
@@ -886,7 +1018,7 @@ class TeacherDashboard:
 
     # Database helper methods
     def populate_results_tree(self, tree):
-        conn = connect_db()
+        conn = get_connection()
         cursor = conn.cursor()
         
         try:
@@ -904,16 +1036,9 @@ class TeacherDashboard:
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     def logout(self):
         if messagebox.askyesno("Confirm Logout", "Are you sure you want to logout?"):
-            self.root.destroy()
-            # Create new main window and show login screen
-            root = tk.Tk()
-            from main import UserTypeSelection
-            UserTypeSelection(root)
-            root.mainloop()
-
-def connect_db():
-    return sqlite3.connect('exam_system.db')
+            self.executor.shutdown()
+            self.session.logout()
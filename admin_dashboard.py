@@ -1,15 +1,38 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import sqlite3
 import hashlib
-
-class AdminDashboard:
-    def __init__(self, root, admin_id, login_window):
+import time
+from database import get_connection, release_connection
+from virtual_treeview import VirtualTreeview, sync_treeview
+from query_executor import QueryExecutor
+from dashboard_tasks import DashboardTasks
+from result_stats import exam_summary, format_summary
+from roster_import import import_roster, ROSTER_FILETYPES, ROSTER_COLUMNS
+from progress_report import fetch_class_reports, generate_class_reports
+from theme import use_styles
+
+# Results list query, shared by the results page and its export. CROSS JOIN
+# pins results as the outer loop, so rows come straight off idx_results_date
+# in page order instead of being sorted after the join.
+RESULTS_SELECT_SQL = """
+    SELECT r.id, u.name, e.title, r.score, r.date
+    FROM results r
+    CROSS JOIN students s ON r.student_id = s.id
+    CROSS JOIN users u ON s.id = u.id  -- Join with users table to get the student name
+    CROSS JOIN exams e ON r.exam_id = e.id
+"""
+RESULTS_COLUMNS = ("ID", "Student", "Exam", "Score", "Date")
+
+class AdminDashboard(DashboardTasks):
+    def __init__(self, root, admin_id, session):
         self.root = root
         self.admin_id = admin_id
-        self.login_window = login_window
+        self.session = session
         self.root.title("Admin Dashboard")
         
+        self.executor = QueryExecutor.for_root(root)
+        
         # Configure the window
         self.root.state('zoomed')  # Maximize window
         
@@ -25,33 +48,8 @@ class AdminDashboard:
             'hover': '#233554'          # Hover state color
         }
         
-        # Configure styles
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-        
-        # Configure widget styles
-        self.style.configure("Sidebar.TFrame", background=self.colors['sidebar'])
-        self.style.configure("Content.TFrame", background=self.colors['content'])
-        self.style.configure("NavButton.TButton",
-                           background=self.colors['sidebar'],
-                           foreground=self.colors['text'],
-                           font=('Segoe UI', 11),
-                           borderwidth=0,
-                           padding=20)
-        self.style.map("NavButton.TButton",
-                      background=[('active', self.colors['hover'])],
-                      foreground=[('active', self.colors['accent1'])])
-                      
-        # Configure Treeview style
-        self.style.configure("Treeview",
-                           background=self.colors['content'],
-                           foreground=self.colors['text'],
-                           fieldbackground=self.colors['content'],
-                           borderwidth=0)
-        self.style.configure("Treeview.Heading",
-                           background=self.colors['sidebar'],
-                           foreground=self.colors['text'],
-                           borderwidth=0)
+        # Configure styles (once per Tk interpreter, not on every login)
+        self.style = use_styles(root, "admin", self.configure_styles)
         
         # Main container
         self.main_container = ttk.Frame(root)
@@ -93,6 +91,30 @@ class AdminDashboard:
         self.current_page = None
         self.show_students_page()
     
+    def configure_styles(self, style):
+        style.configure("Sidebar.TFrame", background=self.colors['sidebar'])
+        style.configure("Content.TFrame", background=self.colors['content'])
+        style.configure("NavButton.TButton",
+                        background=self.colors['sidebar'],
+                        foreground=self.colors['text'],
+                        font=('Segoe UI', 11),
+                        borderwidth=0,
+                        padding=20)
+        style.map("NavButton.TButton",
+                  background=[('active', self.colors['hover'])],
+                  foreground=[('active', self.colors['accent1'])])
+
+        # Configure Treeview style
+        style.configure("Treeview",
+                        background=self.colors['content'],
+                        foreground=self.colors['text'],
+                        fieldbackground=self.colors['content'],
+                        borderwidth=0)
+        style.configure("Treeview.Heading",
+                        background=self.colors['sidebar'],
+                        foreground=self.colors['text'],
+                        borderwidth=0)
+
     def create_nav_button(self, text, command):
         btn = ttk.Button(self.sidebar,
                         text=text,
@@ -102,6 +124,7 @@ class AdminDashboard:
         return btn
     
     def clear_content(self):
+        self.executor.cancel_all()
         for widget in self.content_frame.winfo_children():
             widget.destroy()
             
@@ -122,11 +145,17 @@ class AdminDashboard:
                 foreground=self.colors['text'],
                 background=self.colors['content']).pack(pady=(0, 20))
 
-        # Student list
-        self.student_tree = ttk.Treeview(page_frame,
+        # Student list, paged in from the database as the user scrolls
+        self.student_tree = VirtualTreeview(page_frame,
                                         columns=("ID", "Username", "Name", "Class"),
-                                        show="headings",
-                                        style="Treeview")
+                                        select_sql='''
+                                            SELECT u.id, u.username, u.name, s.class
+                                            FROM users u
+                                            JOIN students s ON u.id = s.id
+                                        ''',
+                                        where_sql="u.role = 'Student'",
+                                        order_by=("u.id",),
+                                        key_index=(0,))
         self.student_tree.heading("ID", text="ID")
         self.student_tree.heading("Username", text="Username")
         self.student_tree.heading("Name", text="Name")
@@ -146,30 +175,111 @@ class AdminDashboard:
         delete_button = ttk.Button(button_frame, text="Delete Student", command=self.delete_student)
         delete_button.pack(side='left', padx=10)
 
+        self.import_button = ttk.Button(button_frame, text="Import Roster", command=self.import_student_roster)
+        self.import_button.pack(side='left', padx=10)
+
+        self.import_status = ttk.Label(button_frame, text="")
+        self.import_status.pack(side='left', padx=10)
+
+        self.reports_button = ttk.Button(button_frame, text="Progress Reports", command=self.generate_progress_reports)
+        self.reports_button.pack(side='left', padx=10)
+
+        self.reports_status = ttk.Label(button_frame, text="")
+        self.reports_status.pack(side='left', padx=10)
+
         self.refresh_student_list()
 
     def refresh_student_list(self):
-        # Clear existing data
-        for row in self.student_tree.get_children():
-            self.student_tree.delete(row)
+        self.student_tree.reload()
 
-        # Fetch students from the database
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
+    def import_student_roster(self):
+        path = filedialog.askopenfilename(filetypes=ROSTER_FILETYPES,
+                                          title=f"Import Roster (columns: {', '.join(ROSTER_COLUMNS)})")
+        if not path:
+            return
 
-        cursor.execute('''
-            SELECT u.id, u.username, u.name, s.class
-            FROM users u
-            JOIN students s ON u.id = s.id
-            WHERE u.role = 'Student'
-        ''')
+        # The page's own widgets: by the time the import ends they may be gone,
+        # or replaced by those of a later visit to the page
+        import_button, import_status = self.import_button, self.import_status
+        import_button.config(state='disabled')
+        import_status.config(text="Importing...")
+
+        def show_progress(done, total):
+            if import_status.winfo_exists():
+                import_status.config(text=f"Imported {done:,} of {total:,}...")
+
+        def run_import(conn):
+            # Worker thread; progress is handed to the Tk thread
+            return import_roster(conn, path, lambda done, total: self.executor.call_soon(show_progress, done, total))
+
+        def finish():
+            if import_status.winfo_exists():
+                import_button.config(state='normal')
+                import_status.config(text="")
+                self.refresh_student_list()
+
+        def done(report):
+            finish()
+            messagebox.showinfo("Roster Import", report.summary())
+
+        def failed(e):
+            finish()
+            messagebox.showerror("Roster Import", f"An error occurred: {e}")
+
+        # Chunks already committed stay committed, so let the import finish
+        # even if the admin moves to another page
+        self.executor.submit(run_import, done, failed, cancel_on_leave=False)
+
+    def generate_progress_reports(self):
+        as_zip = messagebox.askyesnocancel("Progress Reports",
+                                           "Save every student's report in a single zip file?\n\n"
+                                           "Yes: one .zip file\nNo: a folder of PDFs, one sub-folder per class")
+        if as_zip is None:
+            return
+        if as_zip:
+            output = filedialog.asksaveasfilename(defaultextension=".zip", filetypes=[("Zip archives", "*.zip")],
+                                                  title="Save Progress Reports")
+        else:
+            output = filedialog.askdirectory(title="Folder for Progress Reports")
+        if not output:
+            return
 
-        students = cursor.fetchall()
+        reports_button, reports_status = self.reports_button, self.reports_status
+        reports_button.config(state='disabled')
+        reports_status.config(text="Collecting results...")
+
+        def show_progress(done, total):
+            if reports_status.winfo_exists():
+                reports_status.config(text=f"Generated {done:,} of {total:,}...")
+
+        def run_reports(conn):
+            # Worker thread; the PDFs themselves are rendered in other processes
+            started = time.perf_counter()
+            jobs = fetch_class_reports(conn)
+            written = generate_class_reports(
+                jobs, output, progress=lambda done, total: self.executor.call_soon(show_progress, done, total))
+            return written, time.perf_counter() - started
+
+        def finish():
+            if reports_status.winfo_exists():
+                reports_button.config(state='normal')
+                reports_status.config(text="")
+
+        def done(outcome):
+            written, seconds = outcome
+            finish()
+            if not written:
+                messagebox.showinfo("Progress Reports", "No results available to generate reports.")
+                return
+            messagebox.showinfo("Progress Reports",
+                                f"Generated {written:,} report(s) in {seconds:.1f} s "
+                                f"({written / max(seconds, 1e-9):.1f} reports/s).\n\nSaved to {output}")
 
-        for student in students:
-            self.student_tree.insert("", "end", values=student)
+        def failed(e):
+            finish()
+            messagebox.showerror("Progress Reports", f"An error occurred: {e}")
 
-        conn.close()
+        self.executor.submit(run_reports, done, failed, cancel_on_leave=False)
 
     def show_add_student_page(self):
         self.current_page = "add_student"  # Update current page
@@ -228,7 +338,7 @@ class AdminDashboard:
         hashed_password = hashlib.sha256(password.encode()).hexdigest()
 
         # Insert data into database
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -258,7 +368,7 @@ class AdminDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     def edit_student(self):
         selected_item = self.student_tree.selection()
@@ -276,7 +386,7 @@ class AdminDashboard:
         self.current_page = "edit_student"
 
         # Fetch student details
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('''
             SELECT u.name, u.email, s.class
@@ -285,7 +395,7 @@ class AdminDashboard:
             WHERE u.id = ?
         ''', (student_id,))
         student_data = cursor.fetchone()
-        conn.close()
+        release_connection(conn)
 
         if not student_data:
             messagebox.showerror("Error", "Student not found!")
@@ -345,7 +455,7 @@ class AdminDashboard:
             return
 
         # Update data in database
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -370,7 +480,7 @@ class AdminDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
 
     def delete_student(self):
@@ -384,7 +494,7 @@ class AdminDashboard:
         # Confirm deletion
         confirm = messagebox.askyesno("Confirm Deletion", "Are you sure you want to delete this student?")
         if confirm:
-            conn = sqlite3.connect('exam_system.db')
+            conn = get_connection()
             cursor = conn.cursor()
 
             # Delete the student from students table and associated user
@@ -397,7 +507,7 @@ class AdminDashboard:
             ''', (student_id,))
 
             conn.commit()
-            conn.close()
+            release_connection(conn)
 
             self.refresh_student_list()
             messagebox.showinfo("Success", "Student deleted successfully.")
@@ -447,28 +557,20 @@ class AdminDashboard:
         self.refresh_teacher_list()
 
     def refresh_teacher_list(self):
-        # Clear existing data
-        for row in self.teacher_tree.get_children():
-            self.teacher_tree.delete(row)
-
         # Fetch teachers from the database
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT u.id, u.username, u.name, t.phone, s.subject_name
-            FROM users u
-            JOIN teachers t ON u.id = t.id
-            JOIN subjects s ON t.subject_id = s.id
-            WHERE u.role = 'Teacher'
-        ''')
-
-        teachers = cursor.fetchall()
+        def fetch(conn):
+            return conn.execute('''
+                SELECT u.id, u.username, u.name, t.phone, s.subject_name
+                FROM users u
+                JOIN teachers t ON u.id = t.id
+                JOIN subjects s ON t.subject_id = s.id
+                WHERE u.role = 'Teacher'
+            ''').fetchall()
 
-        for teacher in teachers:
-            self.teacher_tree.insert("", "end", values=teacher)
+        def show(teachers):
+            sync_treeview(self.teacher_tree, teachers)
 
-        conn.close()
+        self.executor.submit(fetch, show)
 
     def show_add_teacher_page(self):
         self.current_page = "add_teacher"  # Update current page
@@ -509,11 +611,11 @@ class AdminDashboard:
         subject_dropdown.pack(fill='x', pady=5)
 
         # Fetch subjects from database
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT subject_name FROM subjects')  # Assuming subjects table has 'subject_name' column
         subjects = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        release_connection(conn)
 
         subject_dropdown['values'] = subjects
         entries["Subject"] = subject_var
@@ -542,7 +644,7 @@ class AdminDashboard:
         # Encrypt the password using SHA256
         encrypted_password = hashlib.sha256(password.encode()).hexdigest()
 
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -582,9 +684,10 @@ class AdminDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     def clear_content(self):
+        self.executor.cancel_all()
         for widget in self.content_frame.winfo_children():
             widget.destroy()
 
@@ -611,7 +714,7 @@ class AdminDashboard:
                 background=self.colors['content']).pack(pady=(0, 20))
 
         # Fetch teacher details
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
         # Fetch teacher details
         cursor.execute('''
@@ -625,7 +728,7 @@ class AdminDashboard:
         # Fetch subjects from database
         cursor.execute('SELECT id, subject_name FROM subjects')
         subjects = cursor.fetchall()
-        conn.close()
+        release_connection(conn)
 
         if not teacher_data:
             messagebox.showerror("Error", "Unable to fetch teacher details!")
@@ -687,7 +790,7 @@ class AdminDashboard:
             messagebox.showerror("Error", "Selected subject is not valid.")
             return
 
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -710,7 +813,7 @@ class AdminDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     def delete_teacher(self):
         selected_item = self.teacher_tree.selection()
@@ -725,7 +828,7 @@ class AdminDashboard:
         if not confirm:
             return
 
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -742,9 +845,10 @@ class AdminDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     def show_subject_page(self):
+        self.current_page = "subjects"
         self.clear_content()
 
         ttk.Label(self.content_frame, text="Manage Subjects", style="Subtitle.TLabel").pack(pady=10)
@@ -770,18 +874,16 @@ class AdminDashboard:
         self.populate_subjects_tree()
 
     def populate_subjects_tree(self):
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
+        def fetch(conn):
+            return conn.execute("SELECT id, subject_name FROM subjects").fetchall()
 
-        cursor.execute("SELECT id, subject_name FROM subjects")
-        subjects = cursor.fetchall()
-
-        for subject in subjects:
-            self.tree.insert("", 'end', values=subject)
+        def show(subjects):
+            sync_treeview(self.tree, subjects)
 
-        conn.close()
+        self.executor.submit(fetch, show)
 
     def add_subject(self):
+        self.current_page = "add_subject"
         self.clear_content()
 
         ttk.Label(self.content_frame, text="Add New Subject", style="Subtitle.TLabel").pack(pady=10)
@@ -803,7 +905,7 @@ class AdminDashboard:
 
 
     def submit_subject(self, subject_name):
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -816,7 +918,7 @@ class AdminDashboard:
             messagebox.showerror("Database Error", f"An error occurred: {e}")
 
         finally:
-            conn.close()
+            release_connection(conn)
 
     def edit_subject(self):
         selected_item = self.tree.selection()
@@ -828,15 +930,16 @@ class AdminDashboard:
         self.show_edit_subject_page(subject_id)
 
     def show_edit_subject_page(self, subject_id):
+        self.current_page = "edit_subject"
         self.clear_content()
 
         ttk.Label(self.content_frame, text="Edit Subject", style="Subtitle.TLabel").pack(pady=10)
 
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT subject_name FROM subjects WHERE id = ?", (subject_id,))
         subject_name = cursor.fetchone()[0]
-        conn.close()
+        release_connection(conn)
 
         form_frame = ttk.Frame(self.content_frame, style="Content.TFrame")
         form_frame.pack(fill='both', expand=True, padx=20, pady=20)
@@ -855,7 +958,7 @@ class AdminDashboard:
 
 
     def update_subject(self, subject_id, subject_name):
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -868,7 +971,7 @@ class AdminDashboard:
             messagebox.showerror("Database Error", f"An error occurred: {e}")
 
         finally:
-            conn.close()
+            release_connection(conn)
 
     def delete_subject(self):
         selected_item = self.tree.selection()
@@ -946,29 +1049,19 @@ class AdminDashboard:
 
 
     def refresh_exam_list(self):
-        # Connect to the database
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
-
         # Fetch exams data with subject names
-        cursor.execute('''
-        SELECT exams.id, exams.title, subjects.subject_name AS subject, exams.duration, users.name AS created_by
-        FROM exams
-        LEFT JOIN subjects ON exams.subject_id = subjects.id
-        LEFT JOIN users ON exams.created_by = users.id
-        ''')
-        exams = cursor.fetchall()
-
-        # Clear the existing items in the Treeview
-        for item in self.exam_tree.get_children():
-            self.exam_tree.delete(item)
+        def fetch(conn):
+            return conn.execute('''
+            SELECT exams.id, exams.title, subjects.subject_name AS subject, exams.duration, users.name AS created_by
+            FROM exams
+            LEFT JOIN subjects ON exams.subject_id = subjects.id
+            LEFT JOIN users ON exams.created_by = users.id
+            ''').fetchall()
 
-        # Insert the fetched data into the Treeview
-        for exam in exams:
-            self.exam_tree.insert('', 'end', values=exam)
+        def show(exams):
+            sync_treeview(self.exam_tree, exams)
 
-        # Close the database connection
-        conn.close()
+        self.executor.submit(fetch, show)
 
 
     def show_add_exam_page(self):
@@ -1011,11 +1104,11 @@ class AdminDashboard:
         subject_combobox.pack(side='left', fill='x', expand=True, padx=5)
 
         # Load subjects from database
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT id, subject_name FROM subjects")
         subjects = cursor.fetchall()
-        conn.close()
+        release_connection(conn)
 
         # Populate the combobox
         subject_dict = {subject[1]: subject[0] for subject in subjects}  # Map subject_name to subject_id
@@ -1046,11 +1139,12 @@ class AdminDashboard:
             messagebox.showerror("Error", "All fields are required!")
             return
 
+        conn = None
         try:
             subject_id = subject_dict[selected_subject]  # Get subject_id from selected subject name
             duration = int(duration)  # Validate duration
 
-            conn = sqlite3.connect("exam_system.db")
+            conn = get_connection()
             cursor = conn.cursor()
 
             # Insert into exams table
@@ -1068,7 +1162,7 @@ class AdminDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     
     def edit_exam(self):
@@ -1085,7 +1179,7 @@ class AdminDashboard:
         self.clear_content()
         self.current_page = "edit_exam"
 
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
         
         # Fetch exam data and subject options
@@ -1100,7 +1194,7 @@ class AdminDashboard:
         cursor.execute('SELECT id, subject_name FROM subjects')
         subjects_data = cursor.fetchall()
         
-        conn.close()
+        release_connection(conn)
 
         if not exam_data:
             messagebox.showerror("Error", "Exam not found!")
@@ -1172,12 +1266,12 @@ class AdminDashboard:
             return
 
         # Get the subject ID from the dictionary
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         cursor.execute('SELECT id FROM subjects WHERE subject_name = ?', (new_subject_name,))
         subject_id_data = cursor.fetchone()
-        conn.close()
+        release_connection(conn)
 
         if not subject_id_data:
             messagebox.showerror("Error", "Invalid subject!")
@@ -1185,7 +1279,7 @@ class AdminDashboard:
 
         new_subject_id = subject_id_data[0]
 
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -1202,7 +1296,7 @@ class AdminDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
 
     def delete_exam(self):
@@ -1213,7 +1307,7 @@ class AdminDashboard:
 
         exam_id = self.exam_tree.item(selected_item, 'values')[0]
 
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -1225,7 +1319,7 @@ class AdminDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     def show_questions_page(self):
         if self.current_page == "questions":
@@ -1242,27 +1336,20 @@ class AdminDashboard:
                 text="Existing Questions",
                 style="Title.TLabel").pack(anchor='w', pady=(0, 20))
         
-        # Create treeview with scrollbar
-        tree_frame = ttk.Frame(list_frame, style="Content.TFrame")
-        tree_frame.pack(fill='both', expand=True)
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side='right', fill='y')
-        
-        # Create treeview
-        self.question_tree = ttk.Treeview(
-            tree_frame,
+        # Create paged treeview with scrollbar
+        self.question_tree = VirtualTreeview(
+            list_frame,
             columns=("ID", "Exam", "Question", "Correct"),
-            show="headings",
-            style="Treeview"
+            select_sql='''
+                SELECT questions.id, exams.title, questions.question, questions.correct_answer
+                FROM questions
+                JOIN exams ON questions.exam_id = exams.id
+            ''',
+            order_by=("questions.id",),
+            key_index=(0,)
         )
         self.question_tree.pack(fill='both', expand=True)
         
-        # Configure scrollbar
-        scrollbar.config(command=self.question_tree.yview)
-        self.question_tree.config(yscrollcommand=scrollbar.set)
-        
         # Configure columns
         self.question_tree.heading("ID", text="ID")
         self.question_tree.heading("Exam", text="Exam")
@@ -1293,28 +1380,7 @@ class AdminDashboard:
 
 
     def refresh_question_list(self):
-        # Connect to the database
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
-
-        # Fetch questions data
-        cursor.execute('''
-        SELECT questions.id, exams.title, questions.question, questions.correct_answer
-        FROM questions
-        JOIN exams ON questions.exam_id = exams.id
-        ''')
-        questions = cursor.fetchall()
-
-        # Clear the existing items in the Treeview
-        for item in self.question_tree.get_children():
-            self.question_tree.delete(item)
-
-        # Insert the fetched data into the Treeview
-        for question in questions:
-            self.question_tree.insert('', 'end', values=question)
-
-        # Close the database connection
-        conn.close()
+        self.question_tree.reload()
 
     def show_add_question_page(self):
         self.clear_content()  # Clear the current content before showing Add Question page
@@ -1393,10 +1459,22 @@ class AdminDashboard:
         add_button = ttk.Button(page_frame, text="Add", command=lambda: self.add_question_to_database(self.exam_var, self.question_text, self.option_entries, self.correct_var))
         add_button.pack(pady=20)
 
+        # Bulk import into the selected exam
+        self.question_import_button = ttk.Button(page_frame, text="Import from File (GIFT/Aiken/CSV)",
+                                                 command=self.import_question_file)
+        self.question_import_button.pack(pady=(0, 10))
+
         # Back button
         back_button = ttk.Button(page_frame, text="Back", command=self.show_questions_page)  # Going back to question list
         back_button.pack(pady=10)
             
+    def import_question_file(self):
+        exam_id = self.exam_var.get().split('-')[0].strip()
+        if not exam_id:
+            messagebox.showerror("Error", "Select the exam to import questions into!")
+            return
+        self.import_questions_from_file(int(exam_id), self.question_import_button, self.show_questions_page)
+
 
     def add_question_to_database(self, exam_var, question_text, option_entries, correct_var):
         exam_id = exam_var.get().split('-')[0].strip()
@@ -1408,7 +1486,7 @@ class AdminDashboard:
             messagebox.showerror("Error", "Please fill all fields!")
             return
 
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -1424,7 +1502,7 @@ class AdminDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
 
     def edit_question(self):
@@ -1437,13 +1515,13 @@ class AdminDashboard:
         self.show_edit_question_page(question_id)
     
     def get_exam_title(self, exam_id):
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         cursor.execute("SELECT title FROM exams WHERE id = ?", (exam_id,))
         exam_title = cursor.fetchone()
 
-        conn.close()
+        release_connection(conn)
 
         return exam_title[0] if exam_title else "Unknown Exam"
 
@@ -1452,7 +1530,7 @@ class AdminDashboard:
         self.clear_content()
         self.current_page = "edit_question"
 
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute('''
             SELECT exam_id, question, option_a, option_b, option_c, option_d, correct_answer
@@ -1460,7 +1538,7 @@ class AdminDashboard:
             WHERE id = ?
         ''', (question_id,))
         question_data = cursor.fetchone()
-        conn.close()
+        release_connection(conn)
 
         if not question_data:
             messagebox.showerror("Error", "Question not found!")
@@ -1558,10 +1636,13 @@ class AdminDashboard:
             messagebox.showerror("Error", "Please fill all fields!")
             return
 
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
+            cursor.execute('SELECT exam_id, correct_answer FROM questions WHERE id = ?', (question_id,))
+            old_exam_id, old_correct = cursor.fetchone()
+
             cursor.execute('''
                 UPDATE questions
                 SET exam_id = ?, question = ?, option_a = ?, option_b = ?, option_c = ?, option_d = ?, correct_answer = ?
@@ -1570,12 +1651,15 @@ class AdminDashboard:
 
             conn.commit()
             messagebox.showinfo("Success", "Question updated successfully!")
+            # Existing scores of the affected exams are stale now
+            if (old_exam_id, old_correct) != (int(exam_id), new_correct):
+                self.regrade_exams({old_exam_id, int(exam_id)})
             self.show_questions_page()
 
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     def delete_question(self):
         selected_item = self.question_tree.selection()
@@ -1585,7 +1669,7 @@ class AdminDashboard:
 
         question_id = self.question_tree.item(selected_item, 'values')[0]
 
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -1597,14 +1681,14 @@ class AdminDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     def refresh_exam_dropdown(self):
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT id, title FROM exams")
         exams = cursor.fetchall()
-        conn.close()
+        release_connection(conn)
 
         self.exam_dropdown['values'] = [f"{exam[0]} - {exam[1]}" for exam in exams]
         
@@ -1623,27 +1707,26 @@ class AdminDashboard:
                 text="Exam Results",
                 style="Title.TLabel").pack(anchor='w', pady=(0, 20))
         
-        # Create treeview with scrollbar
-        tree_frame = ttk.Frame(results_frame, style="Content.TFrame")
-        tree_frame.pack(fill='both', expand=True)
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side='right', fill='y')
-        
-        # Create treeview
-        self.results_tree = ttk.Treeview(
-            tree_frame,
-            columns=("ID", "Student", "Exam", "Score", "Date"),
-            show="headings",
-            style="Treeview"
+        # Aggregates over all exams, read from exam_stats
+        self.results_summary = ttk.Label(results_frame,
+                text="",
+                background=self.colors['content'],
+                foreground=self.colors['text_secondary'],
+                font=('Segoe UI', 11))
+        self.results_summary.pack(anchor='w', pady=(0, 10))
+        
+        # Create paged treeview with scrollbar, newest results first
+        self.results_tree = VirtualTreeview(
+            results_frame,
+            columns=RESULTS_COLUMNS,
+            select_sql=RESULTS_SELECT_SQL,
+            order_by=("r.date", "r.id"),
+            key_index=(4, 0),
+            descending=True,
+            row_formatter=self.format_result_row
         )
         self.results_tree.pack(fill='both', expand=True)
         
-        # Configure scrollbar
-        scrollbar.config(command=self.results_tree.yview)
-        self.results_tree.config(yscrollcommand=scrollbar.set)
-        
         # Configure columns
         self.results_tree.heading("ID", text="ID")
         self.results_tree.heading("Student", text="Student")
@@ -1658,47 +1741,37 @@ class AdminDashboard:
         self.results_tree.column("Score", width=100)
         self.results_tree.column("Date", width=150)
         
+        # Export controls
+        button_frame = ttk.Frame(results_frame)
+        button_frame.pack(pady=20)
+        
+        self.export_button = ttk.Button(button_frame, text="Export Results", command=self.export_results)
+        self.export_button.pack(side='left', padx=10)
+        
+        self.export_status = ttk.Label(button_frame, text="")
+        self.export_status.pack(side='left', padx=10)
+        
         # Load results
         self.refresh_results_list()
         
     def refresh_results_list(self):
-        # Clear existing items
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-            
-        try:
-            conn = sqlite3.connect('exam_system.db', timeout=20)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT r.id, u.name, e.title, r.score, r.date
-                FROM results r
-                JOIN students s ON r.student_id = s.id
-                JOIN users u ON s.id = u.id  -- Join with users table to get the student name
-                JOIN exams e ON r.exam_id = e.id
-                ORDER BY r.date DESC
-            """)
-            
-            results = cursor.fetchall()
-            
-            for result in results:
-                # Format the score to 2 decimal places
-                result = list(result)
-                result[3] = f"{float(result[3]):.2f}"
-                self.results_tree.insert("", "end", values=result)
-                    
-            conn.close()
-            
-        except sqlite3.Error as e:
-            messagebox.showerror("Database Error", f"An error occurred while refreshing results list: {str(e)}")
-            if conn:
-                conn.close()
+        self.results_tree.reload()
+        
+        def show(summary):
+            self.results_summary.config(text=format_summary(summary))
+        
+        self.executor.submit(exam_summary, show)
+
+    def export_results(self):
+        self.export_query_to_file(RESULTS_SELECT_SQL + " ORDER BY r.date DESC, r.id DESC", (), RESULTS_COLUMNS)
+
+    def format_result_row(self, result):
+        # Format the score to 2 decimal places
+        result = list(result)
+        result[3] = f"{float(result[3]):.2f}"
+        return result
 
     def logout(self):
         if messagebox.askyesno("Confirm Logout", "Are you sure you want to logout?"):
-            self.root.destroy()
-            # Create new main window
-            root = tk.Tk()
-            from main import UserTypeSelection
-            UserTypeSelection(root)
-            root.mainloop()
\ No newline at end of file
+            self.executor.shutdown()
+            self.session.logout()
\ No newline at end of file
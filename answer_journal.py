@@ -0,0 +1,139 @@
+import os
+import queue
+import threading
+import time
+from database import DB_PATH
+
+# Journals live next to the database, one file per unfinished attempt
+JOURNAL_DIR = os.environ.get('EXAM_JOURNAL_DIR',
+                             os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), 'answer_journals'))
+# Answers arriving within this window share one write and one fsync
+BATCH_WINDOW = 0.2
+# Rewrite the journal once it holds this many records per distinct answer
+COMPACT_RATIO = 4
+COMPACT_MIN_RECORDS = 64
+
+_STOP = object()
+
+
+def _parse(line):
+    question_id, sep, answer = line.rstrip('\n').partition('\t')
+    if not sep or not question_id.isdigit():
+        return None
+    return question_id, answer
+
+
+class AnswerJournal:
+    """Append-only, crash-safe log of one student's answers during an exam.
+
+    Each answer is appended as a "question_id<TAB>answer" line; the last
+    line for a question wins on replay. A background thread does all the
+    writing so recording an answer never blocks the Tk thread. It groups
+    answers into batches with one fsync each, and compacts the file to a
+    single line per question when it grows.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.Queue()
+        self._thread = None
+        self._answers = {}
+        self._records = 0
+
+    @classmethod
+    def for_attempt(cls, student_id, exam_id):
+        return cls(os.path.join(JOURNAL_DIR, f"student{student_id}_exam{exam_id}.log"))
+
+    def load(self):
+        """Replay the journal into a {question_id: answer} dict.
+
+        A line cut short by a crash (no trailing newline) is ignored.
+        """
+        answers = {}
+        records = 0
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    if not line.endswith('\n'):
+                        break
+                    record = _parse(line)
+                    if record is not None:
+                        answers[record[0]] = record[1]
+                        records += 1
+        except FileNotFoundError:
+            pass
+        self._answers = dict(answers)
+        self._records = records
+        return answers
+
+    def start(self):
+        if self._thread is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="answer-journal", daemon=True)
+            self._thread.start()
+
+    def record(self, question_id, answer):
+        self._queue.put((str(question_id), answer))
+
+    def close(self, discard=False):
+        """Flush outstanding answers; with ``discard`` also delete the file."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if discard:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _run(self):
+        # Journal thread
+        f = open(self.path, 'a', encoding='utf-8')
+        try:
+            if self._needs_compaction():
+                f = self._compact(f)
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + BATCH_WINDOW
+                while batch[-1] is not _STOP:
+                    try:
+                        batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                    except queue.Empty:
+                        break
+                stop = batch[-1] is _STOP
+                records = [item for item in batch if item is not _STOP]
+                if records:
+                    f.write(''.join(f"{question_id}\t{answer}\n" for question_id, answer in records))
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self._answers.update(records)
+                    self._records += len(records)
+                if stop:
+                    return
+                if self._needs_compaction():
+                    f = self._compact(f)
+        finally:
+            f.close()
+
+    def _needs_compaction(self):
+        return self._records >= max(COMPACT_MIN_RECORDS, COMPACT_RATIO * len(self._answers))
+
+    def _compact(self, f):
+        # Write the current answers to a new file and swap it in atomically
+        f.close()
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as temp:
+            temp.write(''.join(f"{question_id}\t{answer}\n" for question_id, answer in self._answers.items()))
+            temp.flush()
+            os.fsync(temp.fileno())
+        os.replace(temp_path, self.path)
+        if hasattr(os, 'O_DIRECTORY'):
+            # Make the rename itself durable
+            dir_fd = os.open(os.path.dirname(self.path), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        self._records = len(self._answers)
+        return open(self.path, 'a', encoding='utf-8')
@@ -0,0 +1,90 @@
+import os
+from tkinter import filedialog, messagebox
+
+from question_import import QUESTION_FILETYPES, import_questions
+from result_export import EXPORT_FILETYPES, export_query
+from scoring import regrade_exam
+
+
+class DashboardTasks:
+    """Background jobs shared by the admin and teacher dashboards.
+
+    Mixed into a dashboard class that sets ``self.executor`` to its
+    QueryExecutor; the export also uses ``self.export_button`` and
+    ``self.export_status`` from the results page. Work runs on the
+    executor's threads; everything that touches widgets runs on the Tk
+    thread.
+    """
+
+    def regrade_exams(self, exam_ids):
+        """Rescore stored submissions in the background after an answer key changed"""
+        def regrade(conn):
+            return sum(regrade_exam(conn, exam_id) for exam_id in exam_ids)
+
+        def done(count):
+            if count:
+                messagebox.showinfo("Results Updated", f"Updated the scores of {count} submission(s) for the corrected answer key.")
+
+        def failed(e):
+            messagebox.showerror("Error", f"Database error: {e}")
+
+        # Must finish even if the user moves on to another page
+        self.executor.submit(regrade, done, failed, cancel_on_leave=False)
+
+    def export_query_to_file(self, sql, params, columns):
+        """Ask for a file and stream the query's rows into it in the background"""
+        path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                            filetypes=EXPORT_FILETYPES,
+                                            title="Export Results")
+        if not path:
+            return
+
+        self.export_button.config(state='disabled')
+        self.export_status.config(text="Exporting...")
+
+        def show_progress(count):
+            if self.export_status.winfo_exists():
+                self.export_status.config(text=f"Exported {count:,} rows...")
+
+        def export(conn):
+            # Worker thread; progress is handed to the Tk thread
+            return export_query(conn, sql, params, columns, path,
+                                lambda count: self.executor.call_soon(show_progress, count))
+
+        def done(count):
+            self.export_button.config(state='normal')
+            self.export_status.config(text=f"Exported {count:,} rows to {os.path.basename(path)}")
+
+        def failed(e):
+            self.export_button.config(state='normal')
+            self.export_status.config(text="")
+            messagebox.showerror("Export Failed", f"An error occurred: {e}")
+
+        self.executor.submit(export, done, failed)
+
+    def import_questions_from_file(self, exam_id, import_button, on_imported, created_by=None):
+        """Ask for a question file and import it into an exam in the background"""
+        path = filedialog.askopenfilename(filetypes=QUESTION_FILETYPES, title="Import Questions")
+        if not path:
+            return
+
+        import_button.config(state='disabled')
+
+        def done(report):
+            messagebox.showinfo("Question Import", report.summary())
+            # Leave the page alone if the user has moved on meanwhile
+            if not import_button.winfo_exists():
+                return
+            if report.imported:
+                on_imported()
+            else:
+                import_button.config(state='normal')
+
+        def failed(e):
+            if import_button.winfo_exists():
+                import_button.config(state='normal')
+            messagebox.showerror("Question Import", f"An error occurred: {e}")
+
+        # One transaction: either every new question lands or none does
+        self.executor.submit(lambda conn: import_questions(conn, path, exam_id, created_by),
+                             done, failed, cancel_on_leave=False)
@@ -1,112 +1,599 @@
 import sqlite3
 import hashlib
+import os
+import queue
+import threading
 
+# Path of the SQLite file; override with the EXAM_DB_PATH environment variable
+DB_PATH = os.environ.get('EXAM_DB_PATH', 'exam_system.db')
 
-def create_database():
-    conn = sqlite3.connect('exam_system.db')
-    cursor = conn.cursor()
-
-    # Create users table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        password TEXT NOT NULL, -- Encrypted password
-        name TEXT NOT NULL,
-        email TEXT UNIQUE NOT NULL,
-        role TEXT CHECK(role IN ('Admin', 'Teacher', 'Student')) NOT NULL
-    )''')
-
-    # Create admins table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS admins (
-        id INTEGER PRIMARY KEY,
-        name TEXT NOT NULL,
-        FOREIGN KEY (id) REFERENCES users (id) ON DELETE CASCADE
-    )''')
-
-    # Create teachers table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS teachers (
-        id INTEGER PRIMARY KEY,
-        phone TEXT,
-        subject_id INTEGER,
-        FOREIGN KEY (subject_id) REFERENCES subjects (id) ON DELETE CASCADE,
-        FOREIGN KEY (id) REFERENCES users (id) ON DELETE CASCADE
-    )''')
-
-    # Create subjects table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS subjects (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        subject_name TEXT NOT NULL
-    )''')
-
-    # Create students table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS students (
-        id INTEGER PRIMARY KEY,
-        class TEXT NOT NULL,
-        phone TEXT,
-        profile_pic BLOB,
-        bio TEXT,
-        FOREIGN KEY (id) REFERENCES users (id) ON DELETE CASCADE
-    )''')
-
-    # Create exams table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS exams (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT NOT NULL,
-        subject_id INTEGER NOT NULL,
-        duration INTEGER NOT NULL,
-        total_marks INTEGER NOT NULL DEFAULT 100,
-        created_by INTEGER,
-        FOREIGN KEY (subject_id) REFERENCES subjects (id) ON DELETE CASCADE,
-        FOREIGN KEY (created_by) REFERENCES users (id) ON DELETE SET NULL
-    )''')
-
-    # Create questions table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS questions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        exam_id INTEGER,
-        question TEXT NOT NULL,
-        option_a TEXT NOT NULL,
-        option_b TEXT NOT NULL,
-        option_c TEXT NOT NULL,
-        option_d TEXT NOT NULL,
-        correct_answer TEXT NOT NULL,
-        marks INTEGER NOT NULL DEFAULT 1,
-        created_by INTEGER,
-        FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE,
-        FOREIGN KEY (created_by) REFERENCES teachers (id) ON DELETE SET NULL
-    )''')
-
-    # Create results table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS results (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        student_id INTEGER,
-        exam_id INTEGER,
-        score INTEGER,
-        date TEXT NOT NULL,
-        FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE,
-        FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE
-    )''')
-
-    # Insert default admin if not exists
-    default_password = hashlib.sha256("admin123".encode()).hexdigest()
-    cursor.execute("INSERT OR IGNORE INTO users (username, password, name, email, role) VALUES (?, ?, ?, ?, ?)",
-                   ("admin", default_password, "Administrator", "admin@example.com", "Admin"))
-
-    # Link admin to admins table
-    cursor.execute("INSERT OR IGNORE INTO admins (id, name) VALUES ((SELECT id FROM users WHERE username = ?), ?)",
-                   ("admin", "Administrator"))
-
-    conn.commit()
+# Maximum number of idle connections kept around for reuse
+POOL_SIZE = 4
+
+# How long a connection waits on a locked database before giving up (ms)
+BUSY_TIMEOUT_MS = 20000
+
+# Pragmas applied once when a pooled connection is opened. synchronous=NORMAL
+# is safe under WAL: a power cut can lose the last commits but never corrupts
+# the file.
+CONNECTION_PRAGMAS = (
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",       # ~16 MB page cache
+    "PRAGMA mmap_size = 268435456",     # 256 MB memory-mapped reads
+    "PRAGMA temp_store = MEMORY",
+)
+
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+_pool_lock = threading.Lock()
+
+
+class PooledConnection(sqlite3.Connection):
+    """A connection that remembers which database file it was opened on."""
+
+    db_path = None
+
+
+def _open_connection():
+    # check_same_thread is off so a connection can be handed to whichever
+    # thread takes it from the pool; it is only ever used by one at a time
+    path = DB_PATH
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False,
+                           factory=PooledConnection)
+    conn.db_path = path
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def get_connection():
+    """Take a connection from the pool, opening a new one if none is idle."""
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            return _open_connection()
+        if conn.db_path == DB_PATH:
+            return conn
+        conn.close()
+
+
+def release_connection(conn):
+    """Return a connection to the pool, discarding any uncommitted work.
+
+    Connections opened before set_database_path switched files are closed
+    instead, so the pool never hands out one for the old file.
+    """
+    if conn is None:
+        return
+    if conn.in_transaction:
+        conn.rollback()
+    with _pool_lock:
+        if conn.db_path == DB_PATH:
+            try:
+                _pool.put_nowait(conn)
+                return
+            except queue.Full:
+                pass
     conn.close()
 
 
-# Call the function to create the database
-create_database()
+def close_all_connections():
+    """Close every idle pooled connection."""
+    with _pool_lock:
+        while True:
+            try:
+                _pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def set_database_path(path):
+    """Point the pool at a different database file."""
+    global DB_PATH
+    with _pool_lock:
+        DB_PATH = path
+    close_all_connections()
+
+
+def configure_database():
+    """Startup configuration: switch the database file to WAL journaling.
+
+    journal_mode is stored in the file itself, so this only needs to run once
+    per process before the dashboards start reading and writing. In WAL mode
+    readers no longer block the writer, which is what lets many students
+    submit while the admin results list is being refreshed.
+    """
+    conn = get_connection()
+    try:
+        mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    finally:
+        release_connection(conn)
+    return mode
+
+
+def _upgrade_legacy_exams(conn):
+    # Databases first created by the old StudentDashboard.init_database have
+    # an exams table keyed on a free-text `subject` column instead of
+    # subject_id. Rebuild it in the canonical shape, creating any subjects
+    # that only existed as text.
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(exams)")]
+    if 'subject_id' in columns or 'subject' not in columns:
+        return
+
+    conn.execute('''
+        INSERT INTO subjects (subject_name)
+        SELECT DISTINCT subject FROM exams
+        WHERE subject NOT IN (SELECT subject_name FROM subjects)
+    ''')
+    conn.execute('''
+        CREATE TABLE exams_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            subject_id INTEGER NOT NULL,
+            duration INTEGER NOT NULL,
+            total_marks INTEGER NOT NULL DEFAULT 100,
+            created_by INTEGER,
+            FOREIGN KEY (subject_id) REFERENCES subjects (id) ON DELETE CASCADE,
+            FOREIGN KEY (created_by) REFERENCES users (id) ON DELETE SET NULL
+        )''')
+    conn.execute('''
+        INSERT INTO exams_new (id, title, subject_id, duration, total_marks)
+        SELECT e.id, e.title, s.id, e.duration, e.total_marks
+        FROM exams e
+        JOIN subjects s ON s.subject_name = e.subject
+    ''')
+    # Drop-then-rename (rather than renaming the old table away) keeps the
+    # foreign keys in questions and results pointing at "exams"
+    conn.execute("DROP TABLE exams")
+    conn.execute("ALTER TABLE exams_new RENAME TO exams")
+
+
+def _backfill_profile_thumbnails(conn):
+    # Pictures uploaded before thumbnails existed; one that no longer decodes
+    # is left without a thumbnail and shows the placeholder
+    from profile_images import make_thumbnail
+
+    rows = conn.execute("SELECT id, profile_pic FROM students WHERE profile_pic IS NOT NULL").fetchall()
+    for student_id, picture in rows:
+        try:
+            thumbnail = make_thumbnail(picture)
+        except Exception:
+            continue
+        conn.execute("INSERT OR REPLACE INTO profile_thumbnails VALUES (?, ?)", (student_id, thumbnail))
+
+
+def _move_profile_pictures(conn):
+    # Each distinct picture is stored once in images, keyed by its SHA-256
+    rows = conn.execute("SELECT id, profile_pic FROM students WHERE profile_pic IS NOT NULL").fetchall()
+    for student_id, picture in rows:
+        digest = hashlib.sha256(picture).hexdigest()
+        conn.execute("INSERT OR IGNORE INTO images (sha256, data) VALUES (?, ?)", (digest, picture))
+        conn.execute("UPDATE students SET profile_image = ? WHERE id = ?", (digest, student_id))
+
+
+# Schema migrations, applied in order and recorded in PRAGMA user_version.
+# A step is either an SQL string or a callable taking the connection. This is
+# the only place the schema is defined; the dashboards never issue DDL.
+# Never edit a migration that has shipped; append a new one instead.
+MIGRATIONS = [
+    # 1: base schema (also upgrades pre-versioning databases)
+    (1, [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL, -- Encrypted password
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            role TEXT CHECK(role IN ('Admin', 'Teacher', 'Student')) NOT NULL
+        )''',
+        '''
+        CREATE TABLE IF NOT EXISTS admins (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            FOREIGN KEY (id) REFERENCES users (id) ON DELETE CASCADE
+        )''',
+        '''
+        CREATE TABLE IF NOT EXISTS teachers (
+            id INTEGER PRIMARY KEY,
+            phone TEXT,
+            subject_id INTEGER,
+            FOREIGN KEY (subject_id) REFERENCES subjects (id) ON DELETE CASCADE,
+            FOREIGN KEY (id) REFERENCES users (id) ON DELETE CASCADE
+        )''',
+        '''
+        CREATE TABLE IF NOT EXISTS subjects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            subject_name TEXT NOT NULL
+        )''',
+        '''
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY,
+            class TEXT NOT NULL,
+            phone TEXT,
+            profile_pic BLOB,
+            bio TEXT,
+            FOREIGN KEY (id) REFERENCES users (id) ON DELETE CASCADE
+        )''',
+        '''
+        CREATE TABLE IF NOT EXISTS exams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            subject_id INTEGER NOT NULL,
+            duration INTEGER NOT NULL,
+            total_marks INTEGER NOT NULL DEFAULT 100,
+            created_by INTEGER,
+            FOREIGN KEY (subject_id) REFERENCES subjects (id) ON DELETE CASCADE,
+            FOREIGN KEY (created_by) REFERENCES users (id) ON DELETE SET NULL
+        )''',
+        '''
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            exam_id INTEGER,
+            question TEXT NOT NULL,
+            option_a TEXT NOT NULL,
+            option_b TEXT NOT NULL,
+            option_c TEXT NOT NULL,
+            option_d TEXT NOT NULL,
+            correct_answer TEXT NOT NULL,
+            marks INTEGER NOT NULL DEFAULT 1,
+            created_by INTEGER,
+            FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE,
+            FOREIGN KEY (created_by) REFERENCES teachers (id) ON DELETE SET NULL
+        )''',
+        '''
+        CREATE TABLE IF NOT EXISTS results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER,
+            exam_id INTEGER,
+            score INTEGER,
+            date TEXT NOT NULL,
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE,
+            FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE
+        )''',
+        _upgrade_legacy_exams,
+    ]),
+    # 2: indexes for the dashboard join and filter paths
+    (2, [
+        # Student's own results and the "not taken yet" exam filter
+        "CREATE INDEX IF NOT EXISTS idx_results_student_date ON results (student_id, date)",
+        # Teacher results view (results of exams in one subject)
+        "CREATE INDEX IF NOT EXISTS idx_results_exam ON results (exam_id)",
+        # Admin results list, newest first
+        "CREATE INDEX IF NOT EXISTS idx_results_date ON results (date)",
+        "CREATE INDEX IF NOT EXISTS idx_questions_exam ON questions (exam_id)",
+        "CREATE INDEX IF NOT EXISTS idx_exams_subject ON exams (subject_id)",
+        "CREATE INDEX IF NOT EXISTS idx_teachers_subject ON teachers (subject_id)",
+        "CREATE INDEX IF NOT EXISTS idx_users_role ON users (role)",
+    ]),
+    # 3: per-question answers of each submission, so results can be re-graded
+    (3, [
+        '''
+        CREATE TABLE IF NOT EXISTS result_answers (
+            result_id INTEGER PRIMARY KEY,
+            question_ids BLOB NOT NULL, -- little-endian int64 per question
+            answers TEXT NOT NULL, -- one letter per question, '-' when unanswered
+            FOREIGN KEY (result_id) REFERENCES results (id) ON DELETE CASCADE
+        )''',
+    ]),
+    # 4: start time and deadline of each exam attempt, checked on submission
+    (4, [
+        '''
+        CREATE TABLE IF NOT EXISTS exam_attempts (
+            student_id INTEGER NOT NULL,
+            exam_id INTEGER NOT NULL,
+            started_at TEXT NOT NULL,
+            deadline TEXT NOT NULL,
+            PRIMARY KEY (student_id, exam_id),
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE,
+            FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE
+        )''',
+    ]),
+    # 5: question count kept on exams, and the "not taken yet" lookup
+    (5, [
+        "ALTER TABLE exams ADD COLUMN question_count INTEGER NOT NULL DEFAULT 0",
+        "UPDATE exams SET question_count = (SELECT COUNT(*) FROM questions q WHERE q.exam_id = exams.id)",
+        '''
+        CREATE TRIGGER IF NOT EXISTS questions_count_insert AFTER INSERT ON questions
+        BEGIN
+            UPDATE exams SET question_count = question_count + 1 WHERE id = NEW.exam_id;
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS questions_count_delete AFTER DELETE ON questions
+        BEGIN
+            UPDATE exams SET question_count = question_count - 1 WHERE id = OLD.exam_id;
+        END''',
+        # Editing a question can move it to another exam
+        '''
+        CREATE TRIGGER IF NOT EXISTS questions_count_move AFTER UPDATE OF exam_id ON questions
+        WHEN OLD.exam_id IS NOT NEW.exam_id
+        BEGIN
+            UPDATE exams SET question_count = question_count - 1 WHERE id = OLD.exam_id;
+            UPDATE exams SET question_count = question_count + 1 WHERE id = NEW.exam_id;
+        END''',
+        "CREATE INDEX IF NOT EXISTS idx_results_student_exam ON results (student_id, exam_id)",
+    ]),
+    # 6: running score totals per exam and per student, kept by triggers
+    (6, [
+        '''
+        CREATE TABLE IF NOT EXISTS exam_stats (
+            exam_id INTEGER PRIMARY KEY,
+            attempts INTEGER NOT NULL,
+            score_sum REAL NOT NULL,
+            score_squares REAL NOT NULL,
+            min_score REAL,
+            max_score REAL,
+            FOREIGN KEY (exam_id) REFERENCES exams (id) ON DELETE CASCADE
+        )''',
+        '''
+        CREATE TABLE IF NOT EXISTS student_stats (
+            student_id INTEGER PRIMARY KEY,
+            attempts INTEGER NOT NULL,
+            score_sum REAL NOT NULL,
+            score_squares REAL NOT NULL,
+            min_score REAL,
+            max_score REAL,
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        )''',
+        # Lets the triggers find an exam's lowest and highest score with one seek
+        "DROP INDEX IF EXISTS idx_results_exam",
+        "CREATE INDEX IF NOT EXISTS idx_results_exam_score ON results (exam_id, score)",
+        '''
+        INSERT INTO exam_stats
+        SELECT exam_id, COUNT(*), SUM(score), SUM(score * score), MIN(score), MAX(score)
+        FROM results WHERE score IS NOT NULL GROUP BY exam_id''',
+        '''
+        INSERT INTO student_stats
+        SELECT student_id, COUNT(*), SUM(score), SUM(score * score), MIN(score), MAX(score)
+        FROM results WHERE score IS NOT NULL GROUP BY student_id''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS results_stats_insert AFTER INSERT ON results
+        WHEN NEW.score IS NOT NULL
+        BEGIN
+            INSERT INTO exam_stats VALUES (NEW.exam_id, 1, NEW.score, NEW.score * NEW.score, NEW.score, NEW.score)
+            ON CONFLICT (exam_id) DO UPDATE SET
+                attempts = attempts + 1,
+                score_sum = score_sum + excluded.score_sum,
+                score_squares = score_squares + excluded.score_squares,
+                min_score = MIN(min_score, excluded.min_score),
+                max_score = MAX(max_score, excluded.max_score);
+            INSERT INTO student_stats VALUES (NEW.student_id, 1, NEW.score, NEW.score * NEW.score, NEW.score, NEW.score)
+            ON CONFLICT (student_id) DO UPDATE SET
+                attempts = attempts + 1,
+                score_sum = score_sum + excluded.score_sum,
+                score_squares = score_squares + excluded.score_squares,
+                min_score = MIN(min_score, excluded.min_score),
+                max_score = MAX(max_score, excluded.max_score);
+        END''',
+        # Re-grading changes scores in place
+        '''
+        CREATE TRIGGER IF NOT EXISTS results_stats_update AFTER UPDATE OF score ON results
+        WHEN OLD.score IS NOT NULL AND NEW.score IS NOT NULL AND OLD.score != NEW.score
+        BEGIN
+            UPDATE exam_stats SET
+                score_sum = score_sum + NEW.score - OLD.score,
+                score_squares = score_squares + NEW.score * NEW.score - OLD.score * OLD.score,
+                min_score = (SELECT MIN(score) FROM results WHERE exam_id = NEW.exam_id),
+                max_score = (SELECT MAX(score) FROM results WHERE exam_id = NEW.exam_id)
+            WHERE exam_id = NEW.exam_id;
+            UPDATE student_stats SET
+                score_sum = score_sum + NEW.score - OLD.score,
+                score_squares = score_squares + NEW.score * NEW.score - OLD.score * OLD.score,
+                min_score = (SELECT MIN(score) FROM results WHERE student_id = NEW.student_id),
+                max_score = (SELECT MAX(score) FROM results WHERE student_id = NEW.student_id)
+            WHERE student_id = NEW.student_id;
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS results_stats_delete AFTER DELETE ON results
+        BEGIN
+            DELETE FROM exam_stats WHERE exam_id = OLD.exam_id;
+            INSERT INTO exam_stats
+            SELECT exam_id, COUNT(*), SUM(score), SUM(score * score), MIN(score), MAX(score)
+            FROM results WHERE exam_id = OLD.exam_id AND score IS NOT NULL GROUP BY exam_id;
+            DELETE FROM student_stats WHERE student_id = OLD.student_id;
+            INSERT INTO student_stats
+            SELECT student_id, COUNT(*), SUM(score), SUM(score * score), MIN(score), MAX(score)
+            FROM results WHERE student_id = OLD.student_id AND score IS NOT NULL GROUP BY student_id;
+        END''',
+    ]),
+    # 7: small copy of each profile picture, so profile pages and login never
+    # read the full-size BLOB
+    (7, [
+        '''
+        CREATE TABLE IF NOT EXISTS profile_thumbnails (
+            student_id INTEGER PRIMARY KEY,
+            thumbnail BLOB NOT NULL, -- PNG, at most 200x200
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        )''',
+        _backfill_profile_thumbnails,
+    ]),
+    # 8: profile pictures move to a content-addressed image store; students
+    # rows keep only the hash
+    (8, [
+        '''
+        CREATE TABLE IF NOT EXISTS images (
+            sha256 TEXT PRIMARY KEY, -- hex digest of data
+            data BLOB NOT NULL
+        )''',
+        "ALTER TABLE students ADD COLUMN profile_image TEXT REFERENCES images (sha256)",
+        _move_profile_pictures,
+        # Rewrites students without the inline BLOBs
+        "ALTER TABLE students DROP COLUMN profile_pic",
+        "CREATE INDEX IF NOT EXISTS idx_students_profile_image ON students (profile_image)",
+        # An image goes once no student refers to it any more
+        '''
+        CREATE TRIGGER IF NOT EXISTS images_release_update AFTER UPDATE OF profile_image ON students
+        WHEN OLD.profile_image IS NOT NULL AND OLD.profile_image IS NOT NEW.profile_image
+        BEGIN
+            DELETE FROM images WHERE sha256 = OLD.profile_image
+            AND NOT EXISTS (SELECT 1 FROM students WHERE profile_image = OLD.profile_image);
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS images_release_delete AFTER DELETE ON students
+        WHEN OLD.profile_image IS NOT NULL
+        BEGIN
+            DELETE FROM images WHERE sha256 = OLD.profile_image
+            AND NOT EXISTS (SELECT 1 FROM students WHERE profile_image = OLD.profile_image);
+        END''',
+    ]),
+    # 9: score statistics leave out results of deleted exams (foreign keys
+    # are off, so those rows stay behind), and follow scores set to or
+    # cleared from NULL
+    (9, [
+        "DROP TRIGGER IF EXISTS results_stats_insert",
+        "DROP TRIGGER IF EXISTS results_stats_update",
+        "DROP TRIGGER IF EXISTS results_stats_delete",
+        # A submission can still arrive for an exam deleted while it was open
+        '''
+        CREATE TRIGGER IF NOT EXISTS results_stats_insert AFTER INSERT ON results
+        WHEN NEW.score IS NOT NULL AND EXISTS (SELECT 1 FROM exams WHERE id = NEW.exam_id)
+        BEGIN
+            INSERT INTO exam_stats VALUES (NEW.exam_id, 1, NEW.score, NEW.score * NEW.score, NEW.score, NEW.score)
+            ON CONFLICT (exam_id) DO UPDATE SET
+                attempts = attempts + 1,
+                score_sum = score_sum + excluded.score_sum,
+                score_squares = score_squares + excluded.score_squares,
+                min_score = MIN(min_score, excluded.min_score),
+                max_score = MAX(max_score, excluded.max_score);
+            INSERT INTO student_stats VALUES (NEW.student_id, 1, NEW.score, NEW.score * NEW.score, NEW.score, NEW.score)
+            ON CONFLICT (student_id) DO UPDATE SET
+                attempts = attempts + 1,
+                score_sum = score_sum + excluded.score_sum,
+                score_squares = score_squares + excluded.score_squares,
+                min_score = MIN(min_score, excluded.min_score),
+                max_score = MAX(max_score, excluded.max_score);
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS results_stats_update AFTER UPDATE OF score ON results
+        WHEN OLD.score IS NOT NULL AND NEW.score IS NOT NULL AND OLD.score != NEW.score
+        BEGIN
+            UPDATE exam_stats SET
+                score_sum = score_sum + NEW.score - OLD.score,
+                score_squares = score_squares + NEW.score * NEW.score - OLD.score * OLD.score,
+                min_score = (SELECT MIN(score) FROM results WHERE exam_id = NEW.exam_id),
+                max_score = (SELECT MAX(score) FROM results WHERE exam_id = NEW.exam_id)
+            WHERE exam_id = NEW.exam_id;
+            UPDATE student_stats SET
+                score_sum = score_sum + NEW.score - OLD.score,
+                score_squares = score_squares + NEW.score * NEW.score - OLD.score * OLD.score,
+                min_score = (SELECT MIN(r.score) FROM results r JOIN exams e ON r.exam_id = e.id
+                             WHERE r.student_id = NEW.student_id),
+                max_score = (SELECT MAX(r.score) FROM results r JOIN exams e ON r.exam_id = e.id
+                             WHERE r.student_id = NEW.student_id)
+            WHERE student_id = NEW.student_id AND EXISTS (SELECT 1 FROM exams WHERE id = NEW.exam_id);
+        END''',
+        # Rare enough to recount from scratch, like a delete
+        '''
+        CREATE TRIGGER IF NOT EXISTS results_stats_update_null AFTER UPDATE OF score ON results
+        WHEN (OLD.score IS NULL) != (NEW.score IS NULL)
+        BEGIN
+            DELETE FROM exam_stats WHERE exam_id = NEW.exam_id;
+            INSERT INTO exam_stats
+            SELECT r.exam_id, COUNT(*), SUM(r.score), SUM(r.score * r.score), MIN(r.score), MAX(r.score)
+            FROM results r JOIN exams e ON r.exam_id = e.id
+            WHERE r.exam_id = NEW.exam_id AND r.score IS NOT NULL GROUP BY r.exam_id;
+            DELETE FROM student_stats WHERE student_id = NEW.student_id;
+            INSERT INTO student_stats
+            SELECT r.student_id, COUNT(*), SUM(r.score), SUM(r.score * r.score), MIN(r.score), MAX(r.score)
+            FROM results r JOIN exams e ON r.exam_id = e.id
+            WHERE r.student_id = NEW.student_id AND r.score IS NOT NULL GROUP BY r.student_id;
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS results_stats_delete AFTER DELETE ON results
+        BEGIN
+            DELETE FROM exam_stats WHERE exam_id = OLD.exam_id;
+            INSERT INTO exam_stats
+            SELECT r.exam_id, COUNT(*), SUM(r.score), SUM(r.score * r.score), MIN(r.score), MAX(r.score)
+            FROM results r JOIN exams e ON r.exam_id = e.id
+            WHERE r.exam_id = OLD.exam_id AND r.score IS NOT NULL GROUP BY r.exam_id;
+            DELETE FROM student_stats WHERE student_id = OLD.student_id;
+            INSERT INTO student_stats
+            SELECT r.student_id, COUNT(*), SUM(r.score), SUM(r.score * r.score), MIN(r.score), MAX(r.score)
+            FROM results r JOIN exams e ON r.exam_id = e.id
+            WHERE r.student_id = OLD.student_id AND r.score IS NOT NULL GROUP BY r.student_id;
+        END''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS exams_stats_delete AFTER DELETE ON exams
+        BEGIN
+            DELETE FROM exam_stats WHERE exam_id = OLD.id;
+            DELETE FROM student_stats
+            WHERE student_id IN (SELECT student_id FROM results WHERE exam_id = OLD.id);
+            INSERT INTO student_stats
+            SELECT r.student_id, COUNT(*), SUM(r.score), SUM(r.score * r.score), MIN(r.score), MAX(r.score)
+            FROM results r JOIN exams e ON r.exam_id = e.id
+            WHERE r.student_id IN (SELECT student_id FROM results WHERE exam_id = OLD.id)
+              AND r.score IS NOT NULL
+            GROUP BY r.student_id;
+        END''',
+        # Recount everything once, dropping what deleted exams left behind
+        "DELETE FROM exam_stats",
+        '''
+        INSERT INTO exam_stats
+        SELECT r.exam_id, COUNT(*), SUM(r.score), SUM(r.score * r.score), MIN(r.score), MAX(r.score)
+        FROM results r JOIN exams e ON r.exam_id = e.id
+        WHERE r.score IS NOT NULL GROUP BY r.exam_id''',
+        "DELETE FROM student_stats",
+        '''
+        INSERT INTO student_stats
+        SELECT r.student_id, COUNT(*), SUM(r.score), SUM(r.score * r.score), MIN(r.score), MAX(r.score)
+        FROM results r JOIN exams e ON r.exam_id = e.id
+        WHERE r.score IS NOT NULL GROUP BY r.student_id''',
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def migrate_database(conn):
+    """Apply every migration newer than the file's user_version.
+
+    Each migration runs in its own transaction together with the version
+    bump, so an interrupted upgrade never leaves a half-applied step.
+    """
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    if current > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {current} is newer than this application supports ({SCHEMA_VERSION})")
+    for version, steps in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute("BEGIN")
+        try:
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def create_database():
+    conn = get_connection()
+    try:
+        migrate_database(conn)
+
+        cursor = conn.cursor()
+
+        # Insert default admin if not exists
+        default_password = hashlib.sha256("admin123".encode()).hexdigest()
+        cursor.execute("INSERT OR IGNORE INTO users (username, password, name, email, role) VALUES (?, ?, ?, ?, ?)",
+                       ("admin", default_password, "Administrator", "admin@example.com", "Admin"))
+
+        # Link admin to admins table
+        cursor.execute("INSERT OR IGNORE INTO admins (id, name) VALUES ((SELECT id FROM users WHERE username = ?), ?)",
+                       ("admin", "Administrator"))
+
+        conn.commit()
+    finally:
+        release_connection(conn)
+
+
+if __name__ == "__main__":
+    configure_database()
+    create_database()
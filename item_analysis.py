@@ -0,0 +1,85 @@
+import numpy as np
+from scoring import AnswerKey, NO_ANSWER, OPTION_LETTERS, load_answer_matrix
+
+
+class ItemAnalysis:
+    """Quality indices of every question in one exam.
+
+    Per question (in ``question_ids`` order), over the submissions whose
+    sheet contained it:
+    ``responses``       number of those submissions
+    ``difficulty``      share of them answering correctly (p-value)
+    ``discrimination``  point-biserial correlation between getting the
+                        question right and the score on the other questions
+                        (NaN when either never varies)
+    ``option_rates``    share choosing each of A-D, plus a last column for
+                        unanswered
+    ``kr20`` is the reliability of the whole exam, over the submissions that
+    were given every current question (NaN below 2 questions or when their
+    total scores never vary).
+    """
+
+    def __init__(self, question_ids, correct, chosen, present=None):
+        self.question_ids = list(question_ids)
+        self.attempts = len(chosen)
+        if present is None:
+            present = np.ones(chosen.shape, dtype=bool)
+        correct = (correct & present).astype(np.float64)
+        weight = present.astype(np.float64)
+        self.responses = present.sum(axis=0)
+        count = np.maximum(self.responses, 1)
+        given = self.responses > 0
+
+        self.difficulty = np.where(given, correct.sum(axis=0) / count, np.nan)
+
+        # Item-rest correlation, so a question is not correlated with itself;
+        # sheets without the question take no part in its correlation
+        totals = correct.sum(axis=1)
+        rest = totals[:, None] - correct
+        item_dev = (correct - correct.sum(axis=0) / count) * weight
+        rest_dev = (rest - (rest * weight).sum(axis=0) / count) * weight
+        spread = np.sqrt((item_dev ** 2).sum(axis=0) * (rest_dev ** 2).sum(axis=0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.discrimination = np.where(spread > 0, (item_dev * rest_dev).sum(axis=0) / spread, np.nan)
+
+        codes = list(range(len(OPTION_LETTERS))) + [NO_ANSWER]
+        self.option_rates = np.stack([((chosen == code) & present).sum(axis=0) / count for code in codes], axis=1)
+
+        complete = present.all(axis=1)
+        items = len(self.question_ids)
+        variance = totals[complete].var() if complete.any() else 0.0
+        if items > 1 and variance > 0:
+            p = correct[complete].mean(axis=0)
+            self.kr20 = items / (items - 1) * (1 - (p * (1 - p)).sum() / variance)
+        else:
+            self.kr20 = np.nan
+
+
+def analyze_exam(conn, exam_id):
+    """Run the item analysis over every stored answer sheet of an exam."""
+    key = AnswerKey.for_exam(conn, exam_id)
+    _, chosen, present, _ = load_answer_matrix(conn, exam_id, key)
+    return ItemAnalysis(key.question_ids, key.matches(chosen), chosen, present)
+
+
+class ItemAnalysisCache:
+    """Keeps each exam's analysis until its submissions or key change.
+
+    The check is one lookup in exam_stats plus reading the key, so reopening
+    the analytics page does not rescan the answer sheets.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, conn, exam_id):
+        stats = conn.execute("SELECT attempts, score_sum FROM exam_stats WHERE exam_id = ?",
+                             (exam_id,)).fetchone()
+        key = conn.execute("SELECT id, correct_answer, marks FROM questions WHERE exam_id = ? ORDER BY id",
+                           (exam_id,)).fetchall()
+        fingerprint = (stats, tuple(key))
+        entry = self._entries.get(exam_id)
+        if entry is None or entry[0] != fingerprint:
+            entry = (fingerprint, analyze_exam(conn, exam_id))
+            self._entries[exam_id] = entry
+        return entry[1]
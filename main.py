@@ -2,15 +2,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sqlite3
 import hashlib
-from admin_dashboard import AdminDashboard
-from student_dashboard import StudentDashboard
-from Teacher_dashboard import TeacherDashboard
+from database import get_connection, release_connection, configure_database, create_database
+from theme import use_styles
 from hashlib import sha256 
 from time import time
 
 class UserTypeSelection:
-    def __init__(self, root):
+    def __init__(self, root, session):
         self.root = root
+        self.session = session
         self.root.title("Student Portal")
         self.failed_attempts = 0
         self.lock_time = None
@@ -30,16 +30,8 @@ class UserTypeSelection:
             'hover': '#233554'
         }
 
-        # Style configuration
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-        self.style.configure("Content.TFrame", background=self.colors['content'])
-        self.style.configure("Card.TFrame", background=self.colors['sidebar'], relief="flat", padding=30)
-        self.style.configure("Title.TLabel", background=self.colors['content'], foreground=self.colors['text'], font=('Segoe UI', 30, 'bold'))
-        self.style.configure("Subtitle.TLabel", background=self.colors['content'], foreground=self.colors['text_secondary'], font=('Segoe UI', 18))
-        self.style.configure("Card.TLabel", background=self.colors['sidebar'], foreground=self.colors['text'], font=('Segoe UI', 12))
-        self.style.configure("Custom.TButton", background=self.colors['accent1'], foreground=self.colors['bg_dark'], font=('Segoe UI', 14), padding=(10, 5))
-        self.style.map("Custom.TButton", background=[('active', self.colors['hover'])], foreground=[('active', self.colors['bg_dark'])])
+        # Style configuration (once per Tk interpreter, not on every logout)
+        self.style = use_styles(root, "login", self.configure_styles)
 
         # Main container
         self.main_container = ttk.Frame(root, style="Content.TFrame")
@@ -68,9 +60,18 @@ class UserTypeSelection:
         ttk.Button(user_card, text="Login", style="Custom.TButton", command=self.verify_login).pack(pady=(20, 10), fill='x')
         ttk.Button(user_card, text="Register", style="Custom.TButton", command=self.show_student_register).pack(pady=(10, 20), fill='x')
 
+    def configure_styles(self, style):
+        # The dashboards use the Card, Title and Custom button styles too
+        style.configure("Content.TFrame", background=self.colors['content'])
+        style.configure("Card.TFrame", background=self.colors['sidebar'], relief="flat", padding=30)
+        style.configure("Title.TLabel", background=self.colors['content'], foreground=self.colors['text'], font=('Segoe UI', 30, 'bold'))
+        style.configure("Subtitle.TLabel", background=self.colors['content'], foreground=self.colors['text_secondary'], font=('Segoe UI', 18))
+        style.configure("Card.TLabel", background=self.colors['sidebar'], foreground=self.colors['text'], font=('Segoe UI', 12))
+        style.configure("Custom.TButton", background=self.colors['accent1'], foreground=self.colors['bg_dark'], font=('Segoe UI', 14), padding=(10, 5))
+        style.map("Custom.TButton", background=[('active', self.colors['hover'])], foreground=[('active', self.colors['bg_dark'])])
+
     def show_student_register(self):
-        self.main_container.destroy()
-        StudentRegistration(self.root)
+        self.session.show_registration()
 
     def verify_login(self):
         username = self.username_var.get()
@@ -87,7 +88,7 @@ class UserTypeSelection:
 
         hashed_password = sha256(password.encode()).hexdigest()
 
-        conn = sqlite3.connect("exam_system.db")
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -117,7 +118,7 @@ class UserTypeSelection:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
 
     def handle_failed_attempts(self):
@@ -129,23 +130,13 @@ class UserTypeSelection:
             messagebox.showerror("Error", f"Invalid username or password. {remaining_attempts} attempts remaining.")
 
     def redirect_dashboard(self, user_info):
-        if user_info['role'] == "Admin":
-            self.main_container.destroy()
-            AdminDashboard(self.root, user_info["id"], self)
-            messagebox.showinfo("Admin", f"Welcome to the Admin Dashboard, {user_info['name']}!")
-        elif user_info['role'] == "Teacher":
-            self.main_container.destroy()
-            TeacherDashboard(self.root, user_info)
-            messagebox.showinfo("Teacher", f"Welcome to the Teacher Dashboard, {user_info['name']}!")
-        elif user_info['role'] == "Student":
-            self.main_container.destroy()
-            StudentDashboard(self.root, user_info["id"], self)
-            messagebox.showinfo("Student", f"Welcome to the Student Dashboard, {user_info['name']}!")
+        self.session.login(user_info)
 
 
 class StudentRegistration:
-    def __init__(self, root):
+    def __init__(self, root, session):
         self.root = root
+        self.session = session
         self.root.title("Student Registration")
 
         self.main_container = ttk.Frame(root, style="Content.TFrame")
@@ -187,7 +178,7 @@ class StudentRegistration:
         # Hash the password
         hashed_password = hashlib.sha256(password.encode()).hexdigest()
 
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -214,24 +205,73 @@ class StudentRegistration:
             conn.commit()
 
             messagebox.showinfo("Success", "Registration successful! You can now login.")
-            self.main_container.destroy()
-            UserTypeSelection(self.root)
+            self.session.show_login()
 
         except sqlite3.IntegrityError:
             messagebox.showerror("Error", "Username or Email already exists")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     def go_back(self):
-        self.main_container.destroy()
-        UserTypeSelection(self.root)
+        self.session.show_login()
+
+
+class Session:
+    """Owns the application's one Tk root and the screen shown on it.
+
+    Login, logout and registration swap the screen's widgets on this root,
+    so a day of users coming and going never creates another Tk interpreter
+    or a nested mainloop.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.screen = None
+
+    def _show(self, screen_class, *args):
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        # Drop the old screen before building the next, so the two are never
+        # alive at once
+        self.screen = None
+        self.screen = screen_class(self.root, *args, self)
+
+    def show_login(self):
+        self._show(UserTypeSelection)
+
+    def show_registration(self):
+        self._show(StudentRegistration)
+
+    def login(self, user_info):
+        # Dashboards (and numpy with them) are imported on login so the login
+        # window comes up without waiting for them
+        if user_info['role'] == "Admin":
+            from admin_dashboard import AdminDashboard
+            self._show(AdminDashboard, user_info["id"])
+        elif user_info['role'] == "Teacher":
+            from Teacher_dashboard import TeacherDashboard
+            self._show(TeacherDashboard, user_info)
+        elif user_info['role'] == "Student":
+            from student_dashboard import StudentDashboard
+            self._show(StudentDashboard, user_info["id"])
+        else:
+            return
+        messagebox.showinfo(user_info['role'], f"Welcome to the {user_info['role']} Dashboard, {user_info['name']}!")
+
+    def logout(self):
+        """Called by a dashboard once it has stopped its own work."""
+        self.show_login()
 
 
 if __name__ == "__main__":
+    configure_database()
+    create_database()
+
     root = tk.Tk()
     root.configure(bg='#121212')  # Set root window background to dark
     
-    app = UserTypeSelection(root)
+    session = Session(root)
+    session.show_login()
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import hashlib
+import io
+from collections import OrderedDict
+
+# Largest stored profile picture, and the size shown on the profile page
+PICTURE_SIZE = (800, 800)
+THUMBNAIL_SIZE = (200, 200)
+
+
+def make_thumbnail(data):
+    """Return PNG bytes of an image scaled down to fit THUMBNAIL_SIZE."""
+    # PIL is imported on first use to keep it off the startup path
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as img:
+        img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+        if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            img = img.convert('RGBA')
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def prepare_upload(path):
+    """Read an uploaded picture; returns (picture, thumbnail) bytes.
+
+    The picture keeps its original format, scaled down to fit PICTURE_SIZE.
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.thumbnail(PICTURE_SIZE, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format=img.format)
+    picture = buffer.getvalue()
+    return picture, make_thumbnail(picture)
+
+
+def store_image(conn, data):
+    """Add an image to the content-addressed store and return its SHA-256.
+
+    Uploading a picture that is already stored reuses the existing row.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    conn.execute("INSERT OR IGNORE INTO images (sha256, data) VALUES (?, ?)", (digest, data))
+    return digest
+
+
+class PhotoCache:
+    """Least recently used decoded thumbnails of one Tk interpreter.
+
+    PhotoImage objects belong to the interpreter that created them, so there
+    is one cache per root window (see ``for_root``).
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self._photos = OrderedDict()
+
+    @classmethod
+    def for_root(cls, root):
+        cache = getattr(root, '_photo_cache', None)
+        if cache is None:
+            cache = cls()
+            root._photo_cache = cache
+        return cache
+
+    def get(self, key, load):
+        """Return the PhotoImage for ``key``, or None if there is no image.
+
+        ``load()`` is only called on a miss and returns the thumbnail bytes
+        (or None).
+        """
+        if key in self._photos:
+            self._photos.move_to_end(key)
+            return self._photos[key]
+        data = load()
+        if not data:
+            return None
+        from PIL import Image, ImageTk
+
+        with Image.open(io.BytesIO(data)) as img:
+            photo = ImageTk.PhotoImage(img)
+        self._photos[key] = photo
+        if len(self._photos) > self.capacity:
+            self._photos.popitem(last=False)
+        return photo
+
+    def invalidate(self, key):
+        self._photos.pop(key, None)
@@ -0,0 +1,208 @@
+import functools
+import io
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import groupby
+
+from result_stats import summarize
+
+# Every student with at least one result, with their stats, in one pass
+CLASS_REPORTS_SQL = '''
+    SELECT s.id, u.username, u.name, s.class, u.email,
+           st.attempts, st.score_sum, st.score_squares, st.min_score, st.max_score,
+           e.title, r.score, r.date
+    FROM results r
+    JOIN students s ON r.student_id = s.id
+    JOIN users u ON s.id = u.id
+    JOIN exams e ON r.exam_id = e.id
+    LEFT JOIN student_stats st ON st.student_id = s.id
+    ORDER BY s.id, r.date DESC
+'''
+# Reports handed to a worker process at a time
+REPORTS_PER_TASK = 16
+
+
+@functools.lru_cache(maxsize=None)
+def report_styles():
+    """(title, heading, normal, table) styles, built once per process."""
+    # reportlab takes a noticeable share of startup, so it is only imported
+    # once a report is actually built
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        alignment=1  # Center alignment
+    )
+    heading_style = ParagraphStyle(
+        'Heading2',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceBefore=20,
+        spaceAfter=10
+    )
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceBefore=6,
+        spaceAfter=6
+    )
+    table_style = TableStyle([
+        # Header style
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1B2B65')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        # Data style
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        # Alternating row colors
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')])
+    ])
+    return title_style, heading_style, normal_style, table_style
+
+
+def build_progress_report(output, student_info, results, summary):
+    """Write one student's progress report PDF to a path or binary file.
+
+    ``student_info`` is (name, class, email), ``results`` (title, score,
+    date) rows newest first and ``summary`` the tuple from
+    result_stats.summarize.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+
+    total_exams, average_score, _, lowest_score, highest_score = summary
+    title_style, heading_style, normal_style, table_style = report_styles()
+
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=A4,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=72
+    )
+    elements = []
+
+    # Add header
+    elements.append(Paragraph("Student Progress Report", title_style))
+    elements.append(Spacer(1, 20))
+
+    # Add student information
+    elements.append(Paragraph("Student Information", heading_style))
+    elements.append(Paragraph(f"Name: {student_info[0]}", normal_style))
+    elements.append(Paragraph(f"Class: {student_info[1]}", normal_style))
+    if student_info[2]:  # If email exists
+        elements.append(Paragraph(f"Email: {student_info[2]}", normal_style))
+    elements.append(Paragraph(f"Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", normal_style))
+
+    elements.append(Spacer(1, 20))
+
+    # Add performance summary
+    elements.append(Paragraph("Performance Summary", heading_style))
+    elements.append(Paragraph(f"Total Exams Taken: {total_exams}", normal_style))
+    elements.append(Paragraph(f"Average Score: {average_score:.2f}", normal_style))
+
+    # Create exam results table
+    elements.append(Paragraph("Detailed Exam Results", heading_style))
+    table_data = [['Exam Title', 'Score', 'Date']]
+    for title, score, date in results:
+        date = datetime.strptime(date, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d %H:%M')
+        table_data.append([title, str(score), date])
+    table = Table(table_data, colWidths=[250, 100, 150])
+    table.setStyle(table_style)
+    elements.append(table)
+
+    # Add performance analysis
+    elements.append(Paragraph("Performance Analysis", heading_style))
+    if total_exams:
+        elements.append(Paragraph(f"Highest Score: {highest_score:.2f}", normal_style))
+        elements.append(Paragraph(f"Lowest Score: {lowest_score:.2f}", normal_style))
+    elements.append(Paragraph(f"Average Score: {average_score:.2f}", normal_style))
+
+    doc.build(elements)
+
+
+def fetch_class_reports(conn):
+    """Return one (file_name, student_info, results, summary) job per student with results."""
+    jobs = []
+    rows = conn.execute(CLASS_REPORTS_SQL)
+    for _, student_rows in groupby(rows, key=lambda row: row[0]):
+        student_rows = list(student_rows)
+        _, username, name, class_name, email, *stats = student_rows[0][:10]
+        file_name = f"{_safe_name(class_name or 'No Class')}/{_safe_name(username)}.pdf"
+        results = [row[10:] for row in student_rows]
+        jobs.append((file_name, (name, class_name, email), results, summarize(*stats)))
+    return jobs
+
+
+def _safe_name(text):
+    return re.sub(r'[^\w.-]+', '_', str(text)).strip('._') or '_'
+
+
+def _render(job):
+    file_name, student_info, results, summary = job
+    buffer = io.BytesIO()
+    build_progress_report(buffer, student_info, results, summary)
+    return file_name, buffer.getvalue()
+
+
+def generate_class_reports(jobs, output, workers=None, progress=None):
+    """Render every job's PDF across a process pool.
+
+    ``output`` ending in .zip is written as one archive, anything else as a
+    directory with a sub-folder per class. Workers are spawned rather than
+    forked because the caller is a threaded Tk process. ``progress(done,
+    total)`` is called as reports arrive. Returns the number written.
+    """
+    as_zip = output.lower().endswith('.zip')
+    temp_path = output + '.part'
+    written = 0
+    context = multiprocessing.get_context('spawn')
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs) // REPORTS_PER_TASK, 1))
+    try:
+        # PDFs are already compressed, so the archive only stores them
+        archive = zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_STORED) if as_zip else None
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                for file_name, pdf in pool.map(_render, jobs, chunksize=REPORTS_PER_TASK):
+                    if archive is not None:
+                        archive.writestr(file_name, pdf)
+                    else:
+                        path = os.path.join(output, file_name)
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        with open(path, 'wb') as f:
+                            f.write(pdf)
+                    written += 1
+                    if progress is not None:
+                        progress(written, len(jobs))
+        finally:
+            if archive is not None:
+                archive.close()
+        if as_zip:
+            os.replace(temp_path, output)
+    except BaseException:
+        if as_zip:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        raise
+    return written
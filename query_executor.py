@@ -0,0 +1,151 @@
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+from database import get_connection, release_connection
+
+# How often the Tk thread checks for finished queries while any are pending
+POLL_INTERVAL_MS = 30
+
+
+class QueryTask:
+    """Handle for one piece of database work submitted to a QueryExecutor."""
+
+    def __init__(self, work, on_done, on_error, cancel_on_leave=True):
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancel_on_leave = cancel_on_leave
+        self.cancelled = False
+        self.future = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """Drop the result, and stop the query if it is already running."""
+        with self._lock:
+            self.cancelled = True
+            if self._conn is not None:
+                # Makes the running statement fail with "interrupted"
+                self._conn.interrupt()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class QueryExecutor:
+    """Runs database work off the Tk thread and hands results back to it.
+
+    ``work`` is called on a worker thread with a pooled connection. Its
+    return value is passed to ``on_done`` on the Tk thread; Tk widgets are
+    never touched from the worker. One executor is shared per Tk root, see
+    ``for_root``.
+
+    Tasks are cancelled when the user leaves the page that started them.
+    Pass ``cancel_on_leave=False`` for jobs that must finish regardless,
+    such as writing re-graded scores; only ``shutdown`` stops those.
+    """
+
+    def __init__(self, root, max_workers=2):
+        self.root = root
+        self._workers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="query")
+        self._finished = queue.Queue()
+        self._callbacks = queue.Queue()
+        self._pending = set()
+        self._poll_id = None
+
+    @classmethod
+    def for_root(cls, root):
+        executor = getattr(root, '_query_executor', None)
+        if executor is None:
+            executor = cls(root)
+            root._query_executor = executor
+        return executor
+
+    def submit(self, work, on_done, on_error=None, cancel_on_leave=True):
+        task = QueryTask(work, on_done, on_error, cancel_on_leave)
+        self._pending.add(task)
+        task.future = self._workers.submit(self._run, task)
+        self._schedule_poll()
+        return task
+
+    def call_soon(self, callback, *args):
+        """Run ``callback(*args)`` on the Tk thread, e.g. to report progress.
+
+        Safe to call from ``work`` while its task is pending.
+        """
+        self._callbacks.put((callback, args))
+
+    def cancel_all(self, include_background=False):
+        """Cancel pending tasks, e.g. when the user leaves a page."""
+        for task in list(self._pending):
+            if task.cancel_on_leave or include_background:
+                task.cancel()
+                self._pending.discard(task)
+
+    def shutdown(self):
+        self.cancel_all(include_background=True)
+        self._workers.shutdown(wait=False)
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        # The root outlives a logout; the next dashboard gets a fresh executor
+        if getattr(self.root, '_query_executor', None) is self:
+            del self.root._query_executor
+
+    def _run(self, task):
+        # Worker thread
+        conn = get_connection()
+        with task._lock:
+            if task.cancelled:
+                release_connection(conn)
+                return
+            task._conn = conn
+        result = error = None
+        try:
+            result = task.work(conn)
+        except Exception as e:
+            error = e
+        finally:
+            with task._lock:
+                task._conn = None
+            release_connection(conn)
+        self._finished.put((task, result, error))
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        # Tk thread
+        self._poll_id = None
+        while True:
+            try:
+                callback, args = self._callbacks.get_nowait()
+            except queue.Empty:
+                break
+            self._invoke(callback, *args)
+        while True:
+            try:
+                task, result, error = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(task)
+            if task.cancelled:
+                continue
+            if error is None:
+                self._invoke(task.on_done, result)
+            elif task.on_error is not None:
+                self._invoke(task.on_error, error)
+            else:
+                messagebox.showerror("Database Error", f"An error occurred: {str(error)}")
+        if self._pending:
+            self._schedule_poll()
+
+    def _invoke(self, callback, *args):
+        # A failing callback is reported the way Tk reports its own callback
+        # errors, and must not stop the rest of the queue or the polling
+        try:
+            callback(*args)
+        except Exception:
+            self.root.report_callback_exception(*sys.exc_info())
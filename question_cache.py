@@ -0,0 +1,65 @@
+import random
+import threading
+import time
+
+QUESTION_COLUMNS = "id, question, option_a, option_b, option_c, option_d, correct_answer, marks"
+
+
+class QuestionCache:
+    """Exams and their questions, loaded ahead of time for start_exam.
+
+    Entries are (title, duration, questions) tuples with the questions in id
+    order. ``load`` runs on a worker thread while ``get`` is called from the
+    Tk thread, so access goes through a lock.
+    """
+
+    def __init__(self):
+        self._exams = {}
+        self._lock = threading.Lock()
+
+    def get(self, exam_id, max_age=None):
+        """Return the cached entry, or None if it is missing or older than ``max_age`` seconds."""
+        with self._lock:
+            loaded_at, entry = self._exams.get(exam_id, (None, None))
+        if entry is not None and max_age is not None and time.monotonic() - loaded_at > max_age:
+            return None
+        return entry
+
+    def load(self, conn, exam_ids):
+        """Read the given exams and all their questions in two queries."""
+        exam_ids = list(exam_ids)
+        if not exam_ids:
+            return
+        placeholders = ", ".join("?" for _ in exam_ids)
+        exams = conn.execute(f"""
+            SELECT id, title, duration
+            FROM exams
+            WHERE id IN ({placeholders})
+        """, exam_ids).fetchall()
+        questions = {exam_id: [] for exam_id, _, _ in exams}
+        for row in conn.execute(f"""
+            SELECT exam_id, {QUESTION_COLUMNS}
+            FROM questions
+            WHERE exam_id IN ({placeholders})
+            ORDER BY exam_id, id
+        """, exam_ids):
+            questions[row[0]].append(row[1:])
+
+        loaded_at = time.monotonic()
+        loaded = {exam_id: (loaded_at, (title, duration, tuple(questions[exam_id])))
+                  for exam_id, title, duration in exams}
+        with self._lock:
+            for exam_id in exam_ids:
+                self._exams.pop(exam_id, None)
+            self._exams.update(loaded)
+
+
+def shuffle_questions(questions, student_id, exam_id):
+    """Return the questions in the order this student sees them.
+
+    The order depends only on the student, the exam and the question ids,
+    so it can be reproduced for an audit and a resumed attempt keeps it.
+    """
+    ordered = sorted(questions, key=lambda question: question[0])
+    random.Random(f"{student_id}:{exam_id}").shuffle(ordered)
+    return ordered
@@ -0,0 +1,254 @@
+import csv
+import hashlib
+import os
+import re
+
+from scoring import OPTION_LETTERS
+
+QUESTION_FILETYPES = [("Question files", "*.gift *.txt *.csv"), ("GIFT files", "*.gift *.txt"),
+                      ("Aiken files", "*.txt"), ("CSV files", "*.csv")]
+# Header names a CSV question file must provide; a ``marks`` column is optional
+CSV_COLUMNS = ('question', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_answer')
+
+INSERT_QUESTION_SQL = '''
+    INSERT INTO questions (exam_id, question, option_a, option_b, option_c, option_d,
+                           correct_answer, marks, created_by)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_AIKEN_OPTION = re.compile(r'^([A-Z])[.)]\s+(.*)$')
+_AIKEN_ANSWER = re.compile(r'^ANSWER\s*:\s*(.*)$', re.IGNORECASE)
+# GIFT escapes are swapped for private-use characters while parsing so the
+# special characters can be split on directly, then swapped back
+_GIFT_ESCAPE = re.compile(r'\\([~=#{}:\\n])')
+_GIFT_PLACEHOLDERS = {char: chr(0xE000 + i) for i, char in enumerate('~=#{}:\\n')}
+_GIFT_RESTORE = str.maketrans({placeholder: ('\n' if char == 'n' else char)
+                               for char, placeholder in _GIFT_PLACEHOLDERS.items()})
+
+
+class QuestionImportError(Exception):
+    pass
+
+
+class QuestionReport:
+    """What happened to each parsed question: imported, rejected or duplicate."""
+
+    def __init__(self):
+        self.imported = 0
+        self.invalid = []       # (line, reason)
+        self.duplicates = []    # (line, question)
+
+    def summary(self, limit=15):
+        lines = [f"Imported {self.imported} question(s)."]
+        if self.duplicates:
+            lines.append(f"\n{len(self.duplicates)} duplicate(s) skipped:")
+            lines += [f"  line {line}: {_shorten(question)}" for line, question in self.duplicates[:limit]]
+        if self.invalid:
+            lines.append(f"\n{len(self.invalid)} invalid question(s) skipped:")
+            lines += [f"  line {line}: {reason}" for line, reason in self.invalid[:limit]]
+        hidden = max(len(self.duplicates) - limit, 0) + max(len(self.invalid) - limit, 0)
+        if hidden:
+            lines.append(f"\n...and {hidden} more")
+        return "\n".join(lines)
+
+
+def _shorten(text, width=60):
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def question_hash(question, option_a, option_b, option_c, option_d):
+    """Hash of a question's wording, ignoring case and spacing.
+
+    The correct answer and marks are left out, so the same question with a
+    different key still counts as a duplicate.
+    """
+    normalized = '\x1f'.join(' '.join(part.split()).casefold()
+                             for part in (question, option_a, option_b, option_c, option_d))
+    return hashlib.sha256(normalized.encode('utf-8')).digest()
+
+
+def _question(question, options, correct, marks=1):
+    return {'question': question, 'options': options, 'correct': correct, 'marks': marks}
+
+
+def parse_aiken(text):
+    """Yield (line_number, question or error message) for an Aiken file.
+
+    Each question is its text, one "A. option" line per option and a closing
+    "ANSWER: X" line.
+    """
+    start = None
+    stem = []
+    options = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        if start is None:
+            start = line_number
+        answer = _AIKEN_ANSWER.match(line)
+        option = _AIKEN_OPTION.match(line)
+        if answer:
+            letters = [letter for letter, _ in options]
+            correct = answer.group(1).strip().upper()
+            if not stem:
+                yield start, "question text missing"
+            elif letters != list(OPTION_LETTERS):
+                yield start, f"expected options {', '.join(OPTION_LETTERS)}, found {', '.join(letters) or 'none'}"
+            elif correct not in OPTION_LETTERS:
+                yield start, f"answer {correct or '(blank)'} is not one of the options"
+            else:
+                yield start, _question(' '.join(stem), [value for _, value in options], correct)
+            start, stem, options = None, [], []
+        elif option and stem:
+            options.append((option.group(1), option.group(2).strip()))
+        elif options:
+            # Text after the options belongs to the last one
+            letter, value = options[-1]
+            options[-1] = (letter, f"{value} {line}")
+        else:
+            stem.append(line)
+    if start is not None:
+        yield start, "no ANSWER line"
+
+
+def _gift_blocks(text):
+    """Split GIFT text into (first_line, text) blocks separated by blank lines."""
+    start = None
+    lines = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        stripped = line.strip()
+        if stripped.startswith('//'):
+            continue
+        if stripped:
+            if start is None:
+                start = line_number
+            lines.append(stripped)
+        elif lines:
+            yield start, ' '.join(lines)
+            start, lines = None, []
+    if lines:
+        yield start, ' '.join(lines)
+
+
+def _gift_text(text):
+    return ' '.join(text.split()).translate(_GIFT_RESTORE)
+
+
+def parse_gift(text):
+    """Yield (line_number, question or error message) for a GIFT file.
+
+    Only single-answer multiple choice questions with four options fit the
+    questions table; other GIFT question types are reported as invalid.
+    """
+    for line_number, block in _gift_blocks(text):
+        block = _GIFT_ESCAPE.sub(lambda m: _GIFT_PLACEHOLDERS[m.group(1)], block)
+        if block.startswith('$CATEGORY:'):
+            continue
+        block = re.sub(r'^::.*?::', '', block).strip()
+        block = re.sub(r'^\[(html|moodle|plain|markdown)\]', '', block).strip()
+        opening, closing = block.find('{'), block.rfind('}')
+        if opening < 0 or closing < opening:
+            yield line_number, "no {answers} block"
+            continue
+
+        before, after = block[:opening].strip(), block[closing + 1:].strip()
+        # Missing word format: the answers stand in for a blank in the text
+        stem = _gift_text(f"{before} _____ {after}" if after else before)
+        answers = re.findall(r'([=~])([^=~]*)', block[opening + 1:closing])
+        options = [_gift_text(value.split('#', 1)[0]) for _, value in answers]
+        correct = [i for i, (mark, _) in enumerate(answers) if mark == '=']
+        if not stem:
+            yield line_number, "question text missing"
+        elif any('->' in option or option.startswith('%') for option in options):
+            yield line_number, "only single-answer multiple choice questions are supported"
+        elif len(options) != len(OPTION_LETTERS) or len(correct) != 1:
+            yield line_number, (f"expected {len(OPTION_LETTERS)} options with one correct answer, "
+                                f"found {len(options)} with {len(correct)}")
+        elif not all(options):
+            yield line_number, "empty option"
+        else:
+            yield line_number, _question(stem, options, OPTION_LETTERS[correct[0]])
+
+
+def parse_csv(text):
+    """Yield (line_number, question or error message) for a CSV file with a header row."""
+    rows = csv.reader(text.splitlines())
+    header = [name.strip().lower() for name in next(rows, [])]
+    missing = [column for column in CSV_COLUMNS if column not in header]
+    if missing:
+        raise QuestionImportError(f"File is missing column(s): {', '.join(missing)}")
+    positions = [header.index(column) for column in CSV_COLUMNS]
+    marks_position = header.index('marks') if 'marks' in header else None
+    for line_number, row in enumerate(rows, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        row = [cell.strip() for cell in row] + [''] * (len(header) - len(row))
+        question, *options, correct = (row[i] for i in positions)
+        correct = correct.upper()
+        marks = row[marks_position] if marks_position is not None and row[marks_position] else '1'
+        empty = [column for column, value in zip(CSV_COLUMNS, (question, *options, correct)) if not value]
+        if empty:
+            yield line_number, f"missing {', '.join(empty)}"
+        elif correct not in OPTION_LETTERS:
+            yield line_number, f"correct_answer {correct} is not one of {', '.join(OPTION_LETTERS)}"
+        elif not marks.isdigit() or int(marks) < 1:
+            yield line_number, f"marks {marks} is not a positive whole number"
+        else:
+            yield line_number, _question(question, options, correct, int(marks))
+
+
+def parse_questions(path):
+    """Parse a question file, choosing the format from its extension.
+
+    .csv is CSV and .gift is GIFT; any other file is read as Aiken if it has
+    an "ANSWER:" line and as GIFT otherwise.
+    """
+    if not os.path.exists(path):
+        raise QuestionImportError(f"File not found: {path}")
+    with open(path, encoding='utf-8-sig') as f:
+        text = f.read()
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return parse_csv(text)
+    if extension != '.gift' and re.search(r'^\s*ANSWER\s*:', text, re.MULTILINE | re.IGNORECASE):
+        return parse_aiken(text)
+    return parse_gift(text)
+
+
+def import_questions(conn, path, exam_id, created_by=None):
+    """Import a GIFT, Aiken or CSV question file into one exam.
+
+    Questions whose wording matches one already in the exam (or earlier in
+    the file) are skipped. Everything else is inserted with a single
+    executemany in one transaction. Returns a QuestionReport.
+    """
+    report = QuestionReport()
+    parsed = list(parse_questions(path))
+
+    seen = {question_hash(*row) for row in conn.execute("""
+        SELECT question, option_a, option_b, option_c, option_d
+        FROM questions
+        WHERE exam_id = ?
+    """, (exam_id,))}
+    rows = []
+    for line_number, question in parsed:
+        if isinstance(question, str):
+            report.invalid.append((line_number, question))
+            continue
+        content_hash = question_hash(question['question'], *question['options'])
+        if content_hash in seen:
+            report.duplicates.append((line_number, question['question']))
+            continue
+        seen.add(content_hash)
+        rows.append((exam_id, question['question'], *question['options'],
+                     question['correct'], question['marks'], created_by))
+
+    try:
+        conn.executemany(INSERT_QUESTION_SQL, rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    report.imported = len(rows)
+    return report
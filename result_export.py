@@ -0,0 +1,51 @@
+import csv
+import json
+import os
+
+# Rows pulled per fetchmany call; progress is reported once per batch
+EXPORT_BATCH_SIZE = 2000
+EXPORT_FILETYPES = [("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl")]
+
+
+def export_query(conn, sql, params, columns, path, progress=None):
+    """Stream the rows of a query to a CSV or JSON Lines file.
+
+    The format follows the file extension (.jsonl/.json for JSON Lines,
+    anything else CSV). Rows are fetched and written one batch at a time, so
+    memory use does not grow with the result size. The file is written under
+    a temporary name and only moved into place once complete.
+    ``progress(rows_written)`` is called after every batch. Returns the
+    number of rows written.
+    """
+    json_lines = path.lower().endswith(('.jsonl', '.json'))
+    temp_path = path + '.part'
+    cursor = conn.execute(sql, params)
+    written = 0
+    try:
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            if json_lines:
+                def write(rows):
+                    f.writelines(json.dumps(dict(zip(columns, row))) + '\n' for row in rows)
+            else:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                write = writer.writerows
+
+            while True:
+                rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                write(rows)
+                written += len(rows)
+                if progress is not None:
+                    progress(written)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        cursor.close()
+    return written
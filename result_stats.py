@@ -0,0 +1,48 @@
+import math
+
+# Running totals kept in exam_stats and student_stats by the results triggers
+STATS_COLUMNS = "attempts, score_sum, score_squares, min_score, max_score"
+
+
+def summarize(attempts, score_sum, score_squares, min_score, max_score):
+    """Turn stored running totals into (attempts, average, std_dev, lowest, highest)."""
+    if not attempts:
+        return 0, 0.0, 0.0, None, None
+    average = score_sum / attempts
+    # Population variance; clamped because the running sums carry rounding error
+    variance = max(score_squares / attempts - average * average, 0.0)
+    return attempts, average, math.sqrt(variance), min_score, max_score
+
+
+def student_summary(conn, student_id):
+    row = conn.execute(f"SELECT {STATS_COLUMNS} FROM student_stats WHERE student_id = ?",
+                       (student_id,)).fetchone()
+    return summarize(*row) if row else summarize(0, 0, 0, None, None)
+
+
+def exam_summary(conn, teacher_id=None):
+    """Combined statistics over every exam, or over one teacher's subject."""
+    if teacher_id is None:
+        # foreign_keys is off, so a deleted exam's stats row can outlive it
+        row = conn.execute("""
+            SELECT SUM(st.attempts), SUM(st.score_sum), SUM(st.score_squares), MIN(st.min_score), MAX(st.max_score)
+            FROM exam_stats st
+            JOIN exams e ON st.exam_id = e.id
+        """).fetchone()
+    else:
+        row = conn.execute("""
+            SELECT SUM(st.attempts), SUM(st.score_sum), SUM(st.score_squares), MIN(st.min_score), MAX(st.max_score)
+            FROM exam_stats st
+            JOIN exams e ON st.exam_id = e.id
+            JOIN teachers t ON e.subject_id = t.subject_id
+            WHERE t.id = ?
+        """, (teacher_id,)).fetchone()
+    return summarize(*row)
+
+
+def format_summary(summary):
+    attempts, average, std_dev, lowest, highest = summary
+    if not attempts:
+        return "No results yet"
+    return (f"Attempts: {attempts}    Average: {average:.2f}%    Std Dev: {std_dev:.2f}    "
+            f"Highest: {highest:.2f}%    Lowest: {lowest:.2f}%")
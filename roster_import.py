@@ -0,0 +1,150 @@
+import csv
+import hashlib
+import os
+import sqlite3
+
+# Header names a roster must provide (case and surrounding spaces ignored)
+ROSTER_COLUMNS = ('name', 'username', 'email', 'password', 'class', 'phone')
+ROSTER_FILETYPES = [("Roster files", "*.csv *.xlsx"), ("CSV files", "*.csv"), ("Excel workbooks", "*.xlsx")]
+# Students inserted per transaction
+IMPORT_CHUNK_SIZE = 1000
+
+INSERT_USER_SQL = '''
+    INSERT INTO users (username, name, email, password, role)
+    VALUES (?, ?, ?, ?, 'Student')
+'''
+INSERT_STUDENT_SQL = '''
+    INSERT INTO students (id, class, phone)
+    SELECT id, ?, ? FROM users WHERE username = ?
+'''
+
+
+class RosterImportError(Exception):
+    pass
+
+
+class RosterReport:
+    """What happened to each roster line: imported, rejected or duplicate."""
+
+    def __init__(self):
+        self.imported = 0
+        self.invalid = []       # (line, reason)
+        self.duplicates = []    # (line, username, reason)
+
+    def summary(self, limit=15):
+        lines = [f"Imported {self.imported} student(s)."]
+        if self.duplicates:
+            lines.append(f"\n{len(self.duplicates)} duplicate(s) skipped:")
+            lines += [f"  line {line}: {username} ({reason})" for line, username, reason in self.duplicates[:limit]]
+        if self.invalid:
+            lines.append(f"\n{len(self.invalid)} invalid row(s) skipped:")
+            lines += [f"  line {line}: {reason}" for line, reason in self.invalid[:limit]]
+        hidden = max(len(self.duplicates) - limit, 0) + max(len(self.invalid) - limit, 0)
+        if hidden:
+            lines.append(f"\n...and {hidden} more")
+        return "\n".join(lines)
+
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        yield from reader
+
+
+def _read_xlsx(path):
+    try:
+        import openpyxl
+    except ImportError:
+        raise RosterImportError("Reading .xlsx files needs the openpyxl package; save the roster as CSV instead.")
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield ['' if value is None else str(value) for value in row]
+    finally:
+        workbook.close()
+
+
+def read_roster(path):
+    """Yield (line_number, {column: value}) for every data row of a roster."""
+    rows = _read_xlsx(path) if path.lower().endswith('.xlsx') else _read_csv(path)
+    header = [name.strip().lower() for name in next(rows, [])]
+    missing = [column for column in ROSTER_COLUMNS if column not in header]
+    if missing:
+        raise RosterImportError(f"Roster is missing column(s): {', '.join(missing)}")
+    positions = [header.index(column) for column in ROSTER_COLUMNS]
+    for line, row in enumerate(rows, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        row = row + [''] * (len(header) - len(row))
+        yield line, {column: row[i].strip() for column, i in zip(ROSTER_COLUMNS, positions)}
+
+
+def validate_roster(rows, report):
+    """Return the rows fit to insert; the rest are recorded in ``report``."""
+    valid = []
+    seen_usernames = set()
+    seen_emails = set()
+    for line, row in rows:
+        empty = [column for column in ROSTER_COLUMNS if not row[column]]
+        if empty:
+            report.invalid.append((line, f"missing {', '.join(empty)}"))
+        elif '@' not in row['email']:
+            report.invalid.append((line, f"invalid email {row['email']}"))
+        elif row['username'] in seen_usernames:
+            report.duplicates.append((line, row['username'], "username repeated in roster"))
+        elif row['email'].lower() in seen_emails:
+            report.duplicates.append((line, row['username'], "email repeated in roster"))
+        else:
+            seen_usernames.add(row['username'])
+            seen_emails.add(row['email'].lower())
+            valid.append((line, row))
+    return valid
+
+
+def _insert_chunk(conn, chunk, report):
+    users = [(row['username'], row['name'], row['email'],
+              hashlib.sha256(row['password'].encode()).hexdigest()) for _, row in chunk]
+    students = [(row['class'], row['phone'], row['username']) for _, row in chunk]
+    try:
+        conn.executemany(INSERT_USER_SQL, users)
+        conn.executemany(INSERT_STUDENT_SQL, students)
+        conn.commit()
+        report.imported += len(chunk)
+        return
+    except sqlite3.IntegrityError:
+        conn.rollback()
+
+    # Some rows clash with existing users; insert one by one so the UNIQUE
+    # constraints tell which ones
+    for (line, row), user, student in zip(chunk, users, students):
+        try:
+            conn.execute(INSERT_USER_SQL, user)
+        except sqlite3.IntegrityError as e:
+            column = str(e).rsplit('.', 1)[-1]
+            report.duplicates.append((line, row['username'], f"{column} already exists"))
+            continue
+        conn.execute(INSERT_STUDENT_SQL, student)
+        report.imported += 1
+    conn.commit()
+
+
+def import_roster(conn, path, progress=None):
+    """Import a CSV or XLSX student roster.
+
+    Rows are validated first, then inserted ``IMPORT_CHUNK_SIZE`` at a time,
+    each chunk in its own transaction. ``progress(done, total)`` is called
+    after every chunk. Returns a RosterReport.
+    """
+    if not os.path.exists(path):
+        raise RosterImportError(f"File not found: {path}")
+    report = RosterReport()
+    valid = validate_roster(read_roster(path), report)
+    for start in range(0, len(valid), IMPORT_CHUNK_SIZE):
+        try:
+            _insert_chunk(conn, valid[start:start + IMPORT_CHUNK_SIZE], report)
+        except Exception:
+            conn.rollback()
+            raise
+        if progress is not None:
+            progress(min(start + IMPORT_CHUNK_SIZE, len(valid)), len(valid))
+    return report
@@ -0,0 +1,174 @@
+import numpy as np
+
+# Answer letters in the order of the option_a..option_d columns
+OPTION_LETTERS = ('A', 'B', 'C', 'D')
+_OPTION_CODES = {letter: code for code, letter in enumerate(OPTION_LETTERS)}
+
+# Code used for an unanswered question or an unrecognised answer letter
+NO_ANSWER = -1
+# Stands in for an unanswered question in a stored answer sheet
+BLANK_LETTER = '-'
+
+# Byte value -> option code, for decoding stored answer sheets in bulk
+_LETTER_CODES = np.full(256, NO_ANSWER, dtype=np.int8)
+for _code, _letter in enumerate(OPTION_LETTERS):
+    _LETTER_CODES[ord(_letter)] = _code
+
+
+def encode_option(letter):
+    return _OPTION_CODES.get((letter or '').strip().upper(), NO_ANSWER)
+
+
+class ExamScore:
+    """Outcome of scoring one submission against an AnswerKey."""
+
+    def __init__(self, chosen, correct, marks):
+        self.chosen = chosen
+        self.answered = chosen != NO_ANSWER
+        self.correct = correct
+        self.marks_earned = float(marks[correct].sum())
+        self.total_marks = float(marks.sum())
+        self.correct_count = int(correct.sum())
+        self.answered_count = int(self.answered.sum())
+        self.incorrect_count = self.answered_count - self.correct_count
+        self.percentage = (self.marks_earned / self.total_marks * 100) if self.total_marks > 0 else 0
+
+
+class AnswerKey:
+    """Compact answer key for one exam, read fresh from the questions table.
+
+    Correct answers are stored as option codes (0-3) and marks as a float
+    array, both in the order of ``question_ids``. Scoring a submission is a
+    single vectorised comparison over those arrays.
+    """
+
+    def __init__(self, question_ids, correct_answers, marks):
+        self.question_ids = list(question_ids)
+        self.correct = np.array([encode_option(answer) for answer in correct_answers], dtype=np.int8)
+        self.marks = np.array(marks, dtype=np.float64)
+
+    @classmethod
+    def for_exam(cls, conn, exam_id, question_ids=None):
+        """Build the current key of an exam straight from the questions table.
+
+        With ``question_ids`` the key only covers those of the exam's
+        questions, e.g. the ones a student was actually shown.
+        """
+        rows = conn.execute("""
+            SELECT id, correct_answer, marks
+            FROM questions
+            WHERE exam_id = ?
+            ORDER BY id
+        """, (exam_id,)).fetchall()
+        if question_ids is not None:
+            question_ids = set(question_ids)
+            rows = [row for row in rows if row[0] in question_ids]
+        return cls([row[0] for row in rows],
+                   [row[1] for row in rows],
+                   [row[2] if row[2] is not None else 1 for row in rows])
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    def encode(self, answers):
+        """Turn a {str(question_id): letter} dict into an array of option codes."""
+        return np.array([encode_option(answers.get(str(question_id)))
+                         for question_id in self.question_ids], dtype=np.int8)
+
+    def matches(self, chosen):
+        # A blank answer never matches, even against a malformed key entry
+        return (chosen == self.correct) & (chosen != NO_ANSWER)
+
+    def score(self, answers):
+        chosen = self.encode(answers)
+        return ExamScore(chosen, self.matches(chosen), self.marks)
+
+    def score_matrix(self, chosen, present=None):
+        """Percentage scores for a (submissions x questions) matrix of option codes.
+
+        ``present`` marks the questions each submission was actually given;
+        a row is scored out of the marks of those questions only, so a
+        question added to the exam later does not lower it.
+        """
+        if present is None:
+            present = np.ones(chosen.shape, dtype=bool)
+        totals = present @ self.marks
+        earned = (self.matches(chosen) & present) @ self.marks
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(totals > 0, earned / totals * 100, 0.0)
+
+
+def answer_sheet(key, score):
+    """Pack a submission into the (question_ids, answers) columns of result_answers."""
+    question_ids = np.array(key.question_ids, dtype='<i8').tobytes()
+    answers = ''.join(OPTION_LETTERS[code] if code != NO_ANSWER else BLANK_LETTER
+                      for code in score.chosen.tolist())
+    return question_ids, answers
+
+
+def load_answer_matrix(conn, exam_id, key):
+    """Unpack the stored answer sheets of an exam against ``key``.
+
+    Returns (result_ids, chosen, present, scores): ``chosen`` is a
+    (submissions x questions) matrix of option codes in key order,
+    ``present`` says which questions were on each sheet and ``scores`` is
+    the currently stored score of each submission. Results saved before
+    answer sheets were recorded are not included.
+    """
+    rows = conn.execute("""
+        SELECT r.id, ra.question_ids, ra.answers, r.score
+        FROM results r
+        JOIN result_answers ra ON ra.result_id = r.id
+        WHERE r.exam_id = ?
+    """, (exam_id,)).fetchall()
+
+    result_ids = [row[0] for row in rows]
+    scores = np.array([row[3] for row in rows], dtype=np.float64)
+    chosen = np.full((len(rows), len(key)), NO_ANSWER, dtype=np.int8)
+    present = np.zeros((len(rows), len(key)), dtype=bool)
+    if not rows or not len(key):
+        return result_ids, chosen, present, scores
+
+    lengths = np.array([len(row[2]) for row in rows])
+    # Flatten every sheet into parallel (submission, question, choice) arrays
+    submission = np.repeat(np.arange(len(rows)), lengths)
+    answered_ids = np.frombuffer(b''.join(row[1] for row in rows), dtype='<i8')
+    choices = _LETTER_CODES[np.frombuffer(''.join(row[2] for row in rows).encode('ascii'), dtype=np.uint8)]
+
+    # Column of each answer in the key; answers to questions that have since
+    # been deleted or moved to another exam are dropped
+    question_ids = np.array(key.question_ids, dtype=np.int64)
+    column = np.minimum(np.searchsorted(question_ids, answered_ids), len(key) - 1)
+    known = question_ids[column] == answered_ids
+    chosen[submission[known], column[known]] = choices[known]
+    present[submission[known], column[known]] = True
+    return result_ids, chosen, present, scores
+
+
+def regrade_exam(conn, exam_id):
+    """Rescore every stored submission of an exam against its current key.
+
+    The saved answer sheets are scored as one matrix in a single pass and
+    the new scores are written back in one transaction. Results saved before
+    answer sheets were recorded only hold a percentage and are left as they
+    are. Returns the number of results whose score changed.
+    """
+    key = AnswerKey.for_exam(conn, exam_id)
+    result_ids, chosen, present, old_scores = load_answer_matrix(conn, exam_id, key)
+    if not result_ids:
+        return 0
+
+    # Each sheet is scored over the questions it contained, so questions
+    # added (or moved in) after it was submitted leave it unchanged
+    scores = key.score_matrix(chosen, present)
+    # Only write rows whose score actually moved; each write also updates
+    # the score index and the stats triggers
+    changed = np.flatnonzero(scores != old_scores)
+    try:
+        conn.executemany("UPDATE results SET score = ? WHERE id = ?",
+                         ((scores[i], result_ids[i]) for i in changed.tolist()))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(changed)
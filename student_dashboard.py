@@ -2,31 +2,80 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import sqlite3
 from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-import io
-from PIL import Image, ImageTk
+import math
+import time
+from database import get_connection, release_connection
+from query_executor import QueryExecutor
+from virtual_treeview import sync_treeview
+from scoring import AnswerKey, answer_sheet, OPTION_LETTERS
+from answer_journal import AnswerJournal
+from question_cache import QuestionCache, shuffle_questions
+from result_stats import student_summary
+from progress_report import build_progress_report
+from profile_images import PhotoCache, prepare_upload, store_image
+from theme import use_styles
+
+# Slack allowed between the deadline and a submission reaching the database
+SUBMIT_GRACE_SECONDS = 30
+# A prefetched exam older than this is read again when the student starts it
+QUESTION_CACHE_MAX_AGE = 60
+# Records a submission only if it arrives before the attempt's deadline
+# (plus the grace); inserts nothing otherwise
+SUBMIT_RESULT_SQL = """
+    INSERT INTO results (student_id, exam_id, score, date)
+    SELECT ?, ?, ?, datetime('now')
+    FROM exam_attempts
+    WHERE student_id = ? AND exam_id = ?
+      AND julianday('now') <= julianday(deadline) + ? / 86400.0
+"""
+# Exams the student has no result for yet, flagging those whose attempt
+# ran out without a submission (anti-join on idx_results_student_exam)
+AVAILABLE_EXAMS_SQL = """
+    SELECT e.id, e.title, e.duration, e.question_count,
+           julianday('now') > julianday(a.deadline) + ? / 86400.0
+    FROM exams e
+    LEFT JOIN results r ON r.exam_id = e.id AND r.student_id = ?
+    LEFT JOIN exam_attempts a ON a.exam_id = e.id AND a.student_id = ?
+    WHERE r.id IS NULL
+"""
+# The student's own results, newest first
+RESULTS_SQL = """
+    SELECT r.id, u.name, e.title, r.score, r.date
+    FROM results r
+    JOIN students s ON r.student_id = s.id
+    JOIN exams e ON r.exam_id = e.id
+    JOIN users u ON s.id = u.id  -- Join with users table to get the name
+    WHERE r.student_id = ?
+    ORDER BY r.date DESC
+"""
 
 class StudentDashboard:
-    def __init__(self, root, student_id, login_window):
+    def __init__(self, root, student_id, session):
         self.root = root
         self.student_id = student_id
-        self.login_window = login_window
+        self.session = session
         self.root.title("Student Dashboard")
         self.current_page = None
         self.questions = []
         self.answers = {}
+        self.answer_key = None
+        self.exam_score = None
+        # Autosave log of the exam in progress
+        self.journal = None
+        # Questions of the listed exams, prefetched with the exam list
+        self.question_cache = QuestionCache()
         self.current_question = 0
         self.timer_active = False
+        self.timer_id = None
+        # time.monotonic() value at which the exam in progress ends
+        self.deadline = None
         self.exam_id = None
         self.exam_title = None
         self.duration = None
         
-        # Initialize database tables
-        self.init_database()
+        self.executor = QueryExecutor.for_root(root)
+        # Decoded profile thumbnails
+        self.photo_cache = PhotoCache.for_root(root)
         
         # Configure the window
         self.root.state('zoomed')  # Maximize window
@@ -54,43 +103,11 @@ class StudentDashboard:
             'warning': '#FFA726'        # Warning color (orange)
         }
         
-        # Configure styles
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-        
-        # Configure widget styles
-        self.style.configure("Menu.TFrame", 
-                           background=self.colors['menu_bg'])
-        self.style.configure("Content.TFrame", 
-                           background=self.colors['content_bg'])
-        self.style.configure("MenuButton.TButton",
-                           background=self.colors['menu_bg'],
-                           foreground=self.colors['text'],
-                           font=('Segoe UI', 11),
-                           borderwidth=0,
-                           padding=(20, 15))
-        self.style.map("MenuButton.TButton",
-                      background=[('active', self.colors['hover'])],
-                      foreground=[('active', self.colors['accent1'])])
-        
-        # Configure Treeview style to match teacher dashboard
-        self.style.configure("Timeline.Treeview",
-                           background=self.colors['content_bg'],
-                           foreground=self.colors['text'],
-                           fieldbackground=self.colors['content_bg'],
-                           borderwidth=0,
-                           font=('Segoe UI', 10))
-        self.style.configure("Timeline.Treeview.Heading",
-                           background=self.colors['menu_bg'],
-                           foreground=self.colors['text'],
-                           borderwidth=0,
-                           font=('Segoe UI', 11, 'bold'))
-        self.style.map('Timeline.Treeview',
-                      background=[('selected', self.colors['selected'])],
-                      foreground=[('selected', self.colors['text'])])
+        # Configure styles (once per Tk interpreter, not on every login)
+        self.style = use_styles(root, "student", self.configure_styles)
         
         # Create main content frame
-        self.content_frame = ttk.Frame(self.root, style="Content.TFrame")
+        self.content_frame = ttk.Frame(self.root, style="StudentContent.TFrame")
         self.content_frame.pack(side='right', fill='both', expand=True)
         
         # Setup menu
@@ -99,19 +116,16 @@ class StudentDashboard:
         # Show available exams by default
         self.show_available_exams()
         
-        # Initialize database tables
-        self.init_database()
-        
         # Configure the window
         self.root.state('zoomed')  # Maximize window
         
         # Get student info for profile section (with additional details)
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
-        # Fetch student info from both users and students tables
+        # Name and class for the menu; the picture is only read by show_profile
         cursor.execute('''
-        SELECT u.name, u.email,s.class, s.phone, s.profile_pic, s.bio 
+        SELECT u.name, s.class
         FROM users u
         JOIN students s ON u.id = s.id
         WHERE u.id = ?
@@ -119,7 +133,7 @@ class StudentDashboard:
 
         self.student_info = cursor.fetchone()
 
-        conn.close()
+        release_connection(conn)
 
         
         # Profile section at bottom of menu
@@ -143,6 +157,72 @@ class StudentDashboard:
                   style="MenuButton.TButton",
                   command=self.logout).pack(fill='x', pady=(10,0))
         
+    def configure_styles(self, style):
+        style.configure("Menu.TFrame",
+                        background=self.colors['menu_bg'])
+        style.configure("StudentContent.TFrame",
+                        background=self.colors['content_bg'])
+        style.configure("MenuButton.TButton",
+                        background=self.colors['menu_bg'],
+                        foreground=self.colors['text'],
+                        font=('Segoe UI', 11),
+                        borderwidth=0,
+                        padding=(20, 15))
+        style.map("MenuButton.TButton",
+                  background=[('active', self.colors['hover'])],
+                  foreground=[('active', self.colors['accent1'])])
+
+        # Configure Treeview style to match teacher dashboard
+        style.configure("Timeline.Treeview",
+                        background=self.colors['content_bg'],
+                        foreground=self.colors['text'],
+                        fieldbackground=self.colors['content_bg'],
+                        borderwidth=0,
+                        font=('Segoe UI', 10))
+        style.configure("Timeline.Treeview.Heading",
+                        background=self.colors['menu_bg'],
+                        foreground=self.colors['text'],
+                        borderwidth=0,
+                        font=('Segoe UI', 11, 'bold'))
+        style.map('Timeline.Treeview',
+                  background=[('selected', self.colors['selected'])],
+                  foreground=[('selected', self.colors['text'])])
+
+        # Available exams list
+        style.configure(
+            "Custom.Treeview",
+            background=self.colors['menu_bg'],
+            foreground=self.colors['text'],
+            fieldbackground=self.colors['menu_bg'],
+            borderwidth=0,
+            font=('Segoe UI', 10)
+        )
+        style.configure(
+            "Custom.Treeview.Heading",
+            background=self.colors['menu_bg'],
+            foreground=self.colors['text'],
+            borderwidth=1,
+            font=('Segoe UI', 10, 'bold')
+        )
+        style.map(
+            "Custom.Treeview",
+            background=[('selected', self.colors['accent1'])],
+            foreground=[('selected', self.colors['text'])]
+        )
+
+        # Scrollbar of the available exams list
+        style.configure(
+            "Custom.Vertical.TScrollbar",
+            background=self.colors['menu_bg'],
+            arrowcolor=self.colors['text'],
+            bordercolor=self.colors['menu_bg'],
+            troughcolor=self.colors['content_bg']
+        )
+
+        # Success and error frames of the review dialog
+        style.configure("SuccessCard.TFrame", background=self.colors['menu_bg'], borderwidth=2, relief="solid", bordercolor=self.colors['success'])
+        style.configure("ErrorCard.TFrame", background=self.colors['menu_bg'], borderwidth=2, relief="solid", bordercolor=self.colors['error'])
+
     def setup_menu(self):
         """Set up the menu buttons"""
         self.menu_frame = ttk.Frame(self.root, style="Menu.TFrame")
@@ -177,6 +257,8 @@ class StudentDashboard:
         
     def clear_content(self):
         """Clear all widgets from the content frame"""
+        self.executor.cancel_all()
+        
         # Destroy all widgets in the content frame
         for widget in self.content_frame.winfo_children():
             widget.destroy()
@@ -191,11 +273,11 @@ class StudentDashboard:
         
         """Set up the exam list interface"""
         # Create main container
-        main_container = ttk.Frame(self.content_frame, style="Content.TFrame")
+        main_container = ttk.Frame(self.content_frame, style="StudentContent.TFrame")
         main_container.pack(fill='both', expand=True, padx=30, pady=20)
         
         # Header
-        header_frame = ttk.Frame(main_container, style="Content.TFrame")
+        header_frame = ttk.Frame(main_container, style="StudentContent.TFrame")
         header_frame.pack(fill='x', pady=(0, 20))
         
         ttk.Label(
@@ -206,29 +288,6 @@ class StudentDashboard:
             background=self.colors['content_bg']
         ).pack(side='left')
         
-        # Configure Treeview style
-        style = ttk.Style()
-        style.configure(
-            "Custom.Treeview",
-            background=self.colors['menu_bg'],
-            foreground=self.colors['text'],
-            fieldbackground=self.colors['menu_bg'],
-            borderwidth=0,
-            font=('Segoe UI', 10)
-        )
-        style.configure(
-            "Custom.Treeview.Heading",
-            background=self.colors['menu_bg'],
-            foreground=self.colors['text'],
-            borderwidth=1,
-            font=('Segoe UI', 10, 'bold')
-        )
-        style.map(
-            "Custom.Treeview",
-            background=[('selected', self.colors['accent1'])],
-            foreground=[('selected', self.colors['text'])]
-        )
-        
         # Create Treeview for exams
         tree_frame = ttk.Frame(main_container, style="Card.TFrame")
         tree_frame.pack(fill='both', expand=True)
@@ -263,15 +322,6 @@ class StudentDashboard:
         )
         self.exam_tree.configure(yscrollcommand=scrollbar.set)
         
-        # Configure scrollbar style
-        style.configure(
-            "Custom.Vertical.TScrollbar",
-            background=self.colors['menu_bg'],
-            arrowcolor=self.colors['text'],
-            bordercolor=self.colors['menu_bg'],
-            troughcolor=self.colors['content_bg']
-        )
-        
         self.exam_tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
         
@@ -279,7 +329,7 @@ class StudentDashboard:
         self.load_available_exams()
         
         # Add Start Exam button
-        button_frame = ttk.Frame(main_container, style="Content.TFrame")
+        button_frame = ttk.Frame(main_container, style="StudentContent.TFrame")
         button_frame.pack(fill='x', pady=20)
         
         ttk.Button(
@@ -290,51 +340,34 @@ class StudentDashboard:
         ).pack(side='right')
 
     def load_available_exams(self):
-        # Clear existing items
-        for item in self.exam_tree.get_children():
-            self.exam_tree.delete(item)
-        
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
-        
-        try:
+        def fetch(conn):
             # Get exams that student hasn't taken yet
-            cursor.execute("""
-                SELECT e.id, e.title, e.duration,
-                    (SELECT COUNT(*) FROM questions q WHERE q.exam_id = e.id) as question_count
-                FROM exams e
-                WHERE e.id NOT IN (
-                    SELECT exam_id FROM results WHERE student_id = ?
-                )
-            """, (self.student_id,))
-            
-            exams = cursor.fetchall()
-            
+            exams = conn.execute(AVAILABLE_EXAMS_SQL,
+                                 (SUBMIT_GRACE_SECONDS, self.student_id, self.student_id)).fetchall()
+            # Have the questions ready before the student presses Start
+            self.question_cache.load(conn, [exam[0] for exam in exams])
+            return exams
+
+        def show(exams):
             if not exams:
-                self.exam_tree.insert('', 'end', values=(
+                rows = [(
                     "-",
                     "No available exams",
                     "-",
                     "-",
                     "-"
-                ))
-                return
-            
-            # Insert available exams into the tree
-            for exam in exams:
-                exam_id, title, duration, question_count = exam
-                self.exam_tree.insert('', 'end', values=(
-                    exam_id,
-                    title,
-                    duration,
-                    question_count,
-                    "Available"
-                ))
-        
-        except sqlite3.Error as e:
+                )]
+            else:
+                # Available exams, keyed by exam id
+                rows = [(exam_id, title, duration, question_count, "Time expired" if expired else "Available")
+                        for exam_id, title, duration, question_count, expired in exams]
+
+            sync_treeview(self.exam_tree, rows)
+
+        def show_error(e):
             messagebox.showerror("Database Error", f"Error loading exams: {str(e)}")
-        finally:
-            conn.close()
+
+        self.executor.submit(fetch, show, show_error)
 
 
     def show_results(self):
@@ -342,11 +375,11 @@ class StudentDashboard:
             return
             
         self.clear_content()
-        self.current_page = ttk.Frame(self.content_frame, style="Content.TFrame")
+        self.current_page = ttk.Frame(self.content_frame, style="StudentContent.TFrame")
         self.current_page.pack(fill='both', expand=True)
         
         # Header frame
-        header_frame = ttk.Frame(self.current_page, style="Content.TFrame")
+        header_frame = ttk.Frame(self.current_page, style="StudentContent.TFrame")
         header_frame.pack(fill='x', padx=20, pady=(20,10))
         
         # Title on the left
@@ -367,7 +400,7 @@ class StudentDashboard:
         ).pack(side='right', padx=10)
 
         # Create a frame for the results list
-        results_frame = ttk.Frame(self.current_page, style="Content.TFrame")
+        results_frame = ttk.Frame(self.current_page, style="StudentContent.TFrame")
         results_frame.pack(fill='both', expand=True, padx=20, pady=10)
 
         # Create Treeview with columns matching teacher dashboard
@@ -397,20 +430,10 @@ class StudentDashboard:
         scrollbar.pack(side='right', fill='y')
 
         # Fetch exam results from database
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
-        try:
-            cursor.execute("""
-                SELECT r.id, u.name, e.title, r.score, r.date
-                FROM results r
-                JOIN students s ON r.student_id = s.id
-                JOIN exams e ON r.exam_id = e.id
-                JOIN users u ON s.id = u.id  -- Join with users table to get the name
-                WHERE r.student_id = ?
-                ORDER BY r.date DESC
-            """, (self.student_id,))
-            
-            results = cursor.fetchall()
+        def fetch(conn):
+            return conn.execute(RESULTS_SQL, (self.student_id,)).fetchall()
+
+        def show(results):
             if results:
                 for result in results:
                     # Format the date to match the teacher dashboard
@@ -427,19 +450,19 @@ class StudentDashboard:
                     ))
             else:
                 self.results_tree.insert('', 'end', values=('--', 'No results available', '--', '--', '--'))
-                
-        except sqlite3.Error as e:
+
+        def show_error(e):
             print(f"Database error: {e}")
             messagebox.showerror("Error", "Failed to fetch results from database")
             self.results_tree.insert('', 'end', values=('--', 'Error loading results', '--', '--', '--'))
-        finally:
-            conn.close()
+
+        self.executor.submit(fetch, show, show_error)
 
     def refresh_results(self):
         for item in self.results_tree.get_children():
             self.results_tree.delete(item)
 
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
@@ -467,20 +490,20 @@ class StudentDashboard:
         except sqlite3.OperationalError:
             pass
         finally:
-            conn.close()
+            release_connection(conn)
 
     
     def show_profile(self):
         self.clear_content()
-        self.current_page = ttk.Frame(self.content_frame, style="Content.TFrame")
+        self.current_page = ttk.Frame(self.content_frame, style="StudentContent.TFrame")
         self.current_page.pack(fill='both', expand=True)
         
         # Create a main container for profile content
-        profile_container = ttk.Frame(self.current_page, style="Content.TFrame")
+        profile_container = ttk.Frame(self.current_page, style="StudentContent.TFrame")
         profile_container.pack(padx=50, pady=20, fill='both', expand=True)
         
         # Header
-        header_frame = ttk.Frame(profile_container, style="Content.TFrame")
+        header_frame = ttk.Frame(profile_container, style="StudentContent.TFrame")
         header_frame.pack(fill='x', pady=(0, 20))
         
         ttk.Label(header_frame,
@@ -496,7 +519,7 @@ class StudentDashboard:
                 command=self.edit_profile).pack(side='right')
         
         # Create two columns
-        columns_frame = ttk.Frame(profile_container, style="Content.TFrame")
+        columns_frame = ttk.Frame(profile_container, style="StudentContent.TFrame")
         columns_frame.pack(fill='both', expand=True)
         
         # Left column - Profile Picture
@@ -508,34 +531,23 @@ class StudentDashboard:
         pic_frame.pack(pady=20, padx=20)
         
         # Try to load and display profile picture
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
-        
-        # Fetch profile picture from `students` table based on logged-in user
-        cursor.execute("""
-            SELECT students.profile_pic 
-            FROM students 
-            JOIN users ON students.id = users.id
-            WHERE users.id = ?
-        """, (self.student_id,))
-        result = cursor.fetchone()
-        
-        if result and result[0]:
+        def load_thumbnail():
+            conn = get_connection()
             try:
-                image_data = io.BytesIO(result[0])
-                pil_image = Image.open(image_data)
-                target_size = (200, 200)
-                pil_image.thumbnail(target_size, Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(pil_image)
-                self.profile_photo = photo
-                image_label = ttk.Label(pic_frame, image=photo, background=self.colors['menu_bg'])
-                image_label.pack(padx=10, pady=10)
-            except Exception as e:
-                ttk.Label(pic_frame,
-                        text="👤",
-                        font=('Segoe UI', 48),
-                        foreground=self.colors['text'],
-                        background=self.colors['menu_bg']).pack(padx=40, pady=40)
+                row = conn.execute("SELECT thumbnail FROM profile_thumbnails WHERE student_id = ?",
+                                   (self.student_id,)).fetchone()
+            finally:
+                release_connection(conn)
+            return row[0] if row else None
+
+        try:
+            photo = self.photo_cache.get(self.student_id, load_thumbnail)
+        except Exception:
+            photo = None
+
+        if photo is not None:
+            image_label = ttk.Label(pic_frame, image=photo, background=self.colors['menu_bg'])
+            image_label.pack(padx=10, pady=10)
         else:
             ttk.Label(pic_frame,
                     text="👤",
@@ -543,8 +555,6 @@ class StudentDashboard:
                     foreground=self.colors['text'],
                     background=self.colors['menu_bg']).pack(padx=40, pady=40)
         
-        conn.close()
-        
         ttk.Button(left_column,
                 text="Upload Photo",
                 style="Custom.TButton",
@@ -555,7 +565,7 @@ class StudentDashboard:
         right_column.pack(side='left', fill='both', expand=True)
         
         # Fetch profile data
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         try:
             cursor.execute("""
@@ -604,7 +614,7 @@ class StudentDashboard:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
         finally:
-            conn.close()
+            release_connection(conn)
 
     
     def edit_profile(self):
@@ -623,7 +633,7 @@ class StudentDashboard:
         edit_window.geometry(f"{window_width}x{window_height}+{x}+{y}")
 
         # Main container
-        main_frame = ttk.Frame(edit_window, style="Content.TFrame")
+        main_frame = ttk.Frame(edit_window, style="StudentContent.TFrame")
         main_frame.pack(fill='both', expand=True, padx=20, pady=20)
 
         # Header
@@ -638,7 +648,7 @@ class StudentDashboard:
         form_frame.pack(fill='both', expand=True, padx=20, pady=20)
 
         # Get current profile data
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         try:
             cursor.execute("""
@@ -649,7 +659,7 @@ class StudentDashboard:
             """, (self.student_id,))
             student_info = cursor.fetchone()
         finally:
-            conn.close()
+            release_connection(conn)
 
         # Create form fields
         def create_field(label_text, row, default_value="", is_text_area=False):
@@ -679,7 +689,7 @@ class StudentDashboard:
 
         def save_changes():
             try:
-                conn = sqlite3.connect('exam_system.db')
+                conn = get_connection()
                 cursor = conn.cursor()
 
                 # Update the `users` table
@@ -708,7 +718,7 @@ class StudentDashboard:
                 ))
 
                 conn.commit()
-                conn.close()
+                release_connection(conn)
 
                 messagebox.showinfo("Success", "Profile updated successfully!")
                 edit_window.destroy()
@@ -717,7 +727,7 @@ class StudentDashboard:
                 messagebox.showerror("Error", f"Failed to update profile: {str(e)}")
 
         # Buttons
-        button_frame = ttk.Frame(main_frame, style="Content.TFrame")
+        button_frame = ttk.Frame(main_frame, style="StudentContent.TFrame")
         button_frame.pack(fill='x', pady=(10, 0), anchor='n')  # Adjust padding for better positioning
 
         # Add buttons with proper alignment
@@ -741,22 +751,20 @@ class StudentDashboard:
         
         if file_path:
             try:
-                # Open and resize image before saving
-                with Image.open(file_path) as img:
-                    # Resize image while maintaining aspect ratio
-                    img.thumbnail((800, 800), Image.Resampling.LANCZOS)
-                    
-                    # Convert image to bytes
-                    img_byte_arr = io.BytesIO()
-                    img.save(img_byte_arr, format=img.format)
-                    img_byte_arr = img_byte_arr.getvalue()
+                # Scaled to at most 800x800, plus the thumbnail the profile page shows
+                picture, thumbnail = prepare_upload(file_path)
                 
-                conn = sqlite3.connect('exam_system.db')
-                cursor = conn.cursor()
-                cursor.execute("UPDATE students SET profile_pic=? WHERE id=?",
-                             (img_byte_arr, self.student_id))
-                conn.commit()
-                conn.close()
+                conn = get_connection()
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("UPDATE students SET profile_image=? WHERE id=?",
+                                 (store_image(conn, picture), self.student_id))
+                    cursor.execute("INSERT OR REPLACE INTO profile_thumbnails VALUES (?, ?)",
+                                 (self.student_id, thumbnail))
+                    conn.commit()
+                finally:
+                    release_connection(conn)
+                self.photo_cache.invalidate(self.student_id)
                 
                 messagebox.showinfo("Success", "Profile picture updated successfully!")
                 self.show_profile()  # Refresh the profile view
@@ -767,21 +775,21 @@ class StudentDashboard:
         for item in self.exam_tree.get_children():
             self.exam_tree.delete(item)
 
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
             # Get exams that student hasn't taken yet
             cursor.execute("""
                 SELECT 
-                    id,
-                    title,
-                    subject,
-                    duration
-                FROM exams 
-                WHERE id NOT IN (
-                    SELECT exam_id FROM results WHERE student_id = ?
-                )
+                    e.id,
+                    e.title,
+                    s.subject_name,
+                    e.duration
+                FROM exams e
+                LEFT JOIN subjects s ON e.subject_id = s.id
+                LEFT JOIN results r ON r.exam_id = e.id AND r.student_id = ?
+                WHERE r.id IS NULL
             """, (self.student_id,))
             
             for exam in cursor.fetchall():
@@ -789,23 +797,23 @@ class StudentDashboard:
         except sqlite3.OperationalError:
             pass
         finally:
-            conn.close()
+            release_connection(conn)
 
     
     def refresh_timeline(self):
         for item in self.timeline.get_children():
             self.timeline.delete(item)
 
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
 
         try:
             cursor.execute("""
-                SELECT e.date, e.subject, e.title, e.duration
-                FROM exams e
-                WHERE e.id IN (
-                    SELECT exam_id FROM results WHERE student_id = ?
-                )
+                SELECT r.date, s.subject_name, e.title, e.duration
+                FROM results r
+                JOIN exams e ON r.exam_id = e.id
+                LEFT JOIN subjects s ON e.subject_id = s.id
+                WHERE r.student_id = ?
             """, (self.student_id,))
 
             for exam in cursor.fetchall():
@@ -813,7 +821,7 @@ class StudentDashboard:
         except sqlite3.OperationalError:
             pass
         finally:
-            conn.close()
+            release_connection(conn)
     
     def start_exam(self):
         """Initialize and start the exam"""
@@ -825,98 +833,72 @@ class StudentDashboard:
         self.exam_id = self.exam_tree.item(selection[0])['values'][0]  # Set exam_id from selection
         
         # Load exam questions
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         
         try:
-            # Get exam details
-            cursor.execute("SELECT title, duration FROM exams WHERE id = ?", (self.exam_id,))
-            exam_info = cursor.fetchone()
+            # Exam details and questions normally come from the prefetch, as
+            # long as it is recent enough to reflect teachers' edits
+            exam_info = self.question_cache.get(self.exam_id, QUESTION_CACHE_MAX_AGE)
+            if exam_info is None:
+                self.question_cache.load(conn, [self.exam_id])
+                exam_info = self.question_cache.get(self.exam_id)
             
             if not exam_info:
                 messagebox.showerror("Error", "Exam not found")
                 return
                 
-            self.exam_title = exam_info[0]
-            self.duration = exam_info[1]
-            
-            # Get questions
-            cursor.execute("""
-                SELECT id, question, option_a, option_b, option_c, option_d, correct_answer
-                FROM questions
-                WHERE exam_id = ?
-                ORDER BY RANDOM()
-            """, (self.exam_id,))
+            self.exam_title, self.duration, questions = exam_info
             
-            self.questions = cursor.fetchall()
+            # Each student gets their own reproducible question order
+            self.questions = shuffle_questions(questions, self.student_id, self.exam_id)
             
             if not self.questions:
                 messagebox.showwarning("No Questions", "This exam has no questions yet.")
                 return
             
+            # The first start sets the deadline; starting again never moves it
+            cursor.execute("""
+                INSERT OR IGNORE INTO exam_attempts (student_id, exam_id, started_at, deadline)
+                VALUES (?, ?, strftime('%Y-%m-%d %H:%M:%f', 'now'), strftime('%Y-%m-%d %H:%M:%f', 'now', ?))
+            """, (self.student_id, self.exam_id, f"+{self.duration} minutes"))
+            cursor.execute("""
+                SELECT (julianday(deadline) - julianday('now')) * 86400
+                FROM exam_attempts
+                WHERE student_id = ? AND exam_id = ?
+            """, (self.student_id, self.exam_id))
+            remaining = cursor.fetchone()[0]
+            conn.commit()
+            if remaining <= -SUBMIT_GRACE_SECONDS:
+                messagebox.showerror(
+                    "Time Limit Exceeded",
+                    "The time for this exam ran out before it was submitted, so it cannot be taken again."
+                )
+                return
+            self.deadline = time.monotonic() + remaining
+            
+            self.answers = {}
+            self.exam_score = None
+            self.open_journal()
+            
             # Set up exam UI
             self.setup_exam_ui()
             
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Error loading exam: {str(e)}")
         finally:
-            conn.close()
+            release_connection(conn)
             
-    def load_questions(self):
-        try:
-            conn = sqlite3.connect('exam_system.db', timeout=20)
-            cursor = conn.cursor()
-            
-            # Get exam details
-            cursor.execute("""
-                SELECT title, duration 
-                FROM exams 
-                WHERE id = ?
-            """, (self.exam_id,))
-            
-            exam_info = cursor.fetchone()
-            if not exam_info:
-                messagebox.showerror("Error", "Exam not found")
-                conn.close()
-                return False
-                
-            self.exam_title = exam_info[0]
-            self.duration = exam_info[1]
-            self.remaining_time = self.duration * 60  # Convert to seconds
-            
-            # Get questions
-            cursor.execute("""
-                SELECT id, question, option_a, option_b, option_c, option_d, correct_answer
-                FROM questions
-                WHERE exam_id = ?
-                ORDER BY RANDOM()
-            """, (self.exam_id,))
-            
-            self.questions = cursor.fetchall()
-            conn.close()
-            
-            if not self.questions:
-                messagebox.showinfo("No Questions", "This exam has no questions yet.")
-                return False
-                
-            return True
-            
-        except sqlite3.Error as e:
-            messagebox.showerror("Database Error", f"Error loading questions: {str(e)}")
-            if 'conn' in locals():
-                conn.close()
-            return False
-
     def setup_exam_ui(self):
         # Clear current content
         self.clear_content()
         
         # Create exam container
-        exam_container = ttk.Frame(self.content_frame, style="Content.TFrame")
+        exam_container = ttk.Frame(self.content_frame, style="StudentContent.TFrame")
         exam_container.pack(fill='both', expand=True, padx=30, pady=20)
         
         # Header with exam title and timer
-        header_frame = ttk.Frame(exam_container, style="Content.TFrame")
+        header_frame = ttk.Frame(exam_container, style="StudentContent.TFrame")
         header_frame.pack(fill='x', pady=(0, 20))
         
         ttk.Label(
@@ -958,8 +940,24 @@ class StudentDashboard:
         # Radio variable for options
         self.selected_option = tk.StringVar()
         
+        # Option buttons are built once; show_question only changes their text
+        self.option_buttons = []
+        for opt_letter in OPTION_LETTERS:
+            option_frame = ttk.Frame(self.options_frame, style="Card.TFrame")
+            option_frame.pack(fill='x', pady=5)
+            
+            radio_btn = ttk.Radiobutton(
+                option_frame,
+                variable=self.selected_option,
+                value=opt_letter,
+                style="Custom.TRadiobutton",
+                command=self.save_answer
+            )
+            radio_btn.pack(pady=5, padx=10, anchor='w')
+            self.option_buttons.append(radio_btn)
+        
         # Navigation buttons
-        nav_frame = ttk.Frame(exam_container, style="Content.TFrame")
+        nav_frame = ttk.Frame(exam_container, style="StudentContent.TFrame")
         nav_frame.pack(fill='x', pady=20)
         
         self.prev_btn = ttk.Button(
@@ -994,30 +992,34 @@ class StudentDashboard:
 
     def start_timer(self):
         """Start the exam timer"""
-        if not self.timer_active:
-            self.remaining_time = self.duration * 60  # Convert minutes to seconds
-            self.timer_active = True
-            self.update_timer()
+        if self.timer_id is not None:
+            self.root.after_cancel(self.timer_id)
+        self.timer_active = True
+        self.update_timer()
 
     def update_timer(self):
         """Update the timer display"""
+        self.timer_id = None
         if not hasattr(self, 'timer_label') or not self.timer_label.winfo_exists():
             self.timer_active = False
             return
-            
-        if self.timer_active and self.remaining_time > 0:
-            minutes = self.remaining_time // 60
-            seconds = self.remaining_time % 60
-            try:
-                self.timer_label.config(text=f"Time Remaining: {minutes:02d}:{seconds:02d}")
-                self.remaining_time -= 1
-                self.root.after(1000, self.update_timer)
-            except Exception:
-                self.timer_active = False
-        elif self.remaining_time <= 0:
+        if not self.timer_active:
+            return
+        
+        # Always derived from the deadline, so late callbacks never add time
+        remaining = self.deadline - time.monotonic()
+        if remaining > 0:
+            shown = math.ceil(remaining)
+            minutes, seconds = divmod(shown, 60)
+            text = f"Time Remaining: {minutes:02d}:{seconds:02d}"
+            if self.timer_label.cget('text') != text:
+                self.timer_label.config(text=text)
+            # Wake up just after the displayed second changes
+            delay = int((remaining - (shown - 1)) * 1000) + 1
+            self.timer_id = self.root.after(delay, self.update_timer)
+        else:
             self.timer_active = False
-            messagebox.showwarning("Time's Up!", "Your time is up! Submitting exam...")
-            self.submit_exam()
+            self.submit_exam(timed_out=True)
 
 
     def show_question(self, index):
@@ -1031,34 +1033,14 @@ class StudentDashboard:
                 text=f"Question {index + 1} of {len(self.questions)}\n\n{question[1]}"
             )
             
-            # Clear previous options
-            for widget in self.options_frame.winfo_children():
-                widget.destroy()
-            
-            # Create new option buttons
-            options = [
-                ('A', question[2]),
-                ('B', question[3]),
-                ('C', question[4]),
-                ('D', question[5])
-            ]
-            
-            for opt_letter, opt_text in options:
-                option_frame = ttk.Frame(self.options_frame, style="Card.TFrame")
-                option_frame.pack(fill='x', pady=5)
-                
-                radio_btn = ttk.Radiobutton(
-                    option_frame,
-                    text=f"{opt_letter}. {opt_text}",
-                    variable=self.selected_option,
-                    value=opt_letter,
-                    style="Custom.TRadiobutton"
-                )
-                radio_btn.pack(pady=5, padx=10, anchor='w')
+            # Reuse the option buttons, only their text changes
+            for radio_btn, opt_letter, opt_text in zip(self.option_buttons, OPTION_LETTERS, question[2:6]):
+                radio_btn.config(text=f"{opt_letter}. {opt_text}")
             
             # Set previously selected answer if any
-            if index in self.answers:
-                self.selected_option.set(self.answers[index])
+            question_id = str(question[0])
+            if question_id in self.answers:
+                self.selected_option.set(self.answers[question_id])
             else:
                 self.selected_option.set('')
             
@@ -1082,11 +1064,11 @@ class StudentDashboard:
         self.clear_content()
         
         # Main review container with proper styling
-        review_container = ttk.Frame(self.content_frame, style="Content.TFrame")
+        review_container = ttk.Frame(self.content_frame, style="StudentContent.TFrame")
         review_container.pack(fill='both', expand=True, padx=30, pady=20)
         
         # Header with title
-        header_frame = ttk.Frame(review_container, style="Content.TFrame")
+        header_frame = ttk.Frame(review_container, style="StudentContent.TFrame")
         header_frame.pack(fill='x', pady=(0, 20))
         
         ttk.Label(
@@ -1101,21 +1083,13 @@ class StudentDashboard:
         summary_frame = ttk.Frame(review_container, style="Card.TFrame")
         summary_frame.pack(fill='x', pady=(0, 20))
         
-        total = len(self.questions)
-        answered = len(self.answers)
+        # Reuse the result computed on submission
+        result = self.exam_score
+        total = len(self.answer_key)
+        answered = result.answered_count
         unanswered = total - answered
-        
-        # Count correct and incorrect answers
-        correct_answers = 0
-        incorrect_answers = 0
-        for question in self.questions:
-            question_id = str(question[0])
-            correct_answer = question[-1]
-            student_answer = self.answers.get(question_id, "Not answered")
-            if student_answer == correct_answer:
-                correct_answers += 1
-            elif student_answer != "Not answered":
-                incorrect_answers += 1
+        correct_answers = result.correct_count
+        incorrect_answers = result.incorrect_count
         
         # Summary statistics with improved layout
         stats_frame = ttk.Frame(summary_frame, style="Card.TFrame")
@@ -1162,7 +1136,7 @@ class StudentDashboard:
         ).pack(side='left', padx=20)
         
         # Split frame for correct and incorrect answers
-        split_frame = ttk.Frame(review_container, style="Content.TFrame")
+        split_frame = ttk.Frame(review_container, style="StudentContent.TFrame")
         split_frame.pack(fill='both', expand=True, pady=10)
         
         # Correct answers section
@@ -1202,13 +1176,21 @@ class StudentDashboard:
         ttk.Label(incorrect_frame, text="Incorrect Answers", style="Title.TLabel").pack(pady=10)
         
         # Add questions to correct or incorrect frames
+        # The key is in question id order, the questions in the order shown
+        columns = {question_id: column for column, question_id in enumerate(self.answer_key.question_ids)}
         for i, question in enumerate(self.questions, 1):
-            is_answered = str(question[0]) in self.answers
-            student_answer = self.answers.get(str(question[0]), "Not answered")
-            correct_answer = question[-1]
+            column = columns.get(question[0])
+            if column is None:
+                # Removed from the exam since it started, so not scored
+                continue
+            is_answered = bool(result.answered[column])
+            is_correct = bool(result.correct[column])
+            student_answer = self.answers.get(str(question[0])) if is_answered else "Not answered"
+            correct_code = int(self.answer_key.correct[column])
+            correct_answer = OPTION_LETTERS[correct_code] if 0 <= correct_code < len(OPTION_LETTERS) else question[6]
             options = {'A': question[2], 'B': question[3], 'C': question[4], 'D': question[5]}
             
-            q_frame = ttk.Frame(correct_frame if student_answer == correct_answer else incorrect_frame, style="Card.TFrame")
+            q_frame = ttk.Frame(correct_frame if is_correct else incorrect_frame, style="Card.TFrame")
             q_frame.pack(fill='x', pady=10, padx=20)
             
             # Question header with status
@@ -1241,11 +1223,11 @@ class StudentDashboard:
                 q_frame,
                 text=answer_text,
                 font=('Segoe UI', 11),
-                foreground=self.colors['success'] if student_answer == correct_answer else self.colors['error'],
+                foreground=self.colors['success'] if is_correct else self.colors['error'],
                 background=self.colors['menu_bg']
             ).pack(anchor='w', pady=5)
             
-            if student_answer != correct_answer:
+            if not is_correct:
                 ttk.Label(
                     q_frame,
                     text=correct_text,
@@ -1255,7 +1237,7 @@ class StudentDashboard:
                 ).pack(anchor='w', pady=5)
         
         # Buttons frame with improved styling
-        button_frame = ttk.Frame(review_container, style="Content.TFrame")
+        button_frame = ttk.Frame(review_container, style="StudentContent.TFrame")
         button_frame.pack(fill='x', pady=20)
         
         # Warning message for unanswered questions
@@ -1269,7 +1251,7 @@ class StudentDashboard:
             ).pack(pady=(0, 10))
         
         # Action buttons
-        buttons_container = ttk.Frame(button_frame, style="Content.TFrame")
+        buttons_container = ttk.Frame(button_frame, style="StudentContent.TFrame")
         buttons_container.pack()
 
         ttk.Button(
@@ -1278,50 +1260,56 @@ class StudentDashboard:
             style="Custom.TButton",
             command=self.show_available_exams
         ).pack(side='left', padx=10)
-        
-        # Style configurations for success and error frames
-        self.style.configure("SuccessCard.TFrame", background=self.colors['menu_bg'], borderwidth=2, relief="solid", bordercolor=self.colors['success'])
-        self.style.configure("ErrorCard.TFrame", background=self.colors['menu_bg'], borderwidth=2, relief="solid", bordercolor=self.colors['error'])
 
-    def submit_exam(self):
-        self.save_answer()
+
+    def submit_exam(self, timed_out=False):
         """Submit the exam and calculate results"""
-        if not messagebox.askyesno("Confirm Submission", "Are you sure you want to submit the exam?"):
-            return
+        self.save_answer()
+        if not timed_out:
+            if not messagebox.askyesno("Confirm Submission", "Are you sure you want to submit the exam?"):
+                return
+            # Time may have run out, and the exam been submitted, while the dialog was open
+            if not self.timer_active:
+                return
         
         # Stop the timer
         self.timer_active = False
         
-        # Calculate score based on correct answers
-        total_questions = len(self.questions)
-        correct_answers = 0
-        
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         
         try:
-            # Compare student's answers with correct answers from questions table
-            for question in self.questions:
-                question_id = question[0]
-                correct_answer = question[-1]  # Assuming correct_answer is stored as a letter ('A', 'B', 'C', 'D')
-                student_answer = self.answers.get(str(question_id))  # Get student's answer
-                # Count as correct only if student's answer matches the correct answer
-                if student_answer and student_answer == correct_answer:
-                    correct_answers += 1
+            # Score the questions the student was shown, with their current
+            # correct answers and marks, so a key corrected while the exam
+            # was open counts but a question added meanwhile does not; the
+            # percentage is weighted by each question's marks
+            self.answer_key = AnswerKey.for_exam(conn, self.exam_id,
+                                                 [question[0] for question in self.questions])
+            self.exam_score = self.answer_key.score(self.answers)
+            score = self.exam_score.percentage
             
-            # Calculate percentage score
-            score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
-
-            # Get total marks for the exam
-            cursor.execute("SELECT total_marks FROM exams WHERE id = ?", (self.exam_id,))
-            total_marks = cursor.fetchone()[0]
-            # Save results to database
+            # Save results to database, but only while the stored deadline
+            # (plus a little grace) has not passed
+            cursor.execute(SUBMIT_RESULT_SQL, (self.student_id, self.exam_id, score,
+                                               self.student_id, self.exam_id, SUBMIT_GRACE_SECONDS))
+            if cursor.rowcount == 0:
+                conn.rollback()
+                messagebox.showerror("Time Limit Exceeded",
+                                     "This submission arrived after the exam deadline and was not recorded. The exam cannot be taken again.")
+                self.close_journal(discard=True)
+                self.show_available_exams()
+                return
+            # Keep every answer so the result can be re-graded if the key changes
             cursor.execute("""
-                INSERT INTO results (student_id, exam_id, score, date)
-                VALUES (?, ?, ?, datetime('now'))
-            """, (self.student_id, self.exam_id, score))
+                INSERT INTO result_answers (result_id, question_ids, answers)
+                VALUES (?, ?, ?)
+            """, (cursor.lastrowid, *answer_sheet(self.answer_key, self.exam_score)))
             
             conn.commit()
+            # The attempt is safely stored; its autosave journal is no longer needed
+            self.close_journal(discard=True)
+            if timed_out:
+                messagebox.showwarning("Time's Up!", "Your time is up! The exam has been submitted.")
             
             # Show results page
             self.show_result_page(score)
@@ -1330,14 +1318,14 @@ class StudentDashboard:
             messagebox.showerror("Error", f"Failed to submit exam: {str(e)}")
             conn.rollback()
         finally:
-            conn.close()
+            release_connection(conn)
 
     def show_result_page(self, score):
         """Display the final exam results"""
         self.clear_content()
         
         # Results container
-        results_container = ttk.Frame(self.content_frame, style="Content.TFrame")
+        results_container = ttk.Frame(self.content_frame, style="StudentContent.TFrame")
         results_container.pack(fill='both', expand=True, padx=30, pady=20)
         
         # Congratulations header
@@ -1397,11 +1385,41 @@ class StudentDashboard:
 
     def save_answer(self):
         """Save the current answer to the answers dictionary"""
-        current_q_id = self.questions[self.current_question][0]
-        self.answers[str(current_q_id)] = self.selected_option.get()
+        current_q_id = str(self.questions[self.current_question][0])
+        answer = self.selected_option.get()
+        if self.answers.get(current_q_id, '') != answer:
+            self.answers[current_q_id] = answer
+            if self.journal is not None:
+                self.journal.record(current_q_id, answer)
+
+    def open_journal(self):
+        """Start autosaving answers, offering to resume an unfinished attempt"""
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = AnswerJournal.for_attempt(self.student_id, self.exam_id)
+        question_ids = {str(question[0]) for question in self.questions}
+        saved = {question_id: answer for question_id, answer in self.journal.load().items()
+                 if question_id in question_ids and answer}
+        if saved:
+            if messagebox.askyesno(
+                "Resume Exam",
+                f"{len(saved)} answer(s) were saved from an unfinished attempt at this exam. Resume where you left off?"
+            ):
+                self.answers = saved
+            else:
+                self.journal.close(discard=True)
+                self.journal.load()
+                saved = None
+        self.journal.start()
+        return bool(saved)
+
+    def close_journal(self, discard=False):
+        if self.journal is not None:
+            self.journal.close(discard)
+            self.journal = None
 
     def generate_progress_report(self):
-        conn = sqlite3.connect('exam_system.db')
+        conn = get_connection()
         cursor = conn.cursor()
         
         try:
@@ -1427,6 +1445,9 @@ class StudentDashboard:
             if not results:
                 messagebox.showinfo("Info", "No results available to generate report.")
                 return
+            
+            # Totals are kept up to date in student_stats
+            summary = student_summary(conn, self.student_id)
                 
             # Ask user where to save the PDF
             file_path = filedialog.asksaveasfilename(
@@ -1438,121 +1459,7 @@ class StudentDashboard:
             if not file_path:
                 return
                 
-            # Create the PDF document
-            doc = SimpleDocTemplate(
-                file_path,
-                pagesize=A4,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=72
-            )
-            
-            # Prepare the elements list
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30,
-                alignment=1  # Center alignment
-            )
-            
-            heading_style = ParagraphStyle(
-                'Heading2',
-                parent=styles['Heading2'],
-                fontSize=14,
-                spaceBefore=20,
-                spaceAfter=10
-            )
-            
-            normal_style = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                fontSize=11,
-                spaceBefore=6,
-                spaceAfter=6
-            )
-            
-            # Add header
-            elements.append(Paragraph("Student Progress Report", title_style))
-            elements.append(Spacer(1, 20))
-            
-            # Add student information
-            elements.append(Paragraph("Student Information", heading_style))
-            elements.append(Paragraph(f"Name: {student_info[0]}", normal_style))
-            elements.append(Paragraph(f"Class: {student_info[1]}", normal_style))
-            if student_info[2]:  # If email exists
-                elements.append(Paragraph(f"Email: {student_info[2]}", normal_style))
-            elements.append(Paragraph(f"Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", normal_style))
-            
-            elements.append(Spacer(1, 20))
-            
-            # Add performance summary
-            elements.append(Paragraph("Performance Summary", heading_style))
-            
-            # Calculate basic statistics
-            total_exams = len(results)
-            average_score = sum(result[1] for result in results) / total_exams if total_exams > 0 else 0
-            
-            # Add summary statistics
-            elements.append(Paragraph(f"Total Exams Taken: {total_exams}", normal_style))
-            elements.append(Paragraph(f"Average Score: {average_score:.2f}", normal_style))
-            
-            # Create exam results table
-            elements.append(Paragraph("Detailed Exam Results", heading_style))
-            
-            # Table header
-            table_data = [['Exam Title', 'Score', 'Date']]
-            
-            # Add exam data
-            for result in results:
-                date = datetime.strptime(result[2], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d %H:%M')
-                table_data.append([
-                    result[0],  # Exam title
-                    str(result[1]),  # Score
-                    date  # Formatted date
-                ])
-            
-            # Create and style the table
-            table = Table(table_data, colWidths=[250, 100, 150])
-            table.setStyle(TableStyle([
-                # Header style
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1B2B65')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                # Data style
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                # Alternating row colors
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')])
-            ]))
-            
-            elements.append(table)
-            
-            # Add performance analysis
-            elements.append(Paragraph("Performance Analysis", heading_style))
-            
-            # Calculate and add performance metrics
-            highest_score = max(result[1] for result in results)
-            lowest_score = min(result[1] for result in results)
-            
-            elements.append(Paragraph(f"Highest Score: {highest_score}", normal_style))
-            elements.append(Paragraph(f"Lowest Score: {lowest_score}", normal_style))
-            elements.append(Paragraph(f"Average Score: {average_score:.2f}", normal_style))
-            
-            # Build the PDF
-            doc.build(elements)
+            build_progress_report(file_path, student_info, results, summary)
             messagebox.showinfo("Success", "Progress report has been generated successfully!")
             
         except sqlite3.Error as e:
@@ -1562,69 +1469,15 @@ class StudentDashboard:
             print(f"Error generating report: {e}")
             messagebox.showerror("Error", f"Failed to generate progress report: {str(e)}")
         finally:
-            conn.close()
+            release_connection(conn)
 
 
     def logout(self):
         if messagebox.askyesno("Confirm Logout", "Are you sure you want to logout?"):
-            self.root.destroy()
-            # Create new main window
-            root = tk.Tk()
-            from main import UserTypeSelection
-            UserTypeSelection(root)
-            root.mainloop()
-
-    def init_database(self):
-        conn = sqlite3.connect('exam_system.db')
-        cursor = conn.cursor()
-        
-        # Create users table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL, -- Encrypted password
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                role TEXT CHECK(role IN ('Admin', 'Teacher', 'Student')) NOT NULL
-            )
-        ''')
-
-        # Create students table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY,
-                class TEXT NOT NULL,
-                phone TEXT,
-                profile_pic BLOB,
-                bio TEXT,
-                FOREIGN KEY (id) REFERENCES users (id) ON DELETE CASCADE
-            )
-        ''')
-
-        # Create exams table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS exams (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                subject TEXT NOT NULL,
-                duration INTEGER NOT NULL,
-                total_marks INTEGER NOT NULL
-            )
-        ''')
-
-        # Create results table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER,
-                exam_id INTEGER,
-                score INTEGER,
-                date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students(id),
-                FOREIGN KEY (exam_id) REFERENCES exams(id)
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
+            self.executor.shutdown()
+            # An unfinished exam keeps its journal so it can be resumed
+            self.close_journal()
+            if self.timer_id is not None:
+                self.root.after_cancel(self.timer_id)
+                self.timer_id = None
+            self.session.logout()
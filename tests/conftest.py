@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Set before anything imports database, so no test can reach the tracked
+# exam_system.db or write journals next to it
+_SCRATCH = tempfile.mkdtemp(prefix='exam-tests-')
+os.environ['EXAM_DB_PATH'] = os.path.join(_SCRATCH, 'unused.db')
+os.environ['EXAM_JOURNAL_DIR'] = os.path.join(_SCRATCH, 'answer_journals')
+
+import database  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A fresh, fully migrated database that the connection pool points at."""
+    path = str(tmp_path / 'exam.db')
+    previous = database.DB_PATH
+    database.set_database_path(path)
+    database.configure_database()
+    database.create_database()
+    yield path
+    database.set_database_path(previous)
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = database.get_connection()
+    yield conn
+    database.release_connection(conn)
+
+
+def add_exam(conn, title='Exam', questions=(), duration=30):
+    """Insert an exam (and its subject) with ``questions`` given as
+    (correct_answer, marks) pairs; returns (exam_id, question_ids)."""
+    subject_id = conn.execute("INSERT INTO subjects (subject_name) VALUES (?)", (f"{title} subject",)).lastrowid
+    exam_id = conn.execute("INSERT INTO exams (title, subject_id, duration) VALUES (?, ?, ?)",
+                           (title, subject_id, duration)).lastrowid
+    question_ids = []
+    for number, (correct, marks) in enumerate(questions, start=1):
+        question_ids.append(conn.execute("""
+            INSERT INTO questions (exam_id, question, option_a, option_b, option_c, option_d,
+                                   correct_answer, marks)
+            VALUES (?, ?, 'a', 'b', 'c', 'd', ?, ?)
+        """, (exam_id, f"{title} question {number}", correct, marks)).lastrowid)
+    conn.commit()
+    return exam_id, question_ids
+
+
+def add_student(conn, username, class_name='10A'):
+    student_id = conn.execute("""
+        INSERT INTO users (username, password, name, email, role)
+        VALUES (?, 'x', ?, ?, 'Student')
+    """, (username, username.title(), f"{username}@example.com")).lastrowid
+    conn.execute("INSERT INTO students (id, class) VALUES (?, ?)", (student_id, class_name))
+    conn.commit()
+    return student_id
+
+
+@pytest.fixture
+def tk_root():
+    """A hidden Tk root; the test is skipped where there is no display."""
+    import tkinter
+
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        pytest.skip("no display available")
+    root.withdraw()
+    yield root
+    root.destroy()
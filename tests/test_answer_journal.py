@@ -0,0 +1,64 @@
+import os
+import time
+
+import answer_journal
+from answer_journal import AnswerJournal
+
+
+def test_replay_keeps_last_answer(tmp_path):
+    journal = AnswerJournal(str(tmp_path / 'attempt.log'))
+    assert journal.load() == {}
+    journal.start()
+    for question_id, answer in [(1, 'A'), (2, 'B'), (1, 'C'), (3, '')]:
+        journal.record(question_id, answer)
+    journal.close()
+
+    assert AnswerJournal(journal.path).load() == {'1': 'C', '2': 'B', '3': ''}
+
+
+def test_replay_ignores_torn_and_malformed_lines(tmp_path):
+    path = tmp_path / 'attempt.log'
+    path.write_text("1\tA\nnot a record\n2\tB\n3\tC", encoding='utf-8')
+    assert AnswerJournal(str(path)).load() == {'1': 'A', '2': 'B'}
+
+
+def test_journal_compacts_when_it_grows(tmp_path, monkeypatch):
+    monkeypatch.setattr(answer_journal, 'COMPACT_MIN_RECORDS', 8)
+    monkeypatch.setattr(answer_journal, 'BATCH_WINDOW', 0)
+    path = tmp_path / 'attempt.log'
+    journal = AnswerJournal(str(path))
+    journal.load()
+    journal.start()
+    expected = {}
+    for i in range(40):
+        journal.record(i % 3, 'ABCD'[i % 4])
+        expected[str(i % 3)] = 'ABCD'[i % 4]
+        # Let each answer go out in its own batch
+        time.sleep(0.005)
+    journal.close()
+
+    assert AnswerJournal(str(path)).load() == expected
+    # Compacted along the way, so well short of the 40 records written
+    assert len(path.read_text(encoding='utf-8').splitlines()) < 12 + 3
+    assert not (tmp_path / 'attempt.log.tmp').exists()
+
+
+def test_compaction_on_reopen(tmp_path, monkeypatch):
+    monkeypatch.setattr(answer_journal, 'COMPACT_MIN_RECORDS', 8)
+    path = tmp_path / 'attempt.log'
+    path.write_text(''.join(f"{i % 2}\t{'AB'[i % 2]}\n" for i in range(20)), encoding='utf-8')
+    journal = AnswerJournal(str(path))
+    assert journal.load() == {'0': 'A', '1': 'B'}
+    journal.start()
+    journal.close()
+    assert path.read_text(encoding='utf-8') == "0\tA\n1\tB\n"
+
+
+def test_close_discard_removes_file():
+    journal = AnswerJournal.for_attempt(7, 9)
+    journal.load()
+    journal.start()
+    journal.record(1, 'A')
+    assert os.path.dirname(journal.path) == answer_journal.JOURNAL_DIR
+    journal.close(discard=True)
+    assert not os.path.exists(journal.path)
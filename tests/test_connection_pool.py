@@ -0,0 +1,41 @@
+import sqlite3
+
+import pytest
+
+import database
+
+
+def database_file(conn):
+    return conn.execute("PRAGMA database_list").fetchone()[2]
+
+
+def test_connections_are_reused(db_path):
+    conn = database.get_connection()
+    database.release_connection(conn)
+    assert database.get_connection() is conn
+    database.release_connection(conn)
+
+
+def test_no_connection_to_the_old_file_after_switching(db_path, tmp_path):
+    idle = database.get_connection()
+    busy = database.get_connection()
+    database.release_connection(idle)
+
+    other = str(tmp_path / 'other.db')
+    database.set_database_path(other)
+    try:
+        # Still in use while the path changed; closed instead of pooled
+        database.release_connection(busy)
+        conn = database.get_connection()
+        assert conn is not idle and conn is not busy
+        assert database_file(conn) == other
+        database.release_connection(conn)
+    finally:
+        database.set_database_path(db_path)
+
+    conn = database.get_connection()
+    assert database_file(conn) == db_path
+    database.release_connection(conn)
+    for closed in (idle, busy):
+        with pytest.raises(sqlite3.ProgrammingError):
+            closed.execute("SELECT 1")
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from conftest import add_exam, add_student
+from item_analysis import ItemAnalysis, ItemAnalysisCache
+from scoring import AnswerKey, answer_sheet
+
+# Five submissions of a three-question exam, 1 = answered correctly
+CORRECT = np.array([
+    [1, 1, 1],
+    [1, 1, 0],
+    [1, 0, 0],
+    [0, 1, 0],
+    [0, 0, 0],
+], dtype=bool)
+
+
+def chosen_for(correct, key=(0, 1, 2, 3)):
+    # Right answers pick the key's option, wrong ones the next option along
+    key = np.array(key[:correct.shape[1]], dtype=np.int8)
+    return np.where(correct, key, (key + 1) % 4).astype(np.int8)
+
+
+def test_known_matrix():
+    analysis = ItemAnalysis([1, 2, 3], CORRECT, chosen_for(CORRECT))
+
+    assert analysis.attempts == 5
+    assert analysis.responses.tolist() == [5, 5, 5]
+    assert analysis.difficulty.tolist() == pytest.approx([0.6, 0.6, 0.2])
+    # Item-rest point-biserial; question 1 worked by hand: 0.6 / sqrt(1.2 * 2.8)
+    assert analysis.discrimination[0] == pytest.approx(0.6 / np.sqrt(1.2 * 2.8))
+    totals = CORRECT.sum(axis=1)
+    for i in range(3):
+        rest = totals - CORRECT[:, i]
+        assert analysis.discrimination[i] == pytest.approx(np.corrcoef(CORRECT[:, i], rest)[0, 1])
+    # KR-20 = 3/2 * (1 - sum(pq) / var(total)) = 1.5 * (1 - 0.64 / 1.04)
+    assert analysis.kr20 == pytest.approx(1.5 * (1 - 0.64 / 1.04))
+    assert analysis.option_rates[0].tolist() == pytest.approx([0.6, 0.4, 0, 0, 0])
+
+
+def test_question_missing_from_older_sheets():
+    # A fourth question added after the first three submissions
+    correct = np.column_stack([CORRECT, [False, False, False, True, False]])
+    present = np.ones(correct.shape, dtype=bool)
+    present[:3, 3] = False
+    chosen = chosen_for(correct)
+    chosen[:3, 3] = -1
+    analysis = ItemAnalysis([1, 2, 3, 4], correct, chosen, present)
+
+    assert analysis.responses.tolist() == [5, 5, 5, 2]
+    # 1 of the 2 sheets that had it, not 1 of 5
+    assert analysis.difficulty[3] == pytest.approx(0.5)
+    assert analysis.discrimination[3] == pytest.approx(1.0)
+    assert analysis.option_rates[3].tolist() == pytest.approx([0.5, 0, 0, 0.5, 0])
+    # The first three questions are unaffected
+    assert analysis.difficulty[:3].tolist() == pytest.approx([0.6, 0.6, 0.2])
+    # Reliability only over the sheets that had every question
+    assert analysis.kr20 == pytest.approx(ItemAnalysis([1, 2, 3, 4], correct[3:], chosen[3:]).kr20)
+
+
+def test_no_submissions():
+    analysis = ItemAnalysis([1, 2], np.zeros((0, 2), dtype=bool), np.zeros((0, 2), dtype=np.int8))
+    assert analysis.attempts == 0
+    assert np.isnan(analysis.difficulty).all()
+    assert np.isnan(analysis.discrimination).all()
+    assert np.isnan(analysis.kr20)
+    assert analysis.option_rates.tolist() == [[0] * 5] * 2
+
+
+def submit(conn, exam_id, student, answers):
+    key = AnswerKey.for_exam(conn, exam_id)
+    score = key.score(answers)
+    result_id = conn.execute("INSERT INTO results (student_id, exam_id, score, date) VALUES (?, ?, ?, datetime('now'))",
+                             (add_student(conn, student), exam_id, score.percentage)).lastrowid
+    conn.execute("INSERT INTO result_answers VALUES (?, ?, ?)", (result_id, *answer_sheet(key, score)))
+    conn.commit()
+
+
+def test_cache_refreshes_on_new_submission_and_key_change(conn):
+    exam_id, question_ids = add_exam(conn, questions=[('A', 1), ('B', 1)])
+    submit(conn, exam_id, 'ann', {str(question_ids[0]): 'A', str(question_ids[1]): 'B'})
+    cache = ItemAnalysisCache()
+
+    first = cache.get(conn, exam_id)
+    assert first.attempts == 1
+    assert cache.get(conn, exam_id) is first
+
+    submit(conn, exam_id, 'bob', {str(question_ids[0]): 'C'})
+    second = cache.get(conn, exam_id)
+    assert second is not first
+    assert second.attempts == 2
+    assert second.difficulty.tolist() == pytest.approx([0.5, 0.5])
+
+    conn.execute("UPDATE questions SET correct_answer = 'C' WHERE id = ?", (question_ids[0],))
+    conn.commit()
+    third = cache.get(conn, exam_id)
+    assert third is not second
+    assert third.difficulty.tolist() == pytest.approx([0.5, 0.5])
+    assert third.option_rates[0].tolist() == pytest.approx([0.5, 0, 0.5, 0, 0])
+
+    # A question added later is only judged on the sheets that had it
+    conn.execute("""
+        INSERT INTO questions (exam_id, question, option_a, option_b, option_c, option_d, correct_answer)
+        VALUES (?, 'New', 'a', 'b', 'c', 'd', 'D')
+    """, (exam_id,))
+    conn.commit()
+    fourth = cache.get(conn, exam_id)
+    assert fourth.responses.tolist() == [2, 2, 0]
+    assert np.isnan(fourth.difficulty[2])
@@ -0,0 +1,187 @@
+import hashlib
+import io
+import sqlite3
+
+import pytest
+
+import database
+from conftest import add_exam
+from database import SCHEMA_VERSION, migrate_database
+
+# Tables as the old StudentDashboard.init_database created them, before
+# migrations existed
+LEGACY_SCHEMA = '''
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        role TEXT CHECK(role IN ('Admin', 'Teacher', 'Student')) NOT NULL
+    );
+    CREATE TABLE students (
+        id INTEGER PRIMARY KEY,
+        class TEXT NOT NULL,
+        phone TEXT,
+        profile_pic BLOB,
+        bio TEXT
+    );
+    CREATE TABLE exams (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        subject TEXT NOT NULL,
+        duration INTEGER NOT NULL,
+        total_marks INTEGER NOT NULL
+    );
+    CREATE TABLE results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER,
+        exam_id INTEGER,
+        score INTEGER,
+        date DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+'''
+
+
+def png_bytes(size=(400, 300)):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def test_fresh_database_is_current(conn):
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {'users', 'students', 'exams', 'questions', 'results', 'result_answers', 'exam_attempts',
+            'exam_stats', 'student_stats', 'profile_thumbnails', 'images'} <= tables
+    assert 'profile_image' in columns(conn, 'students')
+    assert 'profile_pic' not in columns(conn, 'students')
+    # Running again is a no-op
+    assert migrate_database(conn) == SCHEMA_VERSION
+    assert conn.execute("SELECT COUNT(*) FROM users WHERE username = 'admin'").fetchone()[0] == 1
+
+
+def test_upgrade_legacy_database(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    picture = png_bytes()
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executescript('''
+        INSERT INTO users VALUES (1, 'ann', 'x', 'Ann', 'ann@example.com', 'Student');
+        INSERT INTO users VALUES (2, 'bob', 'x', 'Bob', 'bob@example.com', 'Student');
+        INSERT INTO exams VALUES (1, 'Algebra', 'Maths', 30, 100);
+        INSERT INTO exams VALUES (2, 'Cells', 'Biology', 20, 100);
+        INSERT INTO results VALUES (1, 1, 1, 80, '2024-01-01 10:00:00');
+        INSERT INTO results VALUES (2, 1, 2, 40, '2024-01-02 10:00:00');
+        INSERT INTO results VALUES (3, 2, 1, 60, '2024-01-03 10:00:00');
+    ''')
+    # Both students uploaded the same picture
+    conn.executemany("INSERT INTO students (id, class, profile_pic) VALUES (?, '10A', ?)",
+                     [(1, picture), (2, picture)])
+    conn.commit()
+
+    assert migrate_database(conn) == SCHEMA_VERSION
+
+    assert conn.execute("""
+        SELECT e.title, s.subject_name FROM exams e JOIN subjects s ON e.subject_id = s.id ORDER BY e.id
+    """).fetchall() == [('Algebra', 'Maths'), ('Cells', 'Biology')]
+    assert 'subject' not in columns(conn, 'exams')
+    assert conn.execute("SELECT attempts, score_sum, min_score, max_score FROM exam_stats WHERE exam_id = 1"
+                        ).fetchone() == (2, 140, 60, 80)
+    assert conn.execute("SELECT attempts, score_sum FROM student_stats WHERE student_id = 1").fetchone() == (2, 120)
+
+    digest = hashlib.sha256(picture).hexdigest()
+    assert conn.execute("SELECT sha256, data FROM images").fetchall() == [(digest, picture)]
+    assert conn.execute("SELECT profile_image FROM students ORDER BY id").fetchall() == [(digest,), (digest,)]
+    assert conn.execute("SELECT COUNT(*) FROM profile_thumbnails").fetchone()[0] == 2
+    conn.close()
+
+
+def test_stats_recounted_without_deleted_exams(tmp_path, monkeypatch):
+    # A version 8 file whose stats still count a deleted exam's result
+    conn = sqlite3.connect(str(tmp_path / 'v8.db'))
+    monkeypatch.setattr(database, 'MIGRATIONS', database.MIGRATIONS[:8])
+    monkeypatch.setattr(database, 'SCHEMA_VERSION', 8)
+    assert migrate_database(conn) == 8
+    conn.executescript('''
+        INSERT INTO subjects VALUES (1, 'Maths');
+        INSERT INTO exams (id, title, subject_id, duration) VALUES (1, 'Kept', 1, 30), (2, 'Gone', 1, 30);
+        INSERT INTO results (student_id, exam_id, score, date) VALUES (5, 1, 80, '2024-01-01'), (5, 2, 20, '2024-01-02');
+        DELETE FROM exams WHERE id = 2;
+    ''')
+    assert conn.execute("SELECT attempts FROM student_stats WHERE student_id = 5").fetchone() == (2,)
+    monkeypatch.undo()
+
+    assert migrate_database(conn) == SCHEMA_VERSION
+    assert conn.execute("SELECT attempts, score_sum FROM student_stats WHERE student_id = 5").fetchone() == (1, 80)
+    assert conn.execute("SELECT exam_id FROM exam_stats").fetchall() == [(1,)]
+    conn.close()
+
+
+def question_counts(conn):
+    return dict(conn.execute("SELECT id, question_count FROM exams"))
+
+
+def test_question_count_follows_inserts_deletes_and_moves(conn):
+    first, question_ids = add_exam(conn, 'First', questions=[('A', 1), ('B', 1), ('C', 1)])
+    second, _ = add_exam(conn, 'Second', questions=[('D', 1)])
+    assert question_counts(conn) == {first: 3, second: 1}
+
+    conn.execute("DELETE FROM questions WHERE id = ?", (question_ids[0],))
+    assert question_counts(conn) == {first: 2, second: 1}
+
+    conn.execute("UPDATE questions SET exam_id = ? WHERE id = ?", (second, question_ids[1]))
+    assert question_counts(conn) == {first: 1, second: 2}
+
+    # Edits that keep the exam leave the counts alone
+    conn.execute("UPDATE questions SET exam_id = ?, question = 'Reworded' WHERE id = ?", (second, question_ids[1]))
+    conn.execute("UPDATE questions SET correct_answer = 'B' WHERE id = ?", (question_ids[2],))
+    assert question_counts(conn) == {first: 1, second: 2}
+    conn.commit()
+
+    stored = question_counts(conn)
+    actual = dict(conn.execute("""
+        SELECT e.id, COUNT(q.id) FROM exams e LEFT JOIN questions q ON q.exam_id = e.id GROUP BY e.id
+    """))
+    assert stored == actual
+
+
+def test_image_released_with_last_reference(conn):
+    conn.execute("INSERT INTO images VALUES ('abc', x'00')")
+    conn.execute("INSERT INTO users VALUES (10, 'ann', 'x', 'Ann', 'ann@example.com', 'Student')")
+    conn.execute("INSERT INTO users VALUES (11, 'bob', 'x', 'Bob', 'bob@example.com', 'Student')")
+    conn.executemany("INSERT INTO students (id, class, profile_image) VALUES (?, '10A', 'abc')", [(10,), (11,)])
+    conn.execute("UPDATE students SET profile_image = NULL WHERE id = 10")
+    assert conn.execute("SELECT COUNT(*) FROM images").fetchone()[0] == 1
+    conn.execute("DELETE FROM students WHERE id = 11")
+    assert conn.execute("SELECT COUNT(*) FROM images").fetchone()[0] == 0
+    conn.rollback()
+
+
+def test_newer_database_is_refused(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'future.db'))
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    with pytest.raises(RuntimeError, match='newer'):
+        migrate_database(conn)
+    conn.close()
+
+
+def test_failed_migration_rolls_back(tmp_path, monkeypatch):
+    conn = sqlite3.connect(str(tmp_path / 'broken.db'))
+
+    def fail(conn):
+        raise sqlite3.OperationalError("boom")
+
+    monkeypatch.setattr(database, 'MIGRATIONS', [database.MIGRATIONS[0], (2, ["CREATE TABLE half_done (x)", fail])])
+    monkeypatch.setattr(database, 'SCHEMA_VERSION', 2)
+    with pytest.raises(sqlite3.OperationalError):
+        migrate_database(conn)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'half_done'").fetchone()[0] == 0
+    conn.close()
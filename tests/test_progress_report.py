@@ -0,0 +1,63 @@
+import zipfile
+
+import pytest
+
+from conftest import add_exam, add_student
+from progress_report import fetch_class_reports, generate_class_reports
+
+STUDENTS = 40
+
+
+@pytest.fixture
+def class_results(conn):
+    exam_id, _ = add_exam(conn, 'Algebra')
+    other_exam, _ = add_exam(conn, 'Cells')
+    for number in range(STUDENTS):
+        student_id = add_student(conn, f"student{number:02d}", '10/A' if number % 2 else '10B')
+        conn.execute("INSERT INTO results (student_id, exam_id, score, date) VALUES (?, ?, ?, '2024-03-01 09:00:00')",
+                     (student_id, exam_id, number))
+        conn.execute("INSERT INTO results (student_id, exam_id, score, date) VALUES (?, ?, 90, '2024-03-02 09:00:00')",
+                     (student_id, other_exam))
+    # A student without results gets no report
+    add_student(conn, 'absent')
+    conn.commit()
+    return conn
+
+
+def expected_names():
+    return {f"{'10_A' if number % 2 else '10B'}/student{number:02d}.pdf" for number in range(STUDENTS)}
+
+
+def test_fetch_groups_results_per_student(class_results):
+    jobs = fetch_class_reports(class_results)
+    assert {job[0] for job in jobs} == expected_names()
+
+    file_name, student_info, results, summary = next(job for job in jobs if job[0] == '10_A/student03.pdf')
+    assert student_info == ('Student03', '10/A', 'student03@example.com')
+    # Newest first
+    assert results == [('Cells', 90, '2024-03-02 09:00:00'), ('Algebra', 3, '2024-03-01 09:00:00')]
+    assert summary[0] == 2
+    assert summary[1] == pytest.approx(46.5)
+
+
+def test_zip_output(class_results, tmp_path):
+    output = str(tmp_path / 'reports.zip')
+    progress = []
+    jobs = fetch_class_reports(class_results)
+
+    assert generate_class_reports(jobs, output, workers=2, progress=lambda done, total: progress.append((done, total))) == STUDENTS
+    assert progress == [(done, STUDENTS) for done in range(1, STUDENTS + 1)]
+    with zipfile.ZipFile(output) as archive:
+        assert set(archive.namelist()) == expected_names()
+        assert archive.read('10_A/student01.pdf').startswith(b'%PDF')
+    assert not (tmp_path / 'reports.zip.part').exists()
+
+
+def test_directory_output(class_results, tmp_path):
+    output = tmp_path / 'reports'
+    jobs = fetch_class_reports(class_results)
+
+    assert generate_class_reports(jobs, str(output), workers=2) == STUDENTS
+    written = {str(path.relative_to(output)).replace('\\', '/') for path in output.rglob('*.pdf')}
+    assert written == expected_names()
+    assert sorted(path.name for path in output.iterdir()) == ['10B', '10_A']
@@ -0,0 +1,77 @@
+import threading
+
+from query_executor import QueryExecutor
+
+
+class FakeRoot:
+    """Stands in for a Tk root: ``after`` callbacks run when ``pump`` is called."""
+
+    def __init__(self):
+        self.scheduled = {}
+        self.errors = []
+        self._ids = 0
+
+    def after(self, ms, callback):
+        self._ids += 1
+        self.scheduled[self._ids] = callback
+        return self._ids
+
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        self.errors.append(exc)
+
+    def pump(self):
+        scheduled, self.scheduled = self.scheduled, {}
+        for callback in scheduled.values():
+            callback()
+
+
+def run_until_idle(root, tasks):
+    for task in tasks:
+        task.future.result(timeout=5)
+    root.pump()
+
+
+def test_failing_callback_does_not_stall_the_others(db_path):
+    root = FakeRoot()
+    executor = QueryExecutor.for_root(root)
+    done = []
+
+    def broken(result):
+        raise ValueError("bad callback")
+
+    executor.call_soon(lambda: 1 / 0)
+    executor.call_soon(done.append, 'progress')
+    tasks = [executor.submit(lambda conn: conn.execute("SELECT 1").fetchone()[0], broken),
+             executor.submit(lambda conn: conn.execute("SELECT 2").fetchone()[0], done.append),
+             executor.submit(lambda conn: conn.execute("SELECT nonsense FROM nowhere"), done.append,
+                             on_error=lambda e: done.append(type(e).__name__))]
+    run_until_idle(root, tasks)
+
+    assert sorted(map(str, done)) == ['2', 'OperationalError', 'progress']
+    assert [type(e) for e in root.errors] == [ZeroDivisionError, ValueError]
+    executor.shutdown()
+    assert not hasattr(root, '_query_executor')
+
+
+def test_polling_continues_after_a_failure(db_path):
+    root = FakeRoot()
+    executor = QueryExecutor.for_root(root)
+    release = threading.Event()
+    done = []
+
+    first = executor.submit(lambda conn: None, lambda result: 1 / 0)
+    second = executor.submit(lambda conn: release.wait(5), done.append)
+    first.future.result(timeout=5)
+    root.pump()
+    # The slow task is still pending, so the executor keeps polling
+    assert root.scheduled and done == []
+
+    release.set()
+    second.future.result(timeout=5)
+    root.pump()
+    assert done == [True]
+    assert len(root.errors) == 1
+    executor.shutdown()
@@ -0,0 +1,73 @@
+import random
+import re
+
+import pytest
+
+import student_dashboard
+from admin_dashboard import RESULTS_SELECT_SQL
+from Teacher_dashboard import RESULTS_SQL as TEACHER_RESULTS_SQL
+
+STUDENTS = 300
+EXAMS = 30
+RESULTS = 6000
+
+
+@pytest.fixture(params=[False, True], ids=['no-stats', 'analyzed'])
+def seeded(conn, request):
+    """A database with a realistic spread of results, with and without ANALYZE statistics."""
+    rng = random.Random(3)
+    conn.executemany("INSERT INTO subjects (id, subject_name) VALUES (?, ?)", [(i, f"Subject {i}") for i in range(1, 6)])
+    conn.executemany("INSERT INTO users (id, username, password, name, email, role) VALUES (?, ?, 'x', ?, ?, ?)",
+                     [(i, f"user{i}", f"User {i}", f"user{i}@example.com", 'Teacher' if i <= 5 else 'Student')
+                      for i in range(2, STUDENTS + 6)])
+    conn.executemany("INSERT INTO teachers (id, subject_id) VALUES (?, ?)", [(i, i) for i in range(2, 6)])
+    conn.executemany("INSERT INTO students (id, class) VALUES (?, '10A')", [(i,) for i in range(6, STUDENTS + 6)])
+    conn.executemany("INSERT INTO exams (id, title, subject_id, duration) VALUES (?, ?, ?, 30)",
+                     [(i, f"Exam {i}", i % 5 + 1) for i in range(1, EXAMS + 1)])
+    conn.executemany("INSERT INTO results (student_id, exam_id, score, date) VALUES (?, ?, ?, ?)",
+                     [(rng.randrange(6, STUDENTS + 6), rng.randrange(1, EXAMS + 1), rng.randrange(101),
+                       f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} 10:00:00")
+                      for _ in range(RESULTS)])
+    if request.param:
+        conn.execute("ANALYZE")
+    conn.commit()
+    return conn
+
+
+def plan(conn, sql, params):
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def assert_no_results_scan(steps):
+    # Walking an index in ORDER BY order (SCAN r USING INDEX ...) is fine for
+    # a LIMITed page; reading the whole results table or sorting it is not
+    assert not [step for step in steps if re.match(r'SCAN (r|results)\b(?!.*USING)', step)], steps
+    assert not [step for step in steps if 'TEMP B-TREE' in step], steps
+
+
+def test_student_available_exams(seeded):
+    steps = plan(seeded, student_dashboard.AVAILABLE_EXAMS_SQL, (30, 10, 10))
+    assert_no_results_scan(steps)
+    assert any('idx_results_student_exam' in step for step in steps), steps
+
+
+def test_student_results(seeded):
+    steps = plan(seeded, student_dashboard.RESULTS_SQL, (10,))
+    assert_no_results_scan(steps)
+    assert any('idx_results_student_date' in step for step in steps), steps
+
+
+def test_teacher_results(seeded):
+    steps = plan(seeded, TEACHER_RESULTS_SQL, (2,))
+    assert_no_results_scan(steps)
+
+
+@pytest.mark.parametrize('page', ['first', 'next'])
+def test_admin_results_page(seeded, page):
+    # The query VirtualTreeview builds for the first page and for the page
+    # after a (date, id) key
+    where, params = ("", ()) if page == 'first' else (" WHERE ((r.date, r.id) < (?, ?))", ('2024-06-01 10:00:00', 100))
+    sql = RESULTS_SELECT_SQL + where + " ORDER BY r.date DESC, r.id DESC LIMIT ?"
+    steps = plan(seeded, sql, (*params, 50))
+    assert_no_results_scan(steps)
+    assert 'idx_results_date' in steps[0], steps
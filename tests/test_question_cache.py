@@ -0,0 +1,39 @@
+import question_cache
+from conftest import add_exam
+from question_cache import QuestionCache, shuffle_questions
+
+
+def test_load_and_expire(conn, monkeypatch):
+    exam_id, question_ids = add_exam(conn, 'Algebra', questions=[('A', 1), ('B', 2)], duration=45)
+    empty_exam, _ = add_exam(conn, 'Empty')
+    now = [1000.0]
+    monkeypatch.setattr(question_cache.time, 'monotonic', lambda: now[0])
+
+    cache = QuestionCache()
+    cache.load(conn, [exam_id, empty_exam, 12345])
+    title, duration, questions = cache.get(exam_id)
+    assert (title, duration) == ('Algebra', 45)
+    assert [question[0] for question in questions] == question_ids
+    assert questions[1][6:] == ('B', 2)
+    assert cache.get(empty_exam)[2] == ()
+    assert cache.get(12345) is None
+
+    now[0] += 30
+    assert cache.get(exam_id, max_age=60) is not None
+    now[0] += 31
+    assert cache.get(exam_id, max_age=60) is None
+    assert cache.get(exam_id) is not None
+
+    # Reloading picks up edits and restarts the clock
+    conn.execute("UPDATE questions SET correct_answer = 'C' WHERE id = ?", (question_ids[1],))
+    conn.commit()
+    cache.load(conn, [exam_id])
+    assert cache.get(exam_id, max_age=60)[2][1][6] == 'C'
+
+
+def test_shuffle_is_reproducible_per_student():
+    questions = [(i, f"q{i}") for i in range(1, 21)]
+    first = shuffle_questions(questions, 7, 3)
+    assert first == shuffle_questions(list(reversed(questions)), 7, 3)
+    assert sorted(first) == questions
+    assert first != shuffle_questions(questions, 8, 3)
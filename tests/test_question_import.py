@@ -0,0 +1,118 @@
+import pytest
+
+from conftest import add_exam
+from question_import import (QuestionImportError, import_questions, parse_aiken, parse_csv, parse_gift,
+                             parse_questions)
+
+AIKEN = """\
+What is the capital of France?
+A. Berlin
+B. Paris
+C. Rome
+D. Madrid
+ANSWER: B
+
+Which number is prime?
+A) 4
+B) 6
+C) 7
+ANSWER: C
+
+No answer line here
+A. 1
+B. 2
+C. 3
+D. 4
+"""
+
+GIFT = """\
+// comment lines are skipped
+$CATEGORY: geography
+
+::Q1:: Which planet is known as the red planet? {~Venus =Mars ~Jupiter ~Saturn}
+
+The sun rises in the {=east ~west ~north ~south}.
+
+Escaped \\{braces\\} and a colon\\: here {~1 ~2 =3 ~4}
+
+Match these {=a -> 1 =b -> 2 =c -> 3 =d -> 4}
+
+True or false? {T}
+"""
+
+CSV = """\
+Question,Option_A,Option_B,Option_C,Option_D,Correct_Answer,Marks
+2 + 2?,3,4,5,6,b,2
+"Comma, in text",x,y,z,w,A,
+Missing option,x,,z,w,A,1
+Bad answer,x,y,z,w,E,1
+Bad marks,x,y,z,w,A,zero
+"""
+
+
+def test_parse_aiken():
+    parsed = list(parse_aiken(AIKEN))
+    assert parsed[0] == (1, {'question': 'What is the capital of France?',
+                             'options': ['Berlin', 'Paris', 'Rome', 'Madrid'], 'correct': 'B', 'marks': 1})
+    assert parsed[1][0] == 8 and 'expected options' in parsed[1][1]
+    assert parsed[2] == (14, "no ANSWER line")
+
+
+def test_parse_gift():
+    parsed = list(parse_gift(GIFT))
+    assert parsed[0] == (4, {'question': 'Which planet is known as the red planet?',
+                             'options': ['Venus', 'Mars', 'Jupiter', 'Saturn'], 'correct': 'B', 'marks': 1})
+    assert parsed[1][1]['question'] == 'The sun rises in the _____ .'
+    assert parsed[1][1]['correct'] == 'A'
+    assert parsed[2][1]['question'] == 'Escaped {braces} and a colon: here'
+    assert parsed[3] == (10, "only single-answer multiple choice questions are supported")
+    assert parsed[4][0] == 12 and isinstance(parsed[4][1], str)
+    assert len(parsed) == 5
+
+
+def test_parse_csv():
+    parsed = list(parse_csv(CSV))
+    assert parsed[0] == (2, {'question': '2 + 2?', 'options': ['3', '4', '5', '6'], 'correct': 'B', 'marks': 2})
+    assert parsed[1][1]['question'] == 'Comma, in text' and parsed[1][1]['marks'] == 1
+    assert parsed[2] == (4, "missing option_b")
+    assert parsed[3][0] == 5 and 'correct_answer E' in parsed[3][1]
+    assert parsed[4][0] == 6 and 'marks zero' in parsed[4][1]
+
+
+def test_parse_csv_requires_columns():
+    with pytest.raises(QuestionImportError, match='correct_answer'):
+        list(parse_csv("question,option_a,option_b,option_c,option_d\n"))
+
+
+def test_parse_questions_sniffs_format(tmp_path):
+    aiken = tmp_path / 'questions.txt'
+    aiken.write_text(AIKEN, encoding='utf-8')
+    gift = tmp_path / 'questions2.txt'
+    gift.write_text(GIFT, encoding='utf-8')
+    assert next(iter(parse_questions(str(aiken))))[1]['correct'] == 'B'
+    assert next(iter(parse_questions(str(gift))))[1]['options'][1] == 'Mars'
+    with pytest.raises(QuestionImportError):
+        parse_questions(str(tmp_path / 'missing.csv'))
+
+
+def test_import_skips_duplicates(conn, tmp_path):
+    exam_id, _ = add_exam(conn)
+    conn.execute("""
+        INSERT INTO questions (exam_id, question, option_a, option_b, option_c, option_d, correct_answer)
+        VALUES (?, '2  +  2?', '3', '4', '5', '6', 'A')
+    """, (exam_id,))
+    conn.commit()
+    path = tmp_path / 'questions.csv'
+    path.write_text(CSV + '"COMMA,   in text",X,y,z,w,B,1\n', encoding='utf-8')
+
+    report = import_questions(conn, str(path), exam_id)
+    # Line 2 is already in the exam and line 7 repeats line 3, ignoring case
+    # and spacing
+    assert report.imported == 1
+    assert [line for line, _ in report.duplicates] == [2, 7]
+    assert [line for line, _ in report.invalid] == [4, 5, 6]
+    assert conn.execute("SELECT question_count FROM exams WHERE id = ?", (exam_id,)).fetchone()[0] == 2
+
+    # Importing the same file again adds nothing
+    again = import_questions(conn, str(path), exam_id)
+    assert again.imported == 0 and len(again.duplicates) == 3
@@ -0,0 +1,77 @@
+import time
+
+from tkinter import ttk
+
+from query_executor import QueryExecutor
+from scoring import OPTION_LETTERS
+from student_dashboard import StudentDashboard
+
+QUESTIONS = 200
+ROUNDS = 3
+
+
+def exam_dashboard(root):
+    """A StudentDashboard showing a 200-question exam, without the rest of the window."""
+    dashboard = StudentDashboard.__new__(StudentDashboard)
+    dashboard.root = root
+    dashboard.colors = {'text': '#FFFFFF', 'content_bg': '#0B1437', 'menu_bg': '#1B2B65', 'accent2': '#00D8D8'}
+    dashboard.executor = QueryExecutor.for_root(root)
+    dashboard.content_frame = ttk.Frame(root)
+    dashboard.content_frame.pack(fill='both', expand=True)
+    dashboard.exam_title = "Benchmark"
+    dashboard.questions = [(number, f"Question {number}?", f"a{number}", f"b{number}", f"c{number}", f"d{number}")
+                           for number in range(1, QUESTIONS + 1)]
+    dashboard.answers = {}
+    dashboard.journal = None
+    dashboard.timer_id = None
+    dashboard.deadline = time.monotonic() + 3600
+    dashboard.setup_exam_ui()
+    return dashboard
+
+
+def rebuild_options(dashboard, index):
+    # How show_question used to do it: new option widgets on every click
+    question = dashboard.questions[index]
+    for widget in dashboard.options_frame.winfo_children():
+        widget.destroy()
+    for letter, text in zip(OPTION_LETTERS, question[2:6]):
+        frame = ttk.Frame(dashboard.options_frame, style="Card.TFrame")
+        frame.pack(fill='x', pady=5)
+        ttk.Radiobutton(frame, text=f"{letter}. {text}", variable=dashboard.selected_option, value=letter,
+                        style="Custom.TRadiobutton").pack(pady=5, padx=10, anchor='w')
+
+
+def microseconds_per_navigation(root, navigate):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for index in range(QUESTIONS):
+            navigate(index)
+            # Include the geometry work Tk does before it can redraw
+            root.update_idletasks()
+    return (time.perf_counter() - started) / (ROUNDS * QUESTIONS) * 1e6
+
+
+def test_navigation_reuses_option_widgets(tk_root):
+    dashboard = exam_dashboard(tk_root)
+    try:
+        buttons = list(dashboard.option_buttons)
+        for _ in range(QUESTIONS - 1):
+            dashboard.selected_option.set('B')
+            dashboard.next_question()
+        assert dashboard.option_buttons == buttons
+        assert len(dashboard.options_frame.winfo_children()) == len(OPTION_LETTERS)
+        assert buttons[2].cget('text') == f"C. c{QUESTIONS}"
+        assert len(dashboard.answers) == QUESTIONS - 1
+
+        dashboard.prev_question()
+        assert dashboard.selected_option.get() == 'B'
+
+        reused = microseconds_per_navigation(tk_root, dashboard.show_question)
+        rebuilt = microseconds_per_navigation(tk_root, lambda index: rebuild_options(dashboard, index))
+        print(f"\nper navigation: {reused:.0f} µs reusing widgets, {rebuilt:.0f} µs rebuilding them")
+        assert reused < rebuilt
+    finally:
+        dashboard.timer_active = False
+        if dashboard.timer_id is not None:
+            tk_root.after_cancel(dashboard.timer_id)
+        dashboard.executor.shutdown()
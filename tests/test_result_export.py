@@ -0,0 +1,59 @@
+import csv
+import json
+import sqlite3
+
+import pytest
+
+import result_export
+from result_export import export_query
+
+COLUMNS = ("ID", "Student", "Score")
+
+
+@pytest.fixture
+def rows_conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE scores (id INTEGER PRIMARY KEY, student TEXT, score REAL)")
+    conn.executemany("INSERT INTO scores VALUES (?, ?, ?)", [(i, f"student {i}", i / 2) for i in range(1, 8)])
+    yield conn
+    conn.close()
+
+
+def test_csv_header_rows_and_progress(rows_conn, tmp_path, monkeypatch):
+    monkeypatch.setattr(result_export, 'EXPORT_BATCH_SIZE', 3)
+    path = str(tmp_path / 'scores.csv')
+    progress = []
+
+    assert export_query(rows_conn, "SELECT * FROM scores ORDER BY id", (), COLUMNS, path, progress.append) == 7
+    # One call per batch of three
+    assert progress == [3, 6, 7]
+    with open(path, newline='', encoding='utf-8') as f:
+        lines = list(csv.reader(f))
+    assert lines[0] == list(COLUMNS)
+    assert lines[1:] == [[str(i), f"student {i}", str(i / 2)] for i in range(1, 8)]
+    assert not (tmp_path / 'scores.csv.part').exists()
+
+
+def test_json_lines_and_params(rows_conn, tmp_path):
+    path = str(tmp_path / 'scores.jsonl')
+    assert export_query(rows_conn, "SELECT * FROM scores WHERE score >= ? ORDER BY id", (3,), COLUMNS, path) == 2
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == [
+            {"ID": 6, "Student": "student 6", "Score": 3.0},
+            {"ID": 7, "Student": "student 7", "Score": 3.5},
+        ]
+
+
+def test_partial_file_removed_on_error(rows_conn, tmp_path, monkeypatch):
+    monkeypatch.setattr(result_export, 'EXPORT_BATCH_SIZE', 3)
+    path = tmp_path / 'scores.csv'
+    path.write_text("previous export\n")
+
+    def fail(count):
+        raise sqlite3.OperationalError("interrupted")
+
+    with pytest.raises(sqlite3.OperationalError):
+        export_query(rows_conn, "SELECT * FROM scores", (), COLUMNS, str(path), fail)
+    assert not (tmp_path / 'scores.csv.part').exists()
+    # An earlier complete file is left as it was
+    assert path.read_text() == "previous export\n"
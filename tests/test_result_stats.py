@@ -0,0 +1,92 @@
+import pytest
+
+from conftest import add_exam, add_student
+from result_stats import exam_summary, format_summary, student_summary, summarize
+
+
+def add_result(conn, student_id, exam_id, score):
+    conn.execute("INSERT INTO results (student_id, exam_id, score, date) VALUES (?, ?, ?, datetime('now'))",
+                 (student_id, exam_id, score))
+    conn.commit()
+
+
+def test_summarize():
+    assert summarize(0, 0, 0, None, None) == (0, 0.0, 0.0, None, None)
+    attempts, average, std_dev, lowest, highest = summarize(2, 100, 5200, 40, 60)
+    assert (attempts, average, lowest, highest) == (2, 50, 40, 60)
+    assert std_dev == pytest.approx(10)
+    assert format_summary(summarize(0, 0, 0, None, None)) == "No results yet"
+
+
+def test_exam_summary_ignores_deleted_exams(conn):
+    kept, _ = add_exam(conn, 'Kept')
+    deleted, _ = add_exam(conn, 'Deleted')
+    ann, bob = add_student(conn, 'ann'), add_student(conn, 'bob')
+    add_result(conn, ann, kept, 80)
+    add_result(conn, bob, kept, 60)
+    add_result(conn, ann, deleted, 10)
+    assert exam_summary(conn)[:2] == (3, 50)
+
+    # Foreign keys are not enforced, so the exam's stats row stays behind
+    conn.execute("DELETE FROM exams WHERE id = ?", (deleted,))
+    conn.commit()
+    attempts, average, _, lowest, highest = exam_summary(conn)
+    assert (attempts, average, lowest, highest) == (2, 70, 60, 80)
+    # The student's totals drop the deleted exam too, matching the results
+    # listed under them
+    assert student_summary(conn, ann) == (1, 80, 0, 80, 80)
+    assert conn.execute("SELECT COUNT(*) FROM exam_stats WHERE exam_id = ?", (deleted,)).fetchone()[0] == 0
+
+    # A submission that arrives after its exam was deleted is not counted
+    add_result(conn, bob, deleted, 100)
+    assert student_summary(conn, bob)[:2] == (1, 60)
+    assert exam_summary(conn)[:2] == (2, 70)
+
+    # Nor is it brought back when another of the student's results goes
+    conn.execute("DELETE FROM results WHERE student_id = ? AND exam_id = ?", (bob, kept))
+    conn.commit()
+    assert student_summary(conn, bob)[0] == 0
+
+
+def recount(conn, column, value):
+    return conn.execute(f"""
+        SELECT COUNT(*), SUM(r.score), SUM(r.score * r.score), MIN(r.score), MAX(r.score)
+        FROM results r JOIN exams e ON r.exam_id = e.id
+        WHERE r.{column} = ? AND r.score IS NOT NULL
+    """, (value,)).fetchone()
+
+
+def stored(conn, table, column, value):
+    return conn.execute(f"SELECT attempts, score_sum, score_squares, min_score, max_score FROM {table} "
+                        f"WHERE {column} = ?", (value,)).fetchone()
+
+
+def test_scores_set_to_or_from_null(conn):
+    exam_id, _ = add_exam(conn)
+    ann = add_student(conn, 'ann')
+    add_result(conn, ann, exam_id, 50)
+    add_result(conn, ann, exam_id, None)
+    result_id = conn.execute("SELECT id FROM results WHERE score IS NULL").fetchone()[0]
+    assert stored(conn, 'exam_stats', 'exam_id', exam_id) == (1, 50, 2500, 50, 50)
+
+    for score in (90, 20, None):
+        conn.execute("UPDATE results SET score = ? WHERE id = ?", (score, result_id))
+        conn.commit()
+        assert stored(conn, 'exam_stats', 'exam_id', exam_id) == recount(conn, 'exam_id', exam_id)
+        assert stored(conn, 'student_stats', 'student_id', ann) == recount(conn, 'student_id', ann)
+    assert stored(conn, 'student_stats', 'student_id', ann) == (1, 50, 2500, 50, 50)
+
+
+def test_exam_summary_for_teacher(conn):
+    exam_id, _ = add_exam(conn, 'Maths')
+    other_exam, _ = add_exam(conn, 'Biology')
+    teacher_id = conn.execute("""
+        INSERT INTO users (username, password, name, email, role)
+        VALUES ('teach', 'x', 'Teach', 'teach@example.com', 'Teacher')
+    """).lastrowid
+    conn.execute("INSERT INTO teachers (id, subject_id) SELECT ?, subject_id FROM exams WHERE id = ?",
+                 (teacher_id, exam_id))
+    student_id = add_student(conn, 'ann')
+    add_result(conn, student_id, exam_id, 90)
+    add_result(conn, student_id, other_exam, 30)
+    assert exam_summary(conn, teacher_id)[:2] == (1, 90)
@@ -0,0 +1,62 @@
+import pytest
+
+import roster_import
+from conftest import add_student
+from roster_import import RosterImportError, import_roster
+
+HEADER = "Name,Username,Email,Password,Class,Phone\n"
+
+
+def write_roster(tmp_path, text):
+    path = tmp_path / 'roster.csv'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_import_roster(conn, tmp_path):
+    path = write_roster(tmp_path, HEADER + (
+        "Ann Lee,ann,ann@example.com,pw1,10A,555-0001\n"
+        "Bob Ray,bob,bob@example.com,pw2,10B,555-0002\n"
+        ",,,,,\n"
+        "No Email,carl,,pw3,10B,555-0003\n"
+        "Bad Email,dan,dan.example.com,pw4,10B,555-0004\n"
+        "Ann Again,ann,other@example.com,pw5,10A,555-0005\n"
+        "Same Mail,eve,BOB@example.com,pw6,10A,555-0006\n"
+    ))
+    report = import_roster(conn, path)
+
+    assert report.imported == 2
+    assert [line for line, _ in report.invalid] == [5, 6]
+    assert [(line, username) for line, username, _ in report.duplicates] == [(7, 'ann'), (8, 'eve')]
+    rows = conn.execute("""
+        SELECT u.username, u.role, s.class, s.phone
+        FROM users u JOIN students s ON s.id = u.id
+        ORDER BY u.username
+    """).fetchall()
+    assert rows == [('ann', 'Student', '10A', '555-0001'), ('bob', 'Student', '10B', '555-0002')]
+
+
+def test_existing_users_are_reported_per_row(conn, tmp_path, monkeypatch):
+    monkeypatch.setattr(roster_import, 'IMPORT_CHUNK_SIZE', 2)
+    add_student(conn, 'taken')
+    path = write_roster(tmp_path, HEADER + (
+        "New One,new1,new1@example.com,pw,10A,1\n"
+        "Taken,taken,fresh@example.com,pw,10A,2\n"
+        "New Two,new2,taken@example.com,pw,10A,3\n"
+        "New Three,new3,new3@example.com,pw,10A,4\n"
+    ))
+    progress = []
+    report = import_roster(conn, path, progress=lambda done, total: progress.append((done, total)))
+
+    assert report.imported == 2
+    assert [(line, reason) for line, _, reason in report.duplicates] == [
+        (3, "username already exists"), (4, "email already exists")]
+    assert progress == [(2, 4), (4, 4)]
+    assert conn.execute("SELECT COUNT(*) FROM students").fetchone()[0] == 3
+
+
+def test_roster_requires_columns(conn, tmp_path):
+    with pytest.raises(RosterImportError, match='phone'):
+        import_roster(conn, write_roster(tmp_path, "name,username,email,password,class\n"))
+    with pytest.raises(RosterImportError):
+        import_roster(conn, str(tmp_path / 'missing.csv'))
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from conftest import add_exam, add_student
+from scoring import AnswerKey, answer_sheet, load_answer_matrix, regrade_exam
+
+
+def submit(conn, key, student_id, exam_id, answers):
+    score = key.score(answers)
+    result_id = conn.execute("INSERT INTO results (student_id, exam_id, score, date) VALUES (?, ?, ?, datetime('now'))",
+                             (student_id, exam_id, score.percentage)).lastrowid
+    conn.execute("INSERT INTO result_answers (result_id, question_ids, answers) VALUES (?, ?, ?)",
+                 (result_id, *answer_sheet(key, score)))
+    conn.commit()
+    return result_id
+
+
+def test_score_weights_marks_and_ignores_blanks():
+    key = AnswerKey([1, 2, 3], ['A', 'b', None], [1, 3, 1])
+    score = key.score({'1': 'A', '2': 'C', '3': ''})
+    assert (score.correct_count, score.answered_count, score.incorrect_count) == (1, 2, 1)
+    assert score.percentage == pytest.approx(20)
+    assert key.score({'1': 'a', '2': ' B '}).percentage == pytest.approx(80)
+
+
+def test_answer_sheet_round_trips(conn):
+    exam_id, question_ids = add_exam(conn, questions=[('A', 1), ('B', 1), ('C', 1)])
+    key = AnswerKey.for_exam(conn, exam_id)
+    result_id = submit(conn, key, add_student(conn, 'ann'), exam_id, {str(question_ids[0]): 'A', str(question_ids[2]): 'D'})
+
+    result_ids, chosen, present, scores = load_answer_matrix(conn, exam_id, key)
+    assert result_ids == [result_id]
+    assert chosen.tolist() == [[0, -1, 3]]
+    assert present.tolist() == [[True, True, True]]
+    assert scores.tolist() == [pytest.approx(100 / 3)]
+
+
+def test_regrade_after_key_correction(conn):
+    exam_id, question_ids = add_exam(conn, questions=[('A', 1), ('B', 1), ('C', 2)])
+    key = AnswerKey.for_exam(conn, exam_id)
+    first, second = add_student(conn, 'ann'), add_student(conn, 'bob')
+    ann = submit(conn, key, first, exam_id, {str(question_ids[0]): 'A', str(question_ids[1]): 'D'})
+    bob = submit(conn, key, second, exam_id, {str(question_ids[1]): 'B', str(question_ids[2]): 'C'})
+    assert regrade_exam(conn, exam_id) == 0
+
+    # Question 2's key was wrong: D is the right answer
+    conn.execute("UPDATE questions SET correct_answer = 'D' WHERE id = ?", (question_ids[1],))
+    conn.commit()
+    assert regrade_exam(conn, exam_id) == 2
+
+    scores = dict(conn.execute("SELECT id, score FROM results"))
+    assert scores[ann] == pytest.approx(50)
+    assert scores[bob] == pytest.approx(50)
+    assert conn.execute("SELECT score_sum, min_score, max_score FROM exam_stats WHERE exam_id = ?",
+                        (exam_id,)).fetchone() == pytest.approx((100, 50, 50))
+
+
+def test_regrade_drops_answers_to_moved_questions(conn):
+    exam_id, question_ids = add_exam(conn, questions=[('A', 1), ('B', 1)])
+    other_exam, _ = add_exam(conn, 'Other')
+    key = AnswerKey.for_exam(conn, exam_id)
+    result_id = submit(conn, key, add_student(conn, 'ann'), exam_id, {str(question_ids[1]): 'B'})
+
+    conn.execute("UPDATE questions SET exam_id = ? WHERE id = ?", (other_exam, question_ids[1]))
+    conn.commit()
+    assert regrade_exam(conn, exam_id) == 1
+    assert conn.execute("SELECT score FROM results WHERE id = ?", (result_id,)).fetchone()[0] == 0
+    assert regrade_exam(conn, other_exam) == 0
+
+
+def test_regrade_ignores_questions_added_after_submission(conn):
+    exam_id, question_ids = add_exam(conn, questions=[('A', 1), ('B', 2)])
+    other_exam, (moved,) = add_exam(conn, 'Other', questions=[('C', 1)])
+    key = AnswerKey.for_exam(conn, exam_id)
+    perfect = submit(conn, key, add_student(conn, 'ann'), exam_id, {str(question_ids[0]): 'A', str(question_ids[1]): 'B'})
+    half = submit(conn, key, add_student(conn, 'bob'), exam_id, {str(question_ids[0]): 'A'})
+
+    # A new question, and one moved in from another exam, after both sheets
+    conn.execute("""
+        INSERT INTO questions (exam_id, question, option_a, option_b, option_c, option_d, correct_answer, marks)
+        VALUES (?, 'Added later', 'a', 'b', 'c', 'd', 'D', 5)
+    """, (exam_id,))
+    conn.execute("UPDATE questions SET exam_id = ? WHERE id = ?", (exam_id, moved))
+    conn.commit()
+    assert regrade_exam(conn, exam_id) == 0
+    scores = dict(conn.execute("SELECT id, score FROM results"))
+    assert scores[perfect] == pytest.approx(100)
+    assert scores[half] == pytest.approx(100 / 3)
+
+    # A later key correction still applies, over the sheet's own questions
+    conn.execute("UPDATE questions SET correct_answer = 'C' WHERE id = ?", (question_ids[1],))
+    conn.commit()
+    assert regrade_exam(conn, exam_id) == 1
+    assert conn.execute("SELECT score FROM results WHERE id = ?", (perfect,)).fetchone()[0] == pytest.approx(100 / 3)
+
+
+def test_score_matrix_uses_each_sheets_questions():
+    key = AnswerKey([1, 2, 3], ['A', 'B', 'C'], [1, 1, 2])
+    chosen = np.array([[0, 1, -1], [0, -1, 2]], dtype=np.int8)
+    present = np.array([[True, True, False], [True, True, True]])
+    assert key.score_matrix(chosen, present).tolist() == pytest.approx([100, 75])
+    assert key.score_matrix(chosen).tolist() == pytest.approx([50, 75])
+    assert key.score_matrix(chosen, np.zeros_like(present)).tolist() == [0, 0]
+
+
+def test_regrade_leaves_results_without_answer_sheets(conn):
+    exam_id, _ = add_exam(conn, questions=[('A', 1)])
+    student_id = add_student(conn, 'ann')
+    conn.execute("INSERT INTO results (student_id, exam_id, score, date) VALUES (?, ?, 75, datetime('now'))",
+                 (student_id, exam_id))
+    conn.commit()
+    assert regrade_exam(conn, exam_id) == 0
+    assert conn.execute("SELECT score FROM results").fetchone()[0] == 75
+
+
+def test_key_limited_to_shown_questions(conn):
+    exam_id, question_ids = add_exam(conn, questions=[('A', 1), ('B', 2), ('C', 1)])
+    conn.execute("UPDATE questions SET correct_answer = 'D', marks = 3 WHERE id = ?", (question_ids[1],))
+    conn.commit()
+    # The student saw the first two questions; the third was added afterwards
+    key = AnswerKey.for_exam(conn, exam_id, [question_ids[1], question_ids[0], 999])
+    assert key.question_ids == question_ids[:2]
+    assert key.correct.tolist() == [0, 3]
+    assert key.marks.tolist() == [1, 3]
+    assert key.score({str(question_ids[0]): 'A', str(question_ids[1]): 'D'}).percentage == 100
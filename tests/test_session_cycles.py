@@ -0,0 +1,77 @@
+import gc
+import sys
+import types
+import tkinter
+from tkinter import ttk
+
+import main
+from query_executor import QueryExecutor
+
+CYCLES = 300
+ROLES = ('Admin', 'Teacher', 'Student')
+
+
+class StubDashboard:
+    """Stands in for a real dashboard: a few widgets, a query, and a logout."""
+
+    def __init__(self, root, user, session):
+        self.session = session
+        self.executor = QueryExecutor.for_root(root)
+        frame = ttk.Frame(root)
+        frame.pack(fill='both', expand=True)
+        ttk.Label(frame, text=f"Dashboard for {user}").pack()
+        ttk.Button(frame, text="Logout", command=self.logout).pack()
+        self.executor.submit(lambda conn: conn.execute("SELECT COUNT(*) FROM users").fetchone(), lambda row: None)
+
+    def logout(self):
+        self.executor.shutdown()
+        self.session.logout()
+
+
+def widget_count(widget):
+    return 1 + sum(widget_count(child) for child in widget.winfo_children())
+
+
+def footprint(root):
+    return {
+        'widgets': widget_count(root),
+        'root attributes': sorted(vars(root)),
+        'tcl commands': len(root.tk.call('info', 'commands')),
+        'after callbacks': len(root.tk.call('after', 'info')),
+    }
+
+
+def test_login_logout_cycles_do_not_grow(tk_root, db_path, monkeypatch):
+    for module_name, class_name in (('admin_dashboard', 'AdminDashboard'),
+                                    ('Teacher_dashboard', 'TeacherDashboard'),
+                                    ('student_dashboard', 'StudentDashboard')):
+        monkeypatch.setitem(sys.modules, module_name, types.SimpleNamespace(**{class_name: StubDashboard}))
+    monkeypatch.setattr(main.messagebox, 'showinfo', lambda *args, **kwargs: None)
+    try:
+        tk_root.state('zoomed')
+    except tkinter.TclError:
+        # Not every window manager has a maximized state
+        monkeypatch.setattr(tk_root, 'state', lambda *args: 'normal')
+
+    session = main.Session(tk_root)
+
+    def cycle(number):
+        session.show_login()
+        tk_root.update()
+        session.login({'id': number, 'name': f"User {number}", 'role': ROLES[number % len(ROLES)]})
+        tk_root.update()
+        session.screen.logout()
+        tk_root.update()
+
+    for number in range(len(ROLES)):
+        cycle(number)
+    gc.collect()
+    before = footprint(tk_root)
+
+    for number in range(CYCLES):
+        cycle(number)
+    gc.collect()
+
+    assert footprint(tk_root) == before
+    assert not hasattr(tk_root, '_query_executor')
+    assert isinstance(session.screen, main.UserTypeSelection)
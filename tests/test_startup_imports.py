@@ -0,0 +1,18 @@
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+
+# Loaded on demand after login, never on the way to the login screen
+DEFERRED_MODULES = ('numpy', 'PIL', 'reportlab', 'admin_dashboard', 'Teacher_dashboard', 'student_dashboard')
+
+
+def test_main_does_not_import_heavy_modules(tmp_path):
+    # A fresh interpreter, since this test session has long imported them
+    env = dict(os.environ, EXAM_DB_PATH=str(tmp_path / 'exam.db'))
+    code = ("import sys, main; "
+            f"print(','.join(name for name in {DEFERRED_MODULES!r} if name in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ''
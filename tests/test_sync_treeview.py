@@ -0,0 +1,101 @@
+from virtual_treeview import sync_treeview
+
+
+class FakeTree:
+    """The slice of ttk.Treeview that sync_treeview uses, recording each call."""
+
+    def __init__(self):
+        self.order = []
+        self.values = {}
+        self.calls = []
+
+    def get_children(self):
+        return tuple(self.order)
+
+    def insert(self, parent, index, iid, values):
+        self.calls.append(('insert', iid))
+        self.order.insert(index, iid)
+        self.values[iid] = values
+
+    def item(self, iid, values):
+        self.calls.append(('item', iid))
+        self.values[iid] = values
+
+    def delete(self, *iids):
+        self.calls.extend(('delete', iid) for iid in iids)
+        for iid in iids:
+            self.order.remove(iid)
+            del self.values[iid]
+
+    def move(self, iid, parent, index):
+        self.calls.append(('move', iid))
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def rows(self):
+        return [self.values[iid] for iid in self.order]
+
+
+ROWS = [(1, 'Algebra', 30), (2, 'Biology', 20), (3, 'Chemistry', 45)]
+
+
+def sync(tree, rows, **kwargs):
+    tree.calls = []
+    return sync_treeview(tree, rows, **kwargs)
+
+
+def test_first_fill_inserts_everything():
+    tree = FakeTree()
+    assert sync(tree, ROWS) == 3
+    assert tree.rows() == ROWS
+    assert tree.order == ['1', '2', '3']
+
+
+def test_unchanged_rows_are_not_touched():
+    tree = FakeTree()
+    sync(tree, ROWS)
+    assert sync(tree, list(ROWS)) == 0
+    assert tree.calls == []
+
+
+def test_add_edit_and_remove():
+    tree = FakeTree()
+    sync(tree, ROWS)
+    rows = [(1, 'Algebra', 30), (3, 'Chemistry II', 45), (4, 'Drama', 60)]
+    assert sync(tree, rows) == 3
+    assert sorted(tree.calls) == [('delete', '2'), ('insert', '4'), ('item', '3')]
+    assert tree.rows() == rows
+
+
+def test_reorder_only_moves():
+    tree = FakeTree()
+    sync(tree, ROWS)
+    rows = [ROWS[2], ROWS[0], ROWS[1]]
+    assert sync(tree, rows) == 0
+    assert {call[0] for call in tree.calls} == {'move'}
+    assert tree.rows() == rows
+
+
+def test_insert_among_reordered_rows():
+    tree = FakeTree()
+    sync(tree, ROWS)
+    rows = [(4, 'Drama', 60), ROWS[2], (2, 'Biology', 25)]
+    assert sync(tree, rows) == 3
+    assert tree.rows() == rows
+
+
+def test_key_index_and_formatter():
+    tree = FakeTree()
+    rows = [('Algebra', 30, 7), ('Biology', 20, 8)]
+    sync(tree, rows, key_index=2, row_formatter=lambda row: (row[0].upper(), f"{row[1]} min"))
+    assert tree.order == ['7', '8']
+    assert tree.rows() == [('ALGEBRA', '30 min'), ('BIOLOGY', '20 min')]
+    # Formatted values are what is compared, so an equal rendering is skipped
+    assert sync(tree, rows, key_index=2, row_formatter=lambda row: (row[0].upper(), f"{row[1]} min")) == 0
+
+
+def test_emptying_the_list():
+    tree = FakeTree()
+    sync(tree, ROWS)
+    assert sync(tree, []) == 3
+    assert tree.order == [] and tree.values == {}
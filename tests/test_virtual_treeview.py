@@ -0,0 +1,84 @@
+import sqlite3
+import time
+
+import pytest
+
+from query_executor import QueryExecutor
+from virtual_treeview import VirtualTreeview, page_query
+
+SELECT_SQL = "SELECT id, name, date FROM rows"
+ORDER_BY = ("date", "id")
+# Several rows share a date, so the id has to break ties
+ROWS = [(i, f"row {i}", f"2024-01-{i // 3 + 1:02d}") for i in range(1, 21)]
+
+
+@pytest.fixture
+def rows_conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE rows (id INTEGER PRIMARY KEY, name TEXT, date TEXT)")
+    conn.executemany("INSERT INTO rows VALUES (?, ?, ?)", ROWS)
+    yield conn
+    conn.close()
+
+
+def walk(conn, descending, where_sql=None, params=(), limit=3):
+    pages = []
+    key = None
+    while True:
+        sql, args = page_query(SELECT_SQL, ORDER_BY, where_sql, params, key, descending, limit)
+        page = conn.execute(sql, args).fetchall()
+        if not page:
+            return pages
+        pages.append(page)
+        key = (page[-1][2], page[-1][0])
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_pages_cover_every_row_once_in_order(rows_conn, descending):
+    pages = walk(rows_conn, descending)
+    expected = sorted(ROWS, key=lambda row: (row[2], row[0]), reverse=descending)
+    assert [row for page in pages for row in page] == expected
+    assert [len(page) for page in pages] == [3] * 6 + [2]
+
+
+def test_walking_back_mirrors_walking_forward(rows_conn):
+    # Backwards from a row is the opposite sort direction, reversed
+    forward = [row for page in walk(rows_conn, descending=True) for row in page]
+    middle = forward[10]
+    sql, args = page_query(SELECT_SQL, ORDER_BY, key=(middle[2], middle[0]), descending=False, limit=4)
+    assert rows_conn.execute(sql, args).fetchall()[::-1] == forward[6:10]
+
+
+def test_filter_combines_with_the_key(rows_conn):
+    pages = walk(rows_conn, descending=False, where_sql="id % ? = 0", params=(2,))
+    assert [row[0] for page in pages for row in page] == list(range(2, 21, 2))
+
+
+def pump(root, until, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not until():
+        assert time.monotonic() < deadline
+        root.update()
+        time.sleep(0.01)
+
+
+def test_reload_shows_rows_added_at_the_top(tk_root, conn):
+    conn.execute("INSERT INTO subjects (id, subject_name) VALUES (1, 'Maths')")
+    conn.executemany("INSERT INTO exams (id, title, subject_id, duration) VALUES (?, ?, 1, 30)",
+                     [(i, f"Exam {i}") for i in range(1, 6)])
+    conn.commit()
+    executor = QueryExecutor.for_root(tk_root)
+    tree = VirtualTreeview(tk_root, columns=("ID", "Title"), select_sql="SELECT id, title FROM exams",
+                           order_by=("id",), key_index=(0,), descending=True, page_size=2)
+    try:
+        tree.reload()
+        pump(tk_root, lambda: len(tree.tree.get_children()) == 2)
+        assert tree.tree.get_children() == ('5', '4')
+
+        conn.execute("INSERT INTO exams (id, title, subject_id, duration) VALUES (6, 'Exam 6', 1, 30)")
+        conn.commit()
+        tree.reload()
+        pump(tk_root, lambda: tree.tree.get_children()[0] == '6')
+        assert tree.tree.get_children() == ('6', '5')
+    finally:
+        executor.shutdown()
@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+
+import database
+from conftest import add_exam, add_student
+from scoring import AnswerKey, answer_sheet
+from student_dashboard import SUBMIT_RESULT_SQL, SUBMIT_GRACE_SECONDS
+
+SUBMITTERS = 100
+# Short enough that a writer shut out by the reader gives up within the test
+SUBMIT_BUSY_TIMEOUT_MS = 2000
+
+
+def test_database_uses_wal(conn):
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+
+@pytest.mark.parametrize('journal_mode', ['wal', 'delete'])
+def test_submissions_while_results_are_being_read(conn, journal_mode):
+    if journal_mode != 'wal':
+        # Leaving WAL needs the file to itself
+        database.close_all_connections()
+        assert conn.execute(f"PRAGMA journal_mode = {journal_mode}").fetchone()[0] == journal_mode
+    exam_id, question_ids = add_exam(conn, questions=[('A', 1), ('B', 2), ('C', 1), ('D', 1)])
+    key = AnswerKey.for_exam(conn, exam_id)
+    students = [add_student(conn, f"student{i}") for i in range(SUBMITTERS)]
+    conn.executemany("""
+        INSERT INTO exam_attempts (student_id, exam_id, started_at, deadline)
+        VALUES (?, ?, datetime('now'), datetime('now', '+30 minutes'))
+    """, [(student_id, exam_id) for student_id in students])
+    conn.commit()
+
+    # Student i answers the first i % 5 questions correctly
+    expected = {}
+    for i, student_id in enumerate(students):
+        answers = {str(question_id): letter
+                   for question_id, letter in zip(question_ids, 'ABCD'[:i % 5])}
+        expected[student_id] = key.score(answers)
+
+    # The admin's results list is being read throughout
+    reader = database.get_connection()
+    reader.execute("BEGIN")
+    assert reader.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+
+    start = threading.Barrier(SUBMITTERS)
+    errors = []
+
+    def submit(student_id):
+        score = expected[student_id]
+        submit_conn = database.get_connection()
+        submit_conn.execute(f"PRAGMA busy_timeout = {SUBMIT_BUSY_TIMEOUT_MS}")
+        try:
+            start.wait()
+            cursor = submit_conn.cursor()
+            cursor.execute(SUBMIT_RESULT_SQL, (student_id, exam_id, score.percentage,
+                                               student_id, exam_id, SUBMIT_GRACE_SECONDS))
+            assert cursor.rowcount == 1
+            cursor.execute("INSERT INTO result_answers (result_id, question_ids, answers) VALUES (?, ?, ?)",
+                           (cursor.lastrowid, *answer_sheet(key, score)))
+            submit_conn.commit()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            database.release_connection(submit_conn)
+
+    threads = [threading.Thread(target=submit, args=(student_id,)) for student_id in students]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    database.release_connection(reader)
+
+    if journal_mode != 'wal':
+        # A rollback journal lets no write commit while anyone is reading
+        assert len(errors) == SUBMITTERS
+        assert {str(e) for e in errors} == {'database is locked'}
+        assert conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+        return
+
+    assert errors == []
+    stored = dict(conn.execute("SELECT student_id, score FROM results WHERE exam_id = ?", (exam_id,)))
+    assert stored == {student_id: score.percentage for student_id, score in expected.items()}
+    assert conn.execute("""
+        SELECT COUNT(*) FROM result_answers ra JOIN results r ON ra.result_id = r.id
+    """).fetchone()[0] == SUBMITTERS
+
+    # The stats triggers saw every insert despite the contention
+    percentages = [score.percentage for score in expected.values()]
+    attempts, score_sum, min_score, max_score = conn.execute(
+        "SELECT attempts, score_sum, min_score, max_score FROM exam_stats WHERE exam_id = ?", (exam_id,)).fetchone()
+    assert attempts == SUBMITTERS
+    assert score_sum == pytest.approx(sum(percentages))
+    assert (min_score, max_score) == (min(percentages), max(percentages))
+    assert conn.execute("SELECT SUM(attempts) FROM student_stats").fetchone()[0] == SUBMITTERS
+
+
+def test_late_submission_is_refused(conn):
+    exam_id, _ = add_exam(conn, questions=[('A', 1)])
+    student_id = add_student(conn, 'late')
+    conn.execute("""
+        INSERT INTO exam_attempts (student_id, exam_id, started_at, deadline)
+        VALUES (?, ?, datetime('now', '-31 minutes'), datetime('now', '-1 minutes'))
+    """, (student_id, exam_id))
+    cursor = conn.execute(SUBMIT_RESULT_SQL, (student_id, exam_id, 100, student_id, exam_id, SUBMIT_GRACE_SECONDS))
+    assert cursor.rowcount == 0
+    conn.rollback()
@@ -0,0 +1,21 @@
+from tkinter import ttk
+
+
+def use_styles(root, name, configure):
+    """Return the ttk Style of ``root``'s interpreter, configuring it on demand.
+
+    ttk styles live in the Tk interpreter, not in the widgets, so each
+    screen's styles only need configuring once: ``configure(style)`` runs the
+    first time screen ``name`` is shown on this root and is skipped after
+    that, e.g. on every later login. Screens must therefore not give the same
+    style name different settings.
+    """
+    configured = getattr(root, '_configured_styles', None)
+    style = ttk.Style(root)
+    if configured is None:
+        style.theme_use('clam')
+        configured = root._configured_styles = set()
+    if name not in configured:
+        configure(style)
+        configured.add(name)
+    return style
@@ -0,0 +1,275 @@
+from tkinter import ttk, messagebox
+from query_executor import QueryExecutor
+
+
+def sync_treeview(tree, rows, key_index=0, row_formatter=None):
+    """Make ``tree`` show ``rows`` in order, touching only what changed.
+
+    Items are identified by the primary key at ``key_index``. Rows that are
+    new are inserted, rows that disappeared are deleted and rows whose values
+    changed are updated in place; everything else is left alone. Returns the
+    number of items inserted, updated or deleted.
+    """
+    # Values last written per item, so unchanged rows can be skipped without
+    # reading them back from Tk
+    shown = getattr(tree, '_synced_values', None)
+    if shown is None:
+        shown = tree._synced_values = {}
+
+    rows = [(str(row[key_index]), row) for row in rows]
+    wanted = [iid for iid, _ in rows]
+    existing = set(tree.get_children())
+    changed = 0
+
+    # Stale items go first, so new rows are inserted at their final index
+    stale = existing.difference(wanted)
+    if stale:
+        tree.delete(*stale)
+        for iid in stale:
+            shown.pop(iid, None)
+        existing.difference_update(stale)
+        changed += len(stale)
+
+    for index, (iid, row) in enumerate(rows):
+        values = tuple(row_formatter(row) if row_formatter else row)
+        if iid not in existing:
+            tree.insert('', index, iid=iid, values=values)
+            changed += 1
+        elif shown.get(iid) != values:
+            tree.item(iid, values=values)
+            changed += 1
+        shown[iid] = values
+
+    current = list(tree.get_children())
+    if current != wanted:
+        for index, iid in enumerate(wanted):
+            if current[index] != iid:
+                tree.move(iid, '', index)
+                current.remove(iid)
+                current.insert(index, iid)
+    return changed
+
+
+def page_query(select_sql, order_by, where_sql=None, params=(), key=None, descending=False, limit=100):
+    """Build the query for one page of a keyset-paginated list.
+
+    ``key`` holds the ``order_by`` values of the last row already shown;
+    the page is the next ``limit`` rows after it in the sort order, or the
+    first ``limit`` rows when ``key`` is None. Returns ``(sql, params)``.
+    """
+    conditions = []
+    params = list(params)
+    if where_sql:
+        conditions.append(f"({where_sql})")
+    if key is not None:
+        placeholders = ", ".join("?" for _ in key)
+        operator = '<' if descending else '>'
+        conditions.append(f"({', '.join(order_by)}) {operator} ({placeholders})")
+        params.extend(key)
+
+    direction = 'DESC' if descending else 'ASC'
+    sql = select_sql
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY " + ", ".join(f"{expr} {direction}" for expr in order_by)
+    sql += " LIMIT ?"
+    params.append(limit)
+    return sql, params
+
+
+class VirtualTreeview(ttk.Frame):
+    """Treeview that pages rows in from SQLite as the user scrolls.
+
+    Rows are fetched with keyset pagination: each page continues from the
+    sort key of the last row already shown, so a page costs one index seek
+    no matter how deep the user has scrolled. At most ``max_rows`` rows are
+    kept in the widget; scrolling past either edge loads the next page and
+    trims the same number of rows from the opposite end. Pages are queried
+    on the root's QueryExecutor, so the Tk thread never waits on SQLite.
+
+    ``select_sql`` is the SELECT ... FROM ... JOIN part of the query.
+    ``order_by`` lists the SQL expressions forming a unique sort key (end it
+    with the primary key), and ``key_index`` gives the positions of those
+    same values in each fetched row.
+    """
+
+    def __init__(self, parent, columns, select_sql, order_by, key_index,
+                 where_sql=None, params=(), descending=False, iid_index=0,
+                 row_formatter=None, page_size=100, max_rows=500,
+                 style="Treeview", frame_style="Content.TFrame"):
+        super().__init__(parent, style=frame_style)
+        self.select_sql = select_sql
+        self.order_by = order_by
+        self.key_index = key_index
+        self.where_sql = where_sql
+        self.params = tuple(params)
+        self.descending = descending
+        self.iid_index = iid_index
+        self.row_formatter = row_formatter
+        self.page_size = page_size
+        self.max_rows = max(max_rows, page_size * 2)
+
+        # Sort keys of the rows currently in the tree, in display order
+        self._keys = []
+        self._more_before = False
+        self._more_after = False
+        self._loading = False
+        self._generation = 0
+
+        scrollbar = ttk.Scrollbar(self, orient='vertical')
+        scrollbar.pack(side='right', fill='y')
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", style=style)
+        self.tree.pack(side='left', fill='both', expand=True)
+        # Shared with sync_treeview so reload() can skip unchanged rows
+        self.tree._synced_values = {}
+
+        self._scrollbar = scrollbar
+        scrollbar.config(command=self.tree.yview)
+        self.tree.config(yscrollcommand=self._on_scroll)
+
+    # Treeview passthroughs used by the dashboards
+    def heading(self, column, **kwargs):
+        return self.tree.heading(column, **kwargs)
+
+    def column(self, column, **kwargs):
+        return self.tree.column(column, **kwargs)
+
+    def selection(self):
+        return self.tree.selection()
+
+    def item(self, item, option=None, **kwargs):
+        return self.tree.item(item, option, **kwargs)
+
+    def reload(self):
+        """Re-read the list from the top and apply only the differences.
+
+        As many rows as are loaded now are fetched again from the start of
+        the sort order, so rows added since (newer results at the top of a
+        descending list) show up, and rows that did not change are left
+        alone.
+        """
+        limit = max(len(self._keys), self.page_size)
+
+        def show(rows):
+            sync_treeview(self.tree, rows, self.iid_index, self.row_formatter)
+            self._keys = [self._row_key(row) for row in rows]
+            self._more_before = False
+            self._more_after = len(rows) == limit
+
+        self._generation += 1
+        self._fetch(None, forward=True, on_rows=show, limit=limit)
+
+    def refresh(self):
+        """Drop every loaded row and load the first page again."""
+        def show(rows):
+            self.tree.delete(*self.tree.get_children())
+            self.tree._synced_values.clear()
+            self._keys = []
+            self._more_before = False
+            self._more_after = len(rows) == self.page_size
+            self._append(rows)
+            self.tree.yview_moveto(0)
+
+        self._generation += 1
+        self._fetch(None, forward=True, on_rows=show)
+
+    def _fetch(self, key, forward, on_rows, limit=None):
+        # Walking backwards flips the sort direction; rows are put back into
+        # display order before on_rows(rows) runs on the Tk thread
+        sql, params = page_query(self.select_sql, self.order_by, self.where_sql, self.params, key,
+                                 descending=self.descending == forward, limit=limit or self.page_size)
+        # A reload or refresh makes pages requested before it stale
+        generation = self._generation
+
+        def done(rows):
+            if generation != self._generation or not self.winfo_exists():
+                return
+            self._loading = False
+            if not forward:
+                rows.reverse()
+            on_rows(rows)
+
+        def failed(e):
+            if generation == self._generation:
+                self._loading = False
+            messagebox.showerror("Database Error", f"An error occurred while loading rows: {str(e)}")
+
+        self._loading = True
+        QueryExecutor.for_root(self._root()).submit(lambda conn: conn.execute(sql, params).fetchall(),
+                                                    done, failed)
+
+    def _row_key(self, row):
+        return tuple(row[i] for i in self.key_index)
+
+    def _insert(self, row, index):
+        values = tuple(self.row_formatter(row) if self.row_formatter else row)
+        iid = str(row[self.iid_index])
+        self.tree.insert('', index, iid=iid, values=values)
+        self.tree._synced_values[iid] = values
+
+    def _append(self, rows):
+        for row in rows:
+            self._insert(row, 'end')
+            self._keys.append(self._row_key(row))
+
+    def _prepend(self, rows):
+        for index, row in enumerate(rows):
+            self._insert(row, index)
+        self._keys[:0] = [self._row_key(row) for row in rows]
+
+    def _on_scroll(self, first, last):
+        self._scrollbar.set(first, last)
+        if self._loading or not self._keys:
+            return
+        if float(last) >= 1.0 and self._more_after:
+            self._load_next()
+        elif float(first) <= 0.0 and self._more_before:
+            self._load_previous()
+
+    def _load_next(self):
+        def show(rows):
+            self._more_after = len(rows) == self.page_size
+            top = self._top_index()
+            self._append(rows)
+            trimmed = self._trim(from_top=True)
+            if trimmed:
+                self._more_before = True
+                self._move_to(top - trimmed)
+
+        self._fetch(self._keys[-1], forward=True, on_rows=show)
+
+    def _load_previous(self):
+        def show(rows):
+            self._more_before = len(rows) == self.page_size
+            top = self._top_index()
+            self._prepend(rows)
+            if self._trim(from_top=False):
+                self._more_after = True
+            # Keep the rows the user was looking at in place
+            self._move_to(top + len(rows))
+
+        self._fetch(self._keys[0], forward=False, on_rows=show)
+
+    def _trim(self, from_top):
+        excess = len(self._keys) - self.max_rows
+        if excess <= 0:
+            return 0
+        children = self.tree.get_children()
+        if from_top:
+            removed = children[:excess]
+            del self._keys[:excess]
+        else:
+            removed = children[-excess:]
+            del self._keys[-excess:]
+        self.tree.delete(*removed)
+        for iid in removed:
+            self.tree._synced_values.pop(iid, None)
+        return excess
+
+    def _top_index(self):
+        return round(self.tree.yview()[0] * len(self._keys))
+
+    def _move_to(self, index):
+        if self._keys:
+            self.tree.yview_moveto(max(index, 0) / len(self._keys))